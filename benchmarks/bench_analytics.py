@@ -0,0 +1,63 @@
+"""
+Benchmark: course analytics.
+
+Compares the per-course approach (get_grades_by_course and
+get_enrollments_by_course per course, counting model objects) with the
+columnar engine: the one-time column build, each group-by, and the cost an
+attached engine adds to a grade update.
+
+Run with:  python benchmarks/bench_analytics.py [scale]
+"""
+import sys
+import time
+from collections import Counter
+from typing import Dict
+from source.college_erp import synthetic
+from source.college_erp.database import Database
+from source.college_erp.services.analytics_service import AnalyticsEngine
+
+def per_course(db: Database) -> Dict[str, Counter]:
+    """The loop a report would write today: two index lookups per course."""
+    result = {}
+    for course_id in db.courses:
+        result[course_id] = (Counter(grade.grade_value for grade in db.get_grades_by_course(course_id)),
+                             Counter(en.status for en in db.get_enrollments_by_course(course_id)))
+    return result
+
+def timed(label: str, fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    print(f"  {label:<34}{time.perf_counter() - start:8.3f} s")
+    return result
+
+def main():
+    scale_name = sys.argv[1] if len(sys.argv) > 1 else "large"
+    db = Database()
+    synthetic.populate(db, synthetic.SCALES[scale_name], seed=1)
+    print(f"'{scale_name}' dataset: {len(db.grades):,} grades, {len(db.enrollments):,} enrollments, "
+          f"{len(db.courses):,} courses")
+
+    timed("per-course loop (grades+status)", per_course, db)
+    engine = AnalyticsEngine(db)
+    timed("column build (attach)", engine.attach)
+    timed("grade histograms by course", engine.grade_histograms)
+    timed("status counts by course", engine.status_counts)
+    timed("pass rates by coordinator", engine.pass_rates, by="coordinator")
+    timed("grade histograms by branch", engine.grade_histograms, by="branch")
+
+    grade_ids = list(db.grades)[:100_000]
+    engine.detach()
+    start = time.perf_counter()
+    for grade_id in grade_ids:
+        db.update_grade_value(grade_id, "B")
+    detached = time.perf_counter() - start
+    engine.attach()
+    start = time.perf_counter()
+    for grade_id in grade_ids:
+        db.update_grade_value(grade_id, "A")
+    attached = time.perf_counter() - start
+    print(f"  grade update: {detached / len(grade_ids) * 1e6:.1f} us detached, "
+          f"{attached / len(grade_ids) * 1e6:.1f} us attached")
+
+if __name__ == "__main__":
+    main()
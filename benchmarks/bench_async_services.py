@@ -0,0 +1,149 @@
+"""
+Benchmark: request throughput of the sync and async service layers with
+many concurrent clients.
+
+Each client issues a mix of requests (view grades, view registrations,
+view courses, register/drop). The sync layer is served like a threaded
+server, one thread per client; the async layer runs every client as a
+coroutine on one event loop over ThreadPoolDatabase. With --latency-ms,
+each storage read sleeps to mimic a networked backend.
+
+Run with:  python benchmarks/bench_async_services.py [clients] [requests_per_client] [--latency-ms N]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import threading
+import time
+from source.college_erp.async_database import ThreadPoolDatabase
+from source.college_erp.database import Database
+from source.college_erp.models.course import Course
+from source.college_erp.models.grade import Grade
+from source.college_erp.models.professor import Professor
+from source.college_erp.models.student import Student
+from source.college_erp.services import student_service
+from source.college_erp.services.aio import student_service as aio_student_service
+
+N_STUDENTS = 5_000
+N_COURSES = 50
+
+class SlowDatabase(Database):
+    """In-memory Database whose lookups block for a fixed time, like a remote store."""
+    def __init__(self, latency: float):
+        super().__init__()
+        self.latency = latency
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def find_enrollment(self, student_id, course_id):
+        self._wait()
+        return super().find_enrollment(student_id, course_id)
+
+    def get_enrollments_by_student(self, student_id):
+        self._wait()
+        return super().get_enrollments_by_student(student_id)
+
+    def get_grades_by_student(self, student_id):
+        self._wait()
+        return super().get_grades_by_student(student_id)
+
+def build_db(latency: float) -> Database:
+    db = SlowDatabase(latency)
+    db.add_user(Professor(user_id="prof", name="Prof", password="x", branch="CSE"))
+    db.add_users(Student(user_id=f"s{i}", name=f"S{i}", password="x", branch="CSE") for i in range(N_STUDENTS))
+    db.add_courses(Course(course_id=f"C{i}", name=f"C{i}", coordinator_id="prof") for i in range(N_COURSES))
+    for i in range(N_STUDENTS):
+        db.add_grade(Grade(grade_id=f"g{i}", student_id=f"s{i}", course_id=f"C{i % N_COURSES}", grade_value="A"))
+    return db
+
+def plan(client: int, n_requests: int):
+    """The deterministic request sequence of one client: (kind, student_id, course_id)."""
+    rng = random.Random(client)
+    student_id = f"s{rng.randrange(N_STUDENTS)}"
+    return [(rng.choice(("grades", "registered", "courses", "register", "drop")),
+             student_id, f"C{rng.randrange(N_COURSES)}") for _ in range(n_requests)]
+
+def run_sync(db: Database, plans) -> list:
+    latencies = []
+    lock = threading.Lock()
+    handlers = {
+        "grades": lambda s, c: student_service.view_grades(db, s),
+        "registered": lambda s, c: student_service.view_registered_courses(db, s),
+        "courses": lambda s, c: student_service.view_courses(db),
+        "register": lambda s, c: student_service.register_course(db, s, c),
+        "drop": lambda s, c: student_service.drop_course(db, s, c),
+    }
+
+    def client(requests):
+        mine = []
+        for kind, student_id, course_id in requests:
+            start = time.perf_counter()
+            handlers[kind](student_id, course_id)
+            mine.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(mine)
+
+    threads = [threading.Thread(target=client, args=(requests,)) for requests in plans]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+def run_async(db: Database, plans, workers: int) -> list:
+    adb = ThreadPoolDatabase(db, max_workers=workers)
+    handlers = {
+        "grades": lambda s, c: aio_student_service.view_grades(adb, s),
+        "registered": lambda s, c: aio_student_service.view_registered_courses(adb, s),
+        "courses": lambda s, c: aio_student_service.view_courses(adb),
+        "register": lambda s, c: aio_student_service.register_course(adb, s, c),
+        "drop": lambda s, c: aio_student_service.drop_course(adb, s, c),
+    }
+
+    async def client(requests, latencies):
+        for kind, student_id, course_id in requests:
+            start = time.perf_counter()
+            await handlers[kind](student_id, course_id)
+            latencies.append(time.perf_counter() - start)
+
+    async def main():
+        latencies = []
+        await asyncio.gather(*(client(requests, latencies) for requests in plans))
+        return latencies
+
+    try:
+        return asyncio.run(main())
+    finally:
+        adb.close()
+
+def report(label: str, latencies: list, elapsed: float):
+    cuts = statistics.quantiles(latencies, n=100)
+    print(f"{label:>24} {len(latencies) / elapsed:>12,.0f} {cuts[49] * 1e3:>9.2f} {cuts[98] * 1e3:>9.2f}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("clients", nargs="?", type=int, default=1_000)
+    parser.add_argument("requests", nargs="?", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, default=64, help="ThreadPoolDatabase workers")
+    args = parser.parse_args()
+
+    plans = [plan(client, args.requests) for client in range(args.clients)]
+    print(f"{args.clients} clients x {args.requests} requests, storage latency {args.latency_ms} ms")
+    print(f"{'layer':>24} {'requests/s':>12} {'p50 ms':>9} {'p99 ms':>9}")
+
+    db = build_db(args.latency_ms / 1e3)
+    start = time.perf_counter()
+    latencies = run_sync(db, plans)
+    report("sync, thread/client", latencies, time.perf_counter() - start)
+
+    db = build_db(args.latency_ms / 1e3)
+    start = time.perf_counter()
+    latencies = run_async(db, plans, args.workers)
+    report(f"async, {args.workers} db workers", latencies, time.perf_counter() - start)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark: admin_service.bulk_add_users / bulk_add_courses throughput.
+
+Rows are generated lazily, as a streaming CSV/JSONL reader would produce
+them, so the only memory that grows is the database itself. Throughput
+should stay flat as the row count grows.
+
+Run with:  python benchmarks/bench_bulk_import.py [max_rows]
+"""
+import sys
+import time
+import tracemalloc
+from source.college_erp.database import Database
+from source.college_erp.passwords import get_default_hasher
+from source.college_erp.services import admin_service
+
+# Rows carry a pre-hashed password, so the benchmark measures the import
+# itself rather than one KDF call per row
+PASSWORD_HASH = get_default_hasher().hash("pass")
+
+def user_rows(n: int):
+    """Yields n student rows, with every 1000th row a duplicate."""
+    for i in range(n):
+        uid = i - 1 if i % 1000 == 999 else i
+        yield {"user_id": f"S{uid:07d}", "name": f"Student {uid}", "password_hash": PASSWORD_HASH,
+               "branch": "CSE", "role": "student"}
+
+def course_rows(n: int, professors: int):
+    """Yields n course rows spread over the given number of professors."""
+    for i in range(n):
+        yield {"course_id": f"C{i:06d}", "name": f"Course {i}", "coordinator_id": f"P{i % professors:04d}"}
+
+def main():
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    sizes = [n for n in (10_000, 100_000, 1_000_000) if n <= max_rows] or [max_rows]
+    print(f"{'rows':>10} {'users/s':>12} {'courses/s':>12} {'errors':>8} {'peak MiB':>9}")
+    for n in sizes:
+        db = Database()
+        professors = max(1, n // 100)
+        admin_service.bulk_add_users(db, ({"user_id": f"P{i:04d}", "role": "professor"} for i in range(professors)))
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        report = admin_service.bulk_add_users(db, user_rows(n))
+        users_elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        admin_service.bulk_add_courses(db, course_rows(n, professors))
+        courses_elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+
+        print(f"{n:>10,} {n / users_elapsed:>12,.0f} {n / courses_elapsed:>12,.0f} "
+              f"{len(report.errors):>8,} {peak:>9,.0f}")
+
+if __name__ == "__main__":
+    main()
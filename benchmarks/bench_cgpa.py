@@ -0,0 +1,58 @@
+"""
+Benchmark: full CGPA recomputation and incremental per-grade updates.
+
+Run with:  python benchmarks/bench_cgpa.py [n_students] [grades_per_student]
+"""
+import sys
+import time
+from source.college_erp.database import Database
+from source.college_erp.models.grade import Grade
+from source.college_erp.models.student import Student
+from source.college_erp.services.cgpa_service import DEFAULT_GRADE_POINTS, CgpaEngine
+
+def build_db(n_students: int, per_student: int) -> Database:
+    db = Database()
+    letters = list(DEFAULT_GRADE_POINTS)
+    for s in range(n_students):
+        sid = f"S{s}"
+        db.add_user(Student(user_id=sid, name=sid, password="", branch="CSE"))
+        for c in range(per_student):
+            db.add_grade(Grade(f"G{s}-{c}", sid, f"C{(s + c) % 500}", letters[(s * 7 + c) % len(letters)]))
+    return db
+
+def main():
+    n_students = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    per_student = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+    db = build_db(n_students, per_student)
+    engine = CgpaEngine(db, course_credits={f"C{c}": 3.0 + c % 2 for c in range(500)})
+
+    start = time.perf_counter()
+    cgpas = engine.compute_all()
+    compute = time.perf_counter() - start
+    start = time.perf_counter()
+    engine.recompute_all()
+    store = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine.attach()
+    attach = time.perf_counter() - start
+    start = time.perf_counter()
+    engine.compute_all()
+    attached = time.perf_counter() - start
+
+    updates = 10_000
+    start = time.perf_counter()
+    for i in range(updates):
+        s = i % n_students
+        db.update_grade_value(f"G{s}-0", "B")
+    incremental = time.perf_counter() - start
+
+    print(f"{n_students:,} students x {per_student} grades ({n_students * per_student:,} rows)")
+    print(f"  compute_all:           {compute:8.3f} s for {len(cgpas):,} students")
+    print(f"  recompute_all (+store): {store:7.3f} s")
+    print(f"  attach (read columns): {attach:8.3f} s")
+    print(f"  compute_all, attached: {attached:8.3f} s")
+    print(f"  incremental update:    {incremental / updates * 1e6:8.1f} us per grade change")
+
+if __name__ == "__main__":
+    main()
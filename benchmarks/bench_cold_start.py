@@ -0,0 +1,75 @@
+"""
+Benchmark: cold-start time to first login.
+
+Builds the users and courses of a synthetic dataset, saves them both as a
+journal snapshot and as a catalog, then starts fresh Python processes that
+each import the service layer, load the catalog data one way or the other
+and log one student in. Reports the median wall time from process start to
+the first successful login, and the part of it spent inside the process.
+
+Run with:  python benchmarks/bench_cold_start.py [scale] [runs]
+           (scale is one of tiny, small, large; default large)
+"""
+import dataclasses
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from source.college_erp.catalog import write_catalog
+from source.college_erp.database import Database
+from source.college_erp.journal import write_snapshot
+from source.college_erp.synthetic import PASSWORD, SCALES, generate, student_id
+
+WORKER = """
+import sys, time
+start = time.perf_counter()
+from source.college_erp.database import Database
+from source.college_erp.services import authentication
+mode, path, user_id, password = sys.argv[1:]
+db = Database()
+if mode == "catalog":
+    from source.college_erp.catalog import attach_catalog
+    attach_catalog(db, path)
+else:
+    from source.college_erp.journal import load_snapshot
+    load_snapshot(db, path)
+assert authentication.login(db, user_id, password) is not None
+print(time.perf_counter() - start)
+"""
+
+def first_login(mode: str, path: str, user_id: str):
+    """Runs one worker process; returns (wall seconds, seconds inside the process)."""
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", WORKER, mode, path, user_id, PASSWORD],
+                            check=True, capture_output=True, text=True).stdout
+    return time.perf_counter() - start, float(output)
+
+def main():
+    scale = SCALES[sys.argv[1] if len(sys.argv) > 1 else "large"]
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    data = generate(dataclasses.replace(scale, enrollments=0, grades=0))
+    db = Database()
+    db.add_users(data.users)
+    db.add_courses(data.courses)
+    print(f"{len(db.users):,} users and {len(db.courses):,} courses")
+
+    directory = tempfile.mkdtemp(prefix="erp-cold-start-")
+    snapshot_path = os.path.join(directory, "snapshot.bin")
+    catalog_path = os.path.join(directory, "catalog.bin")
+    write_snapshot(snapshot_path, {"users": list(db.users.values()), "courses": list(db.courses.values())})
+    write_catalog(db, catalog_path)
+    user_id = student_id(len(db.users) // 2)
+
+    for mode, path in (("snapshot", snapshot_path), ("catalog", catalog_path)):
+        first_login(mode, path, user_id)  # warm the page cache
+        timings = [first_login(mode, path, user_id) for _ in range(runs)]
+        wall = statistics.median(t[0] for t in timings)
+        inside = statistics.median(t[1] for t in timings)
+        size = os.path.getsize(path)
+        print(f"{mode:>10}: {wall * 1000:8.1f} ms to first login "
+              f"({inside * 1000:.1f} ms in process, file {size / 1e6:.1f} MB)")
+
+if __name__ == "__main__":
+    main()
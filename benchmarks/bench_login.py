@@ -0,0 +1,55 @@
+"""
+Benchmark: logins per second per core at each password-hashing cost setting,
+for the inline `login` and for `login_async` on the bounded worker pool.
+
+Run with:  python benchmarks/bench_login.py [n_logins]
+"""
+import asyncio
+import os
+import sys
+import time
+from source.college_erp.database import Database
+from source.college_erp.models.student import Student
+from source.college_erp.passwords import PasswordHasher, set_default_hasher
+from source.college_erp.services import authentication
+
+COST_SETTINGS = [
+    PasswordHasher(algorithm="pbkdf2_sha256", iterations=100_000),
+    PasswordHasher(algorithm="pbkdf2_sha256", iterations=600_000),
+    PasswordHasher(n=2 ** 13),
+    PasswordHasher(n=2 ** 14),
+    PasswordHasher(n=2 ** 15),
+]
+
+def describe(hasher: PasswordHasher) -> str:
+    if hasher.algorithm == "scrypt":
+        return f"scrypt n=2^{hasher.n.bit_length() - 1} r={hasher.r} p={hasher.p}"
+    return f"pbkdf2_sha256 {hasher.iterations:,} rounds"
+
+def main():
+    n_logins = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    cores = os.cpu_count() or 1
+    authentication.configure_login_pool(cores)
+    print(f"{cores} core(s), {n_logins} logins per setting")
+    print(f"{'setting':>34} {'inline/s/core':>14} {'async pool/s/core':>18}")
+    for hasher in COST_SETTINGS:
+        set_default_hasher(hasher)
+        db = Database()
+        db.add_user(Student(user_id="stud", name="Student", password=hasher.hash("pass"), branch="CSE"))
+
+        start = time.perf_counter()
+        for _ in range(n_logins):
+            authentication.login(db, "stud", "pass")
+        inline = n_logins / (time.perf_counter() - start)
+
+        async def storm():
+            await asyncio.gather(*(authentication.login_async(db, "stud", "pass") for _ in range(n_logins)))
+
+        start = time.perf_counter()
+        asyncio.run(storm())
+        pooled = n_logins / (time.perf_counter() - start) / cores
+
+        print(f"{describe(hasher):>34} {inline:>14,.1f} {pooled:>18,.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark: bytes per Enrollment and Grade row held by the in-memory Database,
+for the current slotted, frozen models with interned ids versus the previous
+plain dataclasses with per-instance __dict__s.
+
+Run with:  python benchmarks/bench_memory.py [n_rows]
+"""
+import sys
+import tracemalloc
+import uuid
+from dataclasses import dataclass
+from source.college_erp.database import Database
+from source.college_erp.models.enrollment import Enrollment, EnrollmentStatus
+from source.college_erp.models.grade import Grade
+
+@dataclass
+class LegacyEnrollment:
+    """The model as it was before: a plain dataclass with a __dict__."""
+    enrollment_id: str
+    student_id: str
+    course_id: str
+    status: EnrollmentStatus = EnrollmentStatus.PENDING
+
+@dataclass
+class LegacyGrade:
+    grade_id: str
+    student_id: str
+    course_id: str
+    grade_value: str
+
+def rows(n: int):
+    """Yields (student_id, course_id) pairs built as fresh strings, as request data would be."""
+    for i in range(n):
+        yield "".join(("stud_", str(i % 5000))), "".join(("C", str(i % 200)))
+
+def measure(build) -> float:
+    """Returns the bytes allocated by build(), via tracemalloc."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    def legacy_rows():
+        table = {}
+        for sid, cid in rows(n):
+            enrollment_id, grade_id = str(uuid.uuid4()), str(uuid.uuid4())
+            table[enrollment_id] = LegacyEnrollment(enrollment_id, sid, cid)
+            table[grade_id] = LegacyGrade(grade_id, sid, cid, "".join(("A", "+")))
+        return table
+
+    def compact_rows():
+        table = {}
+        for sid, cid in rows(n):
+            enrollment = Enrollment(str(uuid.uuid4()), sid, cid)
+            grade = Grade(str(uuid.uuid4()), sid, cid, "".join(("A", "+")))
+            table[enrollment.enrollment_id] = enrollment
+            table[grade.grade_id] = grade
+        return table
+
+    def indexed_db():
+        db = Database()
+        for sid, cid in rows(n):
+            db.add_enrollment(Enrollment(str(uuid.uuid4()), sid, cid))
+            db.add_grade(Grade(str(uuid.uuid4()), sid, cid, "".join(("A", "+"))))
+        return db
+
+    legacy = measure(legacy_rows) / (2 * n)
+    compact = measure(compact_rows) / (2 * n)
+    full = measure(indexed_db) / (2 * n)
+    print(f"{n:,} enrollments + {n:,} grades")
+    print(f"  legacy dataclass rows:         {legacy:7.1f} bytes/row")
+    print(f"  slotted + interned rows:       {compact:7.1f} bytes/row  ({legacy / compact:.2f}x smaller)")
+    print(f"  Database incl. indexes:        {full:7.1f} bytes/row")
+
+if __name__ == "__main__":
+    main()
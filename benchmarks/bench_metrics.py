@@ -0,0 +1,51 @@
+"""
+Benchmark: cost of the service instrumentation.
+
+Times a mix of student and professor reads with metrics disabled, enabled,
+and enabled with the sampling profiler running.
+
+Run with:  python benchmarks/bench_metrics.py [n_calls]
+"""
+import sys
+import time
+from source.college_erp import synthetic
+from source.college_erp.database import Database
+from source.college_erp.metrics import SamplingProfiler, metrics
+from source.college_erp.services import professor_service, student_service
+
+def run(db: Database, n_calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(n_calls):
+        student_id = synthetic.student_id(i % synthetic.SMALL.students)
+        student_service.view_registered_courses(db, student_id)
+        student_service.view_grades(db, student_id)
+        course = db.courses[synthetic.course_id(100 + i % 100)]
+        professor_service.view_enrolled_students(db, course.coordinator_id, course.course_id)
+    return time.perf_counter() - start
+
+def main():
+    n_calls = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    db = Database()
+    synthetic.populate(db, synthetic.SMALL, seed=1)
+    print(f"{n_calls:,} iterations of 3 service calls over the 'small' dataset")
+
+    baseline = run(db, n_calls)
+    print(f"{'disabled':>18}: {3 * n_calls / baseline:>10,.0f} calls/s")
+    metrics.enable()
+    metrics.track_database(db)
+    enabled = run(db, n_calls)
+    print(f"{'enabled':>18}: {3 * n_calls / enabled:>10,.0f} calls/s ({enabled / baseline - 1:+.0%})")
+    profiler = SamplingProfiler()
+    profiler.start()
+    profiled = run(db, n_calls)
+    profiler.stop()
+    print(f"{'enabled + profiler':>18}: {3 * n_calls / profiled:>10,.0f} calls/s ({profiled / baseline - 1:+.0%})")
+    metrics.disable()
+    disabled = run(db, n_calls)
+    print(f"{'disabled again':>18}: {3 * n_calls / disabled:>10,.0f} calls/s ({disabled / baseline - 1:+.0%})")
+    for name, op in metrics.snapshot()["operations"].items():
+        print(f"  {name}: p50 {op['latency_us']['p50']:.1f} us, p99 {op['latency_us']['p99']:.1f} us, "
+              f"{op['rows_scanned'] / op['calls']:.1f} rows/call")
+
+if __name__ == "__main__":
+    main()
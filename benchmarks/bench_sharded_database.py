@@ -0,0 +1,64 @@
+"""
+Benchmark: throughput of the sharded database from 1 to N shards.
+
+Client threads run the student-keyed hot paths (view_grades,
+view_registered_courses, register_course) plus one course-keyed
+view_pending_registrations per `scatter_every` calls, against the
+in-memory Database and against ShardedDatabase with 1..N shards.
+
+Run with:  python benchmarks/bench_sharded_database.py [max_shards] [calls] [clients]
+"""
+import os
+import random
+import sys
+import threading
+import time
+from source.college_erp import synthetic
+from source.college_erp.database import Database
+from source.college_erp.passwords import hash_password
+from source.college_erp.services import professor_service, student_service
+from source.college_erp.sharded_database import ShardedDatabase
+
+SCALE = synthetic.SMALL
+SCATTER_EVERY = 20
+PASSWORD_HASH = hash_password(synthetic.PASSWORD)
+
+def client(db: Database, seed: int, calls: int):
+    rng = random.Random(seed)
+    for call in range(calls):
+        student_id = synthetic.student_id(rng.randrange(SCALE.students))
+        kind = call % 3
+        if call % SCATTER_EVERY == 0:
+            professor_service.view_pending_registrations(db, synthetic.professor_id(rng.randrange(SCALE.professors)))
+        elif kind == 0:
+            student_service.view_grades(db, student_id)
+        elif kind == 1:
+            student_service.view_registered_courses(db, student_id)
+        else:
+            student_service.register_course(db, student_id, synthetic.course_id(rng.randrange(SCALE.courses)))
+
+def run(db: Database, calls: int, clients: int) -> float:
+    synthetic.populate(db, SCALE, seed=1, password_hash=PASSWORD_HASH)
+    threads = [threading.Thread(target=client, args=(db, seed, calls // clients)) for seed in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return calls / (time.perf_counter() - start)
+
+def main():
+    max_shards = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    calls = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    clients = int(sys.argv[3]) if len(sys.argv) > 3 else 16
+    print(f"'small' dataset, {calls:,} service calls from {clients} threads, {os.cpu_count()} CPUs")
+    print(f"{'in-memory':>10}: {run(Database(), calls, clients):>10,.0f} calls/s")
+    for shards in range(1, max_shards + 1):
+        db = ShardedDatabase(shards)
+        try:
+            print(f"{f'{shards} shard' + 's' * (shards > 1):>10}: {run(db, calls, clients):>10,.0f} calls/s")
+        finally:
+            db.close()
+
+if __name__ == "__main__":
+    main()
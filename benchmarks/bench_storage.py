@@ -0,0 +1,73 @@
+"""
+Benchmark: in-memory Database vs. SQLiteDatabase for the
+register / approve / grade workload.
+
+Run with:  python benchmarks/bench_storage.py [n_students]
+"""
+import os
+import sys
+import tempfile
+import time
+from source.college_erp.database import Database
+from source.college_erp.sqlite_database import SQLiteDatabase
+from source.college_erp.models.professor import Professor
+from source.college_erp.models.student import Student
+from source.college_erp.models.course import Course
+from source.college_erp.services import professor_service, student_service
+
+N_COURSES = 50
+
+def seed(db: Database, n_students: int):
+    """Adds one professor, N_COURSES courses and n_students students."""
+    with db.transaction():
+        db.add_user(Professor(user_id="prof", name="Prof", password="pass", branch="CSE"))
+        for c in range(N_COURSES):
+            db.add_course(Course(course_id=f"C{c}", name=f"Course {c}", coordinator_id="prof"))
+        for s in range(n_students):
+            db.add_user(Student(user_id=f"S{s}", name=f"Student {s}", password="pass", branch="CSE"))
+
+def run_workload(db: Database, n_students: int, batched: bool) -> dict:
+    """Times each phase; with `batched`, every phase runs in one transaction."""
+    def phase(work):
+        start = time.perf_counter()
+        if batched:
+            with db.transaction():
+                work()
+        else:
+            work()
+        return time.perf_counter() - start
+
+    def register():
+        for s in range(n_students):
+            student_service.register_course(db, f"S{s}", f"C{s % N_COURSES}")
+
+    def approve():
+        for c in range(N_COURSES):
+            for enrollment in db.get_pending_enrollments(f"C{c}"):
+                professor_service.approve_registration(db, enrollment.enrollment_id)
+
+    def grade():
+        for s in range(n_students):
+            professor_service.upload_grade(db, "prof", f"S{s}", f"C{s % N_COURSES}", "A")
+
+    return {"register": phase(register), "approve": phase(approve), "grade": phase(grade)}
+
+def main():
+    n_students = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = {
+            "memory": (Database(), True),
+            "sqlite (batched)": (SQLiteDatabase(os.path.join(tmp, "batched.db")), True),
+            "sqlite (autocommit)": (SQLiteDatabase(os.path.join(tmp, "autocommit.db")), False),
+        }
+        print(f"{n_students} students, {N_COURSES} courses (ops/s)")
+        for name, (db, batched) in backends.items():
+            seed(db, n_students)
+            timings = run_workload(db, n_students, batched)
+            row = "  ".join(f"{phase}={n_students / seconds:>10,.0f}" for phase, seconds in timings.items())
+            print(f"{name:>20}: {row}")
+            if isinstance(db, SQLiteDatabase):
+                db.close()
+
+if __name__ == "__main__":
+    main()
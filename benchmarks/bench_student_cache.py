@@ -0,0 +1,71 @@
+"""
+Benchmark: student portal reads with and without StudentViewCache.
+
+Simulates page loads (catalog + the student's registrations + grades) for
+random students, with one write per `write_every` loads invalidating a
+student's entries.
+
+Run with:  python benchmarks/bench_student_cache.py [n_loads] [write_every]
+"""
+import random
+import sys
+import time
+from source.college_erp.database import Database
+from source.college_erp.models.course import Course
+from source.college_erp.models.enrollment import Enrollment, EnrollmentStatus
+from source.college_erp.models.grade import Grade
+from source.college_erp.models.professor import Professor
+from source.college_erp.models.student import Student
+from source.college_erp.services import student_service
+from source.college_erp.services.student_cache import StudentViewCache
+
+N_STUDENTS = 20_000
+N_COURSES = 2_000
+PER_STUDENT = 6
+
+def build_db() -> Database:
+    db = Database()
+    db.add_user(Professor(user_id="prof", name="Prof", password="x", branch="CSE"))
+    db.add_users(Student(user_id=f"s{i}", name=f"S{i}", password="x", branch="CSE") for i in range(N_STUDENTS))
+    db.add_courses(Course(course_id=f"C{i}", name=f"Course {i}", coordinator_id="prof") for i in range(N_COURSES))
+    rng = random.Random(7)
+    for i in range(N_STUDENTS):
+        for course_id in rng.sample(range(N_COURSES), PER_STUDENT):
+            db.add_enrollment(Enrollment(f"e{i}-{course_id}", f"s{i}", f"C{course_id}", EnrollmentStatus.ENROLLED))
+            db.add_grade(Grade(f"g{i}-{course_id}", f"s{i}", f"C{course_id}", "A"))
+    return db
+
+def run(db: Database, n_loads: int, write_every: int, views) -> float:
+    view_courses, view_registered, view_grades = views
+    rng = random.Random(42)
+    start = time.perf_counter()
+    for load in range(n_loads):
+        student_id = f"s{int(rng.paretovariate(1.2)) % N_STUDENTS}"  # a few students reload a lot
+        view_courses()
+        view_registered(student_id)
+        view_grades(student_id)
+        if load % write_every == 0:
+            grade = db.get_grades_by_student(student_id)[0]
+            db.update_grade_value(grade.grade_id, "B")
+    return time.perf_counter() - start
+
+def main():
+    n_loads = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    write_every = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    db = build_db()
+    print(f"{N_COURSES:,} courses, {N_STUDENTS:,} students, {n_loads:,} page loads, 1 write per {write_every}")
+
+    elapsed = run(db, n_loads, write_every, (
+        lambda: student_service.view_courses(db),
+        lambda sid: student_service.view_registered_courses(db, sid),
+        lambda sid: student_service.view_grades(db, sid)))
+    print(f"{'uncached':>10}: {n_loads / elapsed:>10,.0f} page loads/s")
+
+    cache = StudentViewCache(db)
+    elapsed = run(db, n_loads, write_every, (cache.view_courses, cache.view_registered_courses, cache.view_grades))
+    stats = cache.stats()
+    print(f"{'cached':>10}: {n_loads / elapsed:>10,.0f} page loads/s "
+          f"(hit rate {stats.hit_rate:.1%}, {stats.invalidations:,} invalidations)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark: term-end transcript export.
+
+Compares the per-student approach (view_grades per student, course names
+looked up one by one, CGPA via CgpaEngine.compute_for) with
+iter_transcripts, written serially and sharded across worker processes.
+
+Run with:  python benchmarks/bench_transcripts.py [scale] [workers]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+from typing import Iterator
+from source.college_erp import synthetic
+from source.college_erp.database import Database
+from source.college_erp.models.user import UserRole
+from source.college_erp.services import student_service, transcript_service
+from source.college_erp.services.cgpa_service import CgpaEngine
+
+def per_student(db: Database) -> Iterator[transcript_service.Transcript]:
+    """The N+1 way: a grade lookup, course lookups and a CGPA query per student."""
+    engine = CgpaEngine(db)
+    for student_id in sorted(uid for uid, user in db.users.items() if user.role == UserRole.STUDENT):
+        student = db.users[student_id]
+        grades = sorted(student_service.view_grades(db, student_id), key=lambda grade: grade.course_id)
+        yield transcript_service.Transcript(
+            student_id, student.name, student.branch, engine.compute_for(student_id),
+            tuple(transcript_service.TranscriptLine(grade.course_id, db.courses[grade.course_id].name,
+                                                    grade.grade_value, engine.grade_points.get(grade.grade_value))
+                  for grade in grades))
+
+def main():
+    scale_name = sys.argv[1] if len(sys.argv) > 1 else "small"
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    db = Database()
+    synthetic.populate(db, synthetic.SCALES[scale_name], seed=1)
+    print(f"'{scale_name}' dataset: {len(db.users):,} users, {len(db.grades):,} grades, {os.cpu_count()} CPUs")
+
+    for name, transcripts in (("per student", per_student), ("iter_transcripts", transcript_service.iter_transcripts)):
+        start = time.perf_counter()
+        count = transcript_service.write_csv(transcripts(db), io.StringIO())
+        print(f"{name:>16}: {time.perf_counter() - start:6.2f} s for {count:,} transcripts (csv in memory)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for fmt in transcript_service.WRITERS:
+            for n in sorted({1, workers}):
+                start = time.perf_counter()
+                report = transcript_service.export_transcripts(db, os.path.join(directory, f"t.{fmt}"), fmt, n)
+                elapsed = time.perf_counter() - start
+                size = sum(os.path.getsize(path) for path in report.files)
+                print(f"{fmt + ' x' + str(n):>16}: {elapsed:6.2f} s for {report.transcripts:,} transcripts, "
+                      f"{size / 2**20:.1f} MiB")
+
+if __name__ == "__main__":
+    main()
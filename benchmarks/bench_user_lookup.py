@@ -0,0 +1,42 @@
+"""
+Benchmark: Database.get_user_by_id returning frozen users vs. the old deepcopy path.
+
+Run with:  python benchmarks/bench_user_lookup.py
+"""
+import copy
+import timeit
+from source.college_erp.database import Database
+from source.college_erp.models.student import Student
+
+N_USERS = 10_000
+N_CALLS = 200_000
+
+def build_db() -> Database:
+    """Builds a database with N_USERS students."""
+    db = Database()
+    for i in range(N_USERS):
+        db.add_user(Student(user_id=f"stud_{i}", name=f"Student {i}", password="pass", branch="CSE"))
+    return db
+
+def main():
+    db = build_db()
+    ids = [f"stud_{i % N_USERS}" for i in range(N_CALLS)]
+
+    def deepcopy_lookup():
+        for uid in ids:
+            copy.deepcopy(db.users.get(uid))
+
+    def frozen_lookup():
+        for uid in ids:
+            db.get_user_by_id(uid)
+
+    results = {
+        "deepcopy lookup": min(timeit.repeat(deepcopy_lookup, number=1, repeat=3)),
+        "frozen lookup": min(timeit.repeat(frozen_lookup, number=1, repeat=3)),
+    }
+    for name, seconds in results.items():
+        print(f"{name:>16}: {N_CALLS / seconds:>12,.0f} calls/s  ({seconds * 1e6 / N_CALLS:.2f} us/call)")
+    print(f"speedup: {results['deepcopy lookup'] / results['frozen lookup']:.1f}x")
+
+if __name__ == "__main__":
+    main()
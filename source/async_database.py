@@ -0,0 +1,191 @@
+"""
+Asyncio interface to the College ERP System's storage.
+`AsyncDatabase` is the awaitable counterpart of `Database` used by the
+services in `source.services.aio`; `ThreadPoolDatabase` implements it on top
+of any synchronous Database by running each call on a bounded thread pool.
+"""
+import asyncio
+import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncContextManager, AsyncIterator, Callable, Dict, Iterable, List, Optional, Protocol, Tuple
+from source.college_erp.database import Database
+from source.college_erp.models.user import User
+from source.college_erp.models.course import Course
+from source.college_erp.models.enrollment import Enrollment, EnrollmentStatus
+from source.college_erp.models.grade import Grade
+from source.college_erp.services import timetable_service
+
+# Worker threads per ThreadPoolDatabase. The in-memory tables serialize on
+# one latch, so more threads mainly help backends that block on I/O.
+DB_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+class AsyncDatabase(Protocol):
+    """
+    Awaitable storage API. Mirrors the Database methods the services use;
+    table lookups (`db.courses.get`, `db.enrollments.get`) become
+    `get_course_by_id` and `get_enrollment_by_id`, and the timetable check
+    `timetable_service.find_clash(db, ...)` becomes `find_clash`.
+    """
+    async def get_user_by_id(self, user_id: str) -> Optional[User]: ...
+    async def add_user(self, user: User): ...
+    async def delete_user(self, user_id: str) -> Optional[User]: ...
+    async def get_course_by_id(self, course_id: str) -> Optional[Course]: ...
+    async def get_all_courses(self) -> List[Course]: ...
+    async def get_courses_by_coordinator(self, professor_id: str) -> List[Course]: ...
+    async def add_course(self, course: Course): ...
+    async def delete_course(self, course_id: str) -> Optional[Course]: ...
+    async def get_enrollment_by_id(self, enrollment_id: str) -> Optional[Enrollment]: ...
+    async def find_enrollment(self, student_id: str, course_id: str) -> Optional[Enrollment]: ...
+    async def get_enrollments_by_student(self, student_id: str) -> List[Enrollment]: ...
+    async def get_enrollments_by_course(self, course_id: str) -> List[Enrollment]: ...
+    async def get_enrollments_by_course_and_status(self, course_id: str,
+                                                   status: EnrollmentStatus) -> List[Enrollment]: ...
+    async def page_enrollments_by_course_and_status(self, course_id: str, status: EnrollmentStatus,
+                                                    after: Optional[int] = None,
+                                                    limit: Optional[int] = None) -> List[Tuple[int, Enrollment]]: ...
+    async def count_enrollments(self, course_id: str, status: EnrollmentStatus) -> int: ...
+    async def add_enrollment(self, enrollment: Enrollment): ...
+    async def update_enrollment_status(self, enrollment_id: str,
+                                       status: EnrollmentStatus) -> Optional[Enrollment]: ...
+    async def remove_enrollment(self, enrollment_id: str) -> Optional[Enrollment]: ...
+    async def find_grade(self, student_id: str, course_id: str) -> Optional[Grade]: ...
+    async def get_grades_by_student(self, student_id: str) -> List[Grade]: ...
+    async def get_grades_by_course(self, course_id: str) -> List[Grade]: ...
+    async def add_grade(self, grade: Grade): ...
+    async def update_grade_value(self, grade_id: str, grade_value: str) -> Optional[Grade]: ...
+    async def find_clash(self, student_id: str, course: Course) -> Optional[str]: ...
+
+    def course_locks(self, course_ids: Iterable[str]) -> AsyncContextManager[None]:
+        """Serializes check-then-act service logic on the given courses."""
+        ...
+
+    def course_lock(self, course_id: str) -> AsyncContextManager[None]:
+        """Serializes check-then-act service logic on one course."""
+        ...
+
+def _offloaded(name: str, doc: str) -> Callable[..., Any]:
+    """Builds an async method that runs `Database.<name>` on the worker pool."""
+    async def method(self: "ThreadPoolDatabase", *args: Any) -> Any:
+        return await self._run(getattr(self.db, name), *args)
+    method.__name__ = method.__qualname__ = name
+    method.__doc__ = doc
+    return method
+
+class ThreadPoolDatabase:
+    """
+    AsyncDatabase adapter over a synchronous Database (in-memory or SQLite).
+
+    Every call runs on a bounded worker pool, so the event loop never blocks
+    on storage. Course locks are the Database's own lock stripes, behind an
+    asyncio.Lock that queues coroutines: a free stripe is taken by the loop
+    thread directly, a contended one by a dedicated holder thread (RLocks
+    must be released by the thread that acquired them). Sync and async
+    callers of the same Database therefore exclude each other.
+    """
+    def __init__(self, db: Database, max_workers: int = DB_WORKERS):
+        self.db = db
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db")
+        self._holders: Dict[int, ThreadPoolExecutor] = {}
+        # asyncio.Locks belong to one event loop; keep a set per loop
+        self._async_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[int, asyncio.Lock]]" = (
+            weakref.WeakKeyDictionary())
+
+    def close(self):
+        """Shuts down the worker and lock-holder threads."""
+        self._pool.shutdown(wait=True)
+        for holder in self._holders.values():
+            holder.shutdown(wait=True)
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+
+    get_user_by_id = _offloaded("get_user_by_id", "Fetches a user by their ID.")
+    add_user = _offloaded("add_user", "Inserts or replaces a user.")
+    delete_user = _offloaded("delete_user", "Deletes a user and handles the rows referencing them.")
+    get_all_courses = _offloaded("get_all_courses", "Fetches every course (the catalog).")
+    get_courses_by_coordinator = _offloaded("get_courses_by_coordinator", "Fetches all courses coordinated by a professor.")
+    add_course = _offloaded("add_course", "Inserts or replaces a course.")
+    delete_course = _offloaded("delete_course", "Deletes a course and the rows referencing it.")
+    find_enrollment = _offloaded("find_enrollment", "Fetches the enrollment of a student in a course, if any.")
+    get_enrollments_by_student = _offloaded("get_enrollments_by_student", "Fetches all enrollments of a student.")
+    get_enrollments_by_course = _offloaded("get_enrollments_by_course", "Fetches all enrollments in a course.")
+    get_enrollments_by_course_and_status = _offloaded("get_enrollments_by_course_and_status",
+                                                      "Fetches a course's enrollments with the given status.")
+    page_enrollments_by_course_and_status = _offloaded("page_enrollments_by_course_and_status",
+                                                       "Fetches a page of a course's enrollments with the given status.")
+    count_enrollments = _offloaded("count_enrollments", "Counts a course's enrollments with the given status.")
+    add_enrollment = _offloaded("add_enrollment", "Inserts an enrollment.")
+    update_enrollment_status = _offloaded("update_enrollment_status", "Changes the status of an enrollment.")
+    remove_enrollment = _offloaded("remove_enrollment", "Deletes an enrollment, returning the removed row.")
+    find_grade = _offloaded("find_grade", "Fetches the grade of a student in a course, if any.")
+    get_grades_by_student = _offloaded("get_grades_by_student", "Fetches all grades of a student.")
+    get_grades_by_course = _offloaded("get_grades_by_course", "Fetches all grades in a course.")
+    add_grade = _offloaded("add_grade", "Inserts a grade.")
+    update_grade_value = _offloaded("update_grade_value", "Changes the value of an existing grade.")
+
+    async def get_course_by_id(self, course_id: str) -> Optional[Course]:
+        """Fetches a course by its ID."""
+        return await self._run(self.db.courses.get, course_id)
+
+    async def get_enrollment_by_id(self, enrollment_id: str) -> Optional[Enrollment]:
+        """Fetches an enrollment by its ID."""
+        return await self._run(self.db.enrollments.get, enrollment_id)
+
+    async def find_clash(self, student_id: str, course: Course) -> Optional[str]:
+        """The student's registered course that meets at the same time as `course`, if any."""
+        return await self._run(timetable_service.find_clash, self.db, student_id, course)
+
+    def _holder(self, stripe: int) -> ThreadPoolExecutor:
+        holder = self._holders.get(stripe)
+        if holder is None:
+            holder = self._holders.setdefault(
+                stripe, ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"db-lock-{stripe}"))
+        return holder
+
+    def _async_lock(self, stripe: int) -> asyncio.Lock:
+        locks = self._async_locks.setdefault(asyncio.get_running_loop(), {})
+        lock = locks.get(stripe)
+        if lock is None:
+            lock = locks[stripe] = asyncio.Lock()
+        return lock
+
+    @asynccontextmanager
+    async def _stripe_lock(self, stripe: int) -> AsyncIterator[None]:
+        lock = self.db._course_locks[stripe]
+        holder = self._holder(stripe)
+        loop = asyncio.get_running_loop()
+        async with self._async_lock(stripe):
+            # Fast path: an uncontended stripe is taken (and later released)
+            # by the loop thread itself; the asyncio.Lock above keeps other
+            # coroutines on this thread from re-entering it.
+            if lock.acquire(blocking=False):
+                try:
+                    yield
+                finally:
+                    lock.release()
+                return
+            acquired = loop.run_in_executor(holder, lock.acquire)
+            try:
+                await asyncio.shield(acquired)
+            except asyncio.CancelledError:
+                # The holder thread still takes the lock; give it back once it has
+                acquired.add_done_callback(lambda _: holder.submit(lock.release))
+                raise
+            try:
+                yield
+            finally:
+                await asyncio.shield(loop.run_in_executor(holder, lock.release))
+
+    @asynccontextmanager
+    async def course_locks(self, course_ids: Iterable[str]) -> AsyncIterator[None]:
+        """Holds the lock stripes of the given courses, taken in a fixed order."""
+        async with AsyncExitStack() as stack:
+            for stripe in sorted({self.db.course_stripe(course_id) for course_id in course_ids}):
+                await stack.enter_async_context(self._stripe_lock(stripe))
+            yield
+
+    def course_lock(self, course_id: str) -> AsyncContextManager[None]:
+        """Holds the lock stripe of one course."""
+        return self.course_locks((course_id,))
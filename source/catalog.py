@@ -0,0 +1,191 @@
+"""
+Prebuilt catalog snapshots for fast worker start-up.
+
+A catalog file holds the users and courses tables in a form a Database can
+attach to without loading it: `attach_catalog` maps the file and reads
+only its key index, and each User or Course is decoded from the mapping the
+first time it is looked up. A freshly started worker can therefore serve
+its first login after reading a few bytes per row instead of building every
+model object.
+
+File layout: a magic header, the index length and CRC32, the marshalled
+index (row key -> row number, row offsets and the coordinator index of the
+courses), then the rows as marshalled tuples, encoded with the journal's
+row codecs. Like journal snapshots, catalogs are only meant to be read by
+this module.
+
+Typical use:
+
+    write_catalog(db, "/var/lib/erp/catalog.bin")        # when publishing
+    attach_catalog(Database(), "/var/lib/erp/catalog.bin")  # in each worker
+"""
+import marshal
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator, List
+from source.college_erp.database import Database
+from source.college_erp.journal import ROW_CODECS
+
+CATALOG_TABLES = ("users", "courses")
+
+_CATALOG_MAGIC = b"ERPCAT01"
+_INDEX_HEADER = struct.Struct("<QI")  # index length, crc32
+
+_DELETED = object()  # marks a catalog row deleted after attaching
+_MISSING = object()
+
+class CatalogTable(MutableMapping):
+    """
+    A table backed by a mapped catalog file. Rows are decoded on first
+    access and kept; writes and deletes are held in memory on top of the
+    file, which is never modified. Iteration yields the catalog rows in
+    file order, then rows added since attaching.
+    """
+    def __init__(self, data: mmap.mmap, base: int, keys: Dict[str, int], offsets: array,
+                 from_tuple: Callable[[tuple], Any]):
+        self._data = data
+        self._base = base
+        self._keys = keys         # row key -> row number in the file
+        self._offsets = offsets   # row n spans offsets[n]:offsets[n + 1] after base
+        self._from_tuple = from_tuple
+        self._rows: Dict[str, Any] = {}  # decoded, replaced, deleted or added rows
+        self._size = len(keys)
+
+    def _decode(self, number: int) -> Any:
+        start = self._base + self._offsets[number]
+        end = self._base + self._offsets[number + 1]
+        return self._from_tuple(marshal.loads(self._data[start:end]))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        row = self._rows.get(key)
+        if row is None:
+            number = self._keys.get(key)
+            if number is None:
+                return default
+            # setdefault keeps a row written concurrently by a writer
+            row = self._rows.setdefault(key, self._decode(number))
+        return default if row is _DELETED else row
+
+    def __getitem__(self, key: str) -> Any:
+        row = self.get(key, _MISSING)
+        if row is _MISSING:
+            raise KeyError(key)
+        return row
+
+    def __contains__(self, key: object) -> bool:
+        row = self._rows.get(key)
+        if row is None:
+            return key in self._keys
+        return row is not _DELETED
+
+    def __setitem__(self, key: str, row: Any):
+        if key not in self:
+            self._size += 1
+        self._rows[key] = row
+
+    def __delitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+        if key in self._keys:
+            self._rows[key] = _DELETED
+        else:
+            del self._rows[key]
+        self._size -= 1
+
+    def __iter__(self) -> Iterator[str]:
+        rows = self._rows
+        for key in self._keys:
+            if rows.get(key) is not _DELETED:
+                yield key
+        for key in list(rows):
+            if key not in self._keys:
+                yield key
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self):
+        """Empties the table; the catalog rows are dropped, not just hidden."""
+        self._keys = {}
+        self._rows = {}
+        self._size = 0
+
+    @property
+    def decoded(self) -> int:
+        """Number of catalog rows decoded (or replaced) so far."""
+        return sum(1 for key in self._rows if key in self._keys)
+
+def write_catalog(db: Database, path: str, fsync: bool = True) -> int:
+    """
+    Writes the users and courses of `db` as a catalog file, under a
+    temporary name renamed into place. Returns the number of rows written.
+    """
+    with db.transaction():
+        tables = {table: list(getattr(db, table).values()) for table in CATALOG_TABLES}
+    index: Dict[str, Any] = {}
+    chunks: List[bytes] = []
+    position = 0
+    for table in CATALOG_TABLES:
+        to_tuple = ROW_CODECS[table][0]
+        offsets = array("Q", [position])
+        for row in tables[table]:
+            payload = marshal.dumps(to_tuple(row))
+            chunks.append(payload)
+            position += len(payload)
+            offsets.append(position)
+        key = "user_id" if table == "users" else "course_id"
+        index[table] = ({getattr(row, key): n for n, row in enumerate(tables[table])}, offsets.tobytes())
+    coordinators: Dict[str, List[str]] = {}
+    for course in tables["courses"]:
+        coordinators.setdefault(course.coordinator_id, []).append(course.course_id)
+    index["coordinators"] = coordinators
+    header = marshal.dumps(index)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as out:
+        out.write(_CATALOG_MAGIC)
+        out.write(_INDEX_HEADER.pack(len(header), zlib.crc32(header)))
+        out.write(header)
+        out.writelines(chunks)
+        out.flush()
+        if fsync:
+            os.fsync(out.fileno())
+    os.replace(tmp_path, path)
+    return sum(len(rows) for rows in tables.values())
+
+def attach_catalog(db: Database, path: str) -> int:
+    """
+    Makes a catalog file the users and courses tables of an in-memory
+    Database that has none yet, without decoding any row. Returns the
+    number of rows attached. Raises ValueError if the file is not an intact
+    catalog or the database cannot take one.
+    """
+    if not all(type(getattr(db, table)) is dict and not getattr(db, table) for table in CATALOG_TABLES):
+        raise ValueError("a catalog can only be attached to an in-memory Database without users or courses")
+    with open(path, "rb") as src:
+        if os.fstat(src.fileno()).st_size < len(_CATALOG_MAGIC) + _INDEX_HEADER.size:
+            raise ValueError(f"{path} is not a catalog")
+        data = mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ)
+    if data[:len(_CATALOG_MAGIC)] != _CATALOG_MAGIC:
+        data.close()
+        raise ValueError(f"{path} is not a catalog")
+    length, crc = _INDEX_HEADER.unpack_from(data, len(_CATALOG_MAGIC))
+    start = len(_CATALOG_MAGIC) + _INDEX_HEADER.size
+    header = data[start:start + length]
+    if len(header) != length or zlib.crc32(header) != crc:
+        data.close()
+        raise ValueError(f"{path} has a corrupt index")
+    index = marshal.loads(header)
+
+    base = start + length
+    with db.transaction():
+        for table in CATALOG_TABLES:
+            keys, offsets = index[table]
+            setattr(db, table, CatalogTable(data, base, keys, array("Q", offsets), ROW_CODECS[table][1]))
+        for professor_id, course_ids in index["coordinators"].items():
+            db._courses_by_coordinator[professor_id] = dict.fromkeys(course_ids)
+    return sum(len(getattr(db, table)) for table in CATALOG_TABLES)
@@ -1,14 +1,202 @@
 """
 Mock Database for the College ERP System.
-This simulates a real database (like the one in the ERD) 
+This simulates a real database (like the one in the ERD)
 using in-memory dictionaries.
+
+Enrollments and grades are additionally indexed by (student_id, course_id),
+student_id and course_id (and enrollments by status), so all mutations of
+those tables must go through the methods below to keep the indexes in sync.
 """
-import copy
-from typing import Dict, Optional, Any
+import dataclasses
+import functools
+import itertools
+import threading
+import weakref
+from bisect import bisect_right
+from collections.abc import Mapping
+from dataclasses import dataclass
+from contextlib import ExitStack, contextmanager
+from enum import Enum
+from operator import attrgetter
+from typing import Callable, Dict, Optional, Any, Iterable, Iterator, List, Set, Tuple
 from source.college_erp.models.user import User
 from source.college_erp.models.course import Course
-from source.college_erp.models.enrollment import Enrollment
+from source.college_erp.models.enrollment import Enrollment, EnrollmentStatus
 from source.college_erp.models.grade import Grade
+from source.college_erp.query import Query
+
+# Ordered set of row ids: a dict with None values keeps insertion order.
+IdSet = Dict[str, None]
+
+def _index_add(index: Dict[Any, IdSet], key: Any, row_id: str):
+    """Adds a row id to the bucket for the given key."""
+    index.setdefault(key, {})[row_id] = None
+
+class _StatusQueue:
+    """
+    Seekable copy of one (course, status) bucket: the sequence numbers at
+    which its enrollments entered the status, ascending, with their ids.
+    Leaving entries are only counted, then dropped in one rebuild once they
+    are the majority.
+    """
+    __slots__ = ("seqs", "ids", "dead")
+
+    def __init__(self):
+        self.seqs: List[int] = []
+        self.ids: List[str] = []
+        self.dead = 0
+
+def _index_discard(index: Dict[Any, IdSet], key: Any, row_id: str):
+    """Removes a row id from the bucket for the given key, dropping empty buckets."""
+    bucket = index.get(key)
+    if bucket is not None:
+        bucket.pop(row_id, None)
+        if not bucket:
+            del index[key]
+
+# Number of lock stripes shared by all courses (see Database.course_locks)
+COURSE_LOCK_STRIPES = 64
+
+# Rows read per latched step by Database.iter_grades_by_student
+GRADE_SCAN_BATCH = 10_000
+
+def _latched(method):
+    """Runs a mutation method under the database's short internal latch."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        try:
+            with self._latch:
+                return method(self, *args, **kwargs)
+        finally:
+            if self._after_latch:
+                self._run_after_latch()
+    return wrapper
+
+class DeletePolicy(Enum):
+    """What happens to referencing rows when a referenced row is deleted."""
+    CASCADE = "cascade"    # delete the referencing rows as well
+    RESTRICT = "restrict"  # refuse the delete while referencing rows exist
+
+class IntegrityError(Exception):
+    """Raised when a delete is blocked by a RESTRICT foreign key."""
+
+# Foreign keys from the ERD: parent table -> [(child table, FK column)]
+FOREIGN_KEYS: Dict[str, List[Tuple[str, str]]] = {
+    "users": [("enrollments", "student_id"), ("grades", "student_id"), ("courses", "coordinator_id")],
+    "courses": [("enrollments", "course_id"), ("grades", "course_id")],
+}
+
+DEFAULT_DELETE_POLICIES: Dict[Tuple[str, str], DeletePolicy] = {
+    ("enrollments", "student_id"): DeletePolicy.CASCADE,
+    ("grades", "student_id"): DeletePolicy.CASCADE,
+    ("courses", "coordinator_id"): DeletePolicy.RESTRICT,
+    ("enrollments", "course_id"): DeletePolicy.CASCADE,
+    ("grades", "course_id"): DeletePolicy.CASCADE,
+}
+
+INSERT = "insert"
+UPDATE = "update"
+DELETE = "delete"
+CLEAR = "clear"
+
+@dataclass(frozen=True, slots=True)
+class Change:
+    """A mutation of one row (or, for CLEAR, of a whole table), as seen by change listeners."""
+    table: str       # "users", "courses", "enrollments" or "grades"
+    action: str      # INSERT, UPDATE, DELETE or CLEAR
+    old: Any = None  # Row before the change (UPDATE, DELETE)
+    new: Any = None  # Row after the change (INSERT, UPDATE)
+
+ChangeListener = Callable[[Change], None]
+
+_ABSENT = object()  # a row that did not exist at a snapshot's version
+
+class _SnapshotTable(Mapping):
+    """
+    Read-only view of one in-memory table as of a snapshot version: the
+    live row, unless it was written after that version, in which case the
+    first version recorded after it (see Database._keep_version).
+    """
+    def __init__(self, db: "Database", table: str, version: int):
+        self._db = db
+        self._table = table
+        self._version = version
+
+    def get(self, key: str, default: Any = None) -> Any:
+        # The live row is read first: writers record a version before
+        # changing the row, so a changed row always has its record.
+        row = getattr(self._db, self._table).get(key, _ABSENT)
+        versions = self._db._history[self._table].get(key)
+        if versions:
+            for version, old in versions:
+                if version > self._version:
+                    row = old
+                    break
+        return default if row is _ABSENT else row
+
+    def __getitem__(self, key: str) -> Any:
+        row = self.get(key, _ABSENT)
+        if row is _ABSENT:
+            raise KeyError(key)
+        return row
+
+    def __contains__(self, key: object) -> bool:
+        return self.get(key, _ABSENT) is not _ABSENT
+
+    def _candidates(self) -> Dict[str, None]:
+        # Live keys, then keys written since the oldest open snapshot (which
+        # include rows deleted since this one); list() copies each atomically.
+        live = list(getattr(self._db, self._table))
+        return dict.fromkeys(live + list(self._db._history[self._table]))
+
+    def __iter__(self) -> Iterator[str]:
+        return (key for key, _ in self.items())
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.items())
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        db, table, snapshot_version = self._db, self._table, self._version
+        for key in self._candidates():
+            row = getattr(db, table).get(key, _ABSENT)  # same steps as get(), inlined
+            versions = db._history[table].get(key)
+            if versions:
+                for version, old in versions:
+                    if version > snapshot_version:
+                        row = old
+                        break
+            if row is not _ABSENT:
+                yield key, row
+
+    def values(self) -> Iterator[Any]:
+        return (row for _, row in self.items())
+
+class Snapshot:
+    """
+    Read-only, point-in-time view of the users, courses, enrollments and
+    grades tables, for reports that iterate whole tables while services
+    keep writing. Close it (or use it as a context manager) when done, so
+    the database can drop the row versions it kept for it.
+    """
+    def __init__(self, tables: Dict[str, Mapping], release: Callable[[], None]):
+        self.users = tables["users"]
+        self.courses = tables["courses"]
+        self.enrollments = tables["enrollments"]
+        self.grades = tables["grades"]
+        self._finalizer = weakref.finalize(self, release)
+
+    def get_user_by_id(self, user_id: str) -> Optional[User]:
+        return self.users.get(user_id)
+
+    def close(self):
+        """Releases the snapshot; runs at most once, and on garbage collection otherwise."""
+        self._finalizer()
+
+    def __enter__(self) -> "Snapshot":
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        self.close()
 
 class Database:
     """
@@ -21,16 +209,614 @@ class Database:
         self.enrollments: Dict[str, Enrollment] = {}
         self.grades: Dict[str, Grade] = {}
 
+        # Secondary indexes (row ids only; the tables above own the rows)
+        self._enrollment_by_pair: Dict[Tuple[str, str], str] = {}
+        self._enrollments_by_student: Dict[str, IdSet] = {}
+        self._enrollments_by_course: Dict[str, IdSet] = {}
+        self._enrollments_by_status: Dict[EnrollmentStatus, IdSet] = {}
+        self._grade_by_pair: Dict[Tuple[str, str], str] = {}
+        self._grades_by_student: Dict[str, IdSet] = {}
+        self._grades_by_course: Dict[str, IdSet] = {}
+        self._courses_by_coordinator: Dict[str, IdSet] = {}
+        self._enrollments_by_course_status: Dict[Tuple[str, EnrollmentStatus], IdSet] = {}
+        # Sequence number of the moment each enrollment entered its current status, and the
+        # (course, status) buckets as queues ordered by it (see page_enrollments_by_course_and_status)
+        self._status_seq: Dict[str, int] = {}
+        self._status_queues: Dict[Tuple[str, EnrollmentStatus], _StatusQueue] = {}
+        self._next_seq = itertools.count()
+
+        self._table_indexes: Dict[str, Tuple[dict, ...]] = {
+            "users": (),
+            "courses": (self._courses_by_coordinator,),
+            "enrollments": (self._enrollment_by_pair, self._enrollments_by_student, self._enrollments_by_course,
+                            self._enrollments_by_status, self._enrollments_by_course_status,
+                            self._status_seq, self._status_queues),
+            "grades": (self._grade_by_pair, self._grades_by_student, self._grades_by_course),
+        }
+
+        self.delete_policies: Dict[Tuple[str, str], DeletePolicy] = dict(DEFAULT_DELETE_POLICIES)
+        self._listeners: List[ChangeListener] = []
+
+        # Row versions kept for open snapshots: table -> row id -> [(version, row before it)]
+        self._version = 0
+        self._open_snapshots: Dict[int, int] = {}  # snapshot version -> open snapshots
+        self._history: Dict[str, Dict[str, List[Tuple[int, Any]]]] = {table: {} for table in self._table_indexes}
+
+        # The latch keeps the tables and their indexes consistent under
+        # concurrent writers (and keeps index lookups from seeing a
+        # half-applied write); it is only held for one call or transaction.
+        # Check-then-act service logic is serialized per course with the
+        # striped course locks instead.
+        self._latch = threading.RLock()
+        self._after_latch: Dict[int, List[Callable[[], None]]] = {}  # thread id -> callbacks (see after_latch)
+        self._course_locks = [threading.RLock() for _ in range(COURSE_LOCK_STRIPES)]
+
+    @contextmanager
+    def course_locks(self, course_ids: Iterable[str]) -> Iterator[None]:
+        """
+        Holds the lock stripes of the given courses. Stripes are taken in a
+        fixed order, so callers locking several courses cannot deadlock.
+        """
+        stripes = sorted({self.course_stripe(course_id) for course_id in course_ids})
+        with ExitStack() as stack:
+            for stripe in stripes:
+                stack.enter_context(self._course_locks[stripe])
+            yield
+
+    def course_stripe(self, course_id: str) -> int:
+        """Index of the lock stripe guarding a course."""
+        return hash(course_id) % COURSE_LOCK_STRIPES
+
+    def course_lock(self, course_id: str):
+        """Holds the lock stripe of one course."""
+        return self.course_locks((course_id,))
+
+    def add_listener(self, listener: ChangeListener):
+        """Registers a callback invoked synchronously with a Change after every mutation."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: ChangeListener):
+        """Unregisters a change callback."""
+        self._listeners.remove(listener)
+
+    def after_latch(self, callback: Callable[[], None]):
+        """
+        Runs `callback` once the calling thread no longer holds the latch:
+        right away, or when its current write or transaction ends. Listeners
+        run under the latch and use this for anything that may wait on other
+        threads, which could need the latch themselves.
+        """
+        if not self._latch._is_owned():
+            callback()
+            return
+        callbacks = self._after_latch.setdefault(threading.get_ident(), [])
+        if callback not in callbacks:
+            callbacks.append(callback)
+
+    def _run_after_latch(self):
+        if not self._latch._is_owned():
+            for callback in self._after_latch.pop(threading.get_ident(), ()):
+                callback()
+
+    def _notify(self, table: str, action: str, old: Any = None, new: Any = None):
+        """Delivers a Change to the listeners; free when there are none."""
+        if self._listeners:
+            change = Change(table, action, old, new)
+            for listener in tuple(self._listeners):
+                listener(change)
+
+    def _keep_version(self, table: str, key: str, old: Any):
+        """
+        Called under the latch before a row is inserted, replaced or deleted:
+        while snapshots are open, records the row as it was (None if absent)
+        so they keep reading it. Free when no snapshot is open.
+        """
+        if self._open_snapshots:
+            self._version += 1
+            self._history[table].setdefault(key, []).append((self._version, _ABSENT if old is None else old))
+
+    def snapshot(self) -> Snapshot:
+        """
+        Returns a consistent, read-only view of all tables as of now, in
+        O(1). Writers never wait for it: while it is open they record the
+        previous version of each row they change, and the snapshot reads
+        those instead of the live rows.
+        """
+        with self._latch:  # taken between two writes or transactions, never inside one
+            version = self._version
+            self._open_snapshots[version] = self._open_snapshots.get(version, 0) + 1
+        tables = {table: _SnapshotTable(self, table, version) for table in self._table_indexes}
+        return Snapshot(tables, functools.partial(self._release_snapshot, version))
+
+    def _release_snapshot(self, version: int):
+        """Forgets a closed snapshot and the row versions no open snapshot needs any more."""
+        with self._latch:
+            remaining = self._open_snapshots.pop(version) - 1
+            if remaining:
+                self._open_snapshots[version] = remaining
+            if not self._open_snapshots:
+                self._history = {table: {} for table in self._table_indexes}
+                return
+            oldest = min(self._open_snapshots)
+            for table, rows in self._history.items():
+                kept = {}
+                for key, versions in rows.items():
+                    newer = [entry for entry in versions if entry[0] > oldest]
+                    if newer:
+                        kept[key] = newer
+                self._history[table] = kept
+
+    def query(self, table: str) -> Query:
+        """
+        Starts a query over a table ("users", "courses", "enrollments" or
+        "grades"); see `source.query.Query` for filters, ordering and paging.
+        """
+        return Query(self, table)
+
     def get_user_by_id(self, user_id: str) -> Optional[User]:
-        """Fetches a user by their ID."""
-        return copy.deepcopy(self.users.get(user_id))
+        """
+        Fetches a user by their ID.
+        Users are frozen and replaced rather than mutated on update (see
+        update_user), so the stored object is returned without copying.
+        """
+        return self.users.get(user_id)
+
+    # --- Users and courses ---
+
+    @_latched
+    def add_user(self, user: User):
+        """Inserts or replaces a user."""
+        old = self.users.get(user.user_id)
+        self._keep_version("users", user.user_id, old)
+        self.users[user.user_id] = user
+        self._notify("users", UPDATE if old else INSERT, old, user)
+
+    @_latched
+    def add_users(self, users: Iterable[User]):
+        """Inserts or replaces many users in one step."""
+        if self._listeners or self._open_snapshots:
+            for user in users:
+                self.add_user(user)
+        else:
+            self.users.update((user.user_id, user) for user in users)
+
+    @_latched
+    def update_user(self, user_id: str, **changes: Any) -> Optional[User]:
+        """
+        Updates fields of a user by storing a modified copy, leaving
+        previously fetched user objects untouched.
+        """
+        user = self.users.get(user_id)
+        if user is None:
+            return None
+        updated = dataclasses.replace(user, **changes)
+        self._keep_version("users", user_id, user)
+        self.users[user_id] = updated
+        self._notify("users", UPDATE, user, updated)
+        return updated
+
+    @_latched
+    def remove_user(self, user_id: str) -> Optional[User]:
+        """Deletes only the user row, returning it. See delete_user for FK handling."""
+        user = self.users.get(user_id)
+        if user is not None:
+            self._keep_version("users", user_id, user)
+            del self.users[user_id]
+            self._notify("users", DELETE, user)
+        return user
+
+    @_latched
+    def add_course(self, course: Course):
+        """Inserts or replaces a course."""
+        old = self.courses.get(course.course_id)
+        if old is not None:
+            _index_discard(self._courses_by_coordinator, old.coordinator_id, old.course_id)
+        self._keep_version("courses", course.course_id, old)
+        self.courses[course.course_id] = course
+        _index_add(self._courses_by_coordinator, course.coordinator_id, course.course_id)
+        self._notify("courses", UPDATE if old else INSERT, old, course)
+
+    @_latched
+    def add_courses(self, courses: Iterable[Course]):
+        """Inserts or replaces many courses."""
+        for course in courses:
+            self.add_course(course)
+
+    @_latched
+    def remove_course(self, course_id: str) -> Optional[Course]:
+        """Deletes only the course row, returning it. See delete_course for FK handling."""
+        course = self.courses.get(course_id)
+        if course is not None:
+            self._keep_version("courses", course_id, course)
+            del self.courses[course_id]
+            _index_discard(self._courses_by_coordinator, course.coordinator_id, course_id)
+            self._notify("courses", DELETE, course)
+        return course
+
+    def get_all_courses(self) -> List[Course]:
+        """Fetches every course (the catalog)."""
+        return list(self.courses.values())
+
+    @_latched
+    def get_courses_by_coordinator(self, professor_id: str) -> List[Course]:
+        """Fetches all courses coordinated by a professor."""
+        return [self.courses[cid] for cid in self._courses_by_coordinator.get(professor_id, ())]
+
+    # --- Enrollments ---
+
+    @_latched
+    def add_enrollment(self, enrollment: Enrollment):
+        """Inserts an enrollment and indexes it."""
+        eid = enrollment.enrollment_id
+        if eid in self.enrollments:
+            self.remove_enrollment(eid)
+        self._keep_version("enrollments", eid, None)
+        self.enrollments[eid] = enrollment
+        self._enrollment_by_pair[(enrollment.student_id, enrollment.course_id)] = eid
+        _index_add(self._enrollments_by_student, enrollment.student_id, eid)
+        _index_add(self._enrollments_by_course, enrollment.course_id, eid)
+        _index_add(self._enrollments_by_status, enrollment.status, eid)
+        _index_add(self._enrollments_by_course_status, (enrollment.course_id, enrollment.status), eid)
+        self._enqueue(eid, (enrollment.course_id, enrollment.status))
+        self._notify("enrollments", INSERT, new=enrollment)
+
+    @_latched
+    def add_enrollments(self, enrollments: Iterable[Enrollment]):
+        """Inserts many enrollments."""
+        for enrollment in enrollments:
+            self.add_enrollment(enrollment)
+
+    @_latched
+    def update_enrollment_status(self, enrollment_id: str, status: EnrollmentStatus) -> Optional[Enrollment]:
+        """Changes the status of an enrollment and moves it between status buckets."""
+        enrollment = self.enrollments.get(enrollment_id)
+        if enrollment is None:
+            return None
+        _index_discard(self._enrollments_by_status, enrollment.status, enrollment_id)
+        _index_discard(self._enrollments_by_course_status, (enrollment.course_id, enrollment.status), enrollment_id)
+        self._dequeue(enrollment_id, (enrollment.course_id, enrollment.status))
+        old = enrollment
+        enrollment = dataclasses.replace(enrollment, status=status)
+        self._keep_version("enrollments", enrollment_id, old)
+        self.enrollments[enrollment_id] = enrollment
+        _index_add(self._enrollments_by_status, status, enrollment_id)
+        _index_add(self._enrollments_by_course_status, (enrollment.course_id, status), enrollment_id)
+        self._enqueue(enrollment_id, (enrollment.course_id, status))
+        self._notify("enrollments", UPDATE, old, enrollment)
+        return enrollment
+
+    @_latched
+    def remove_enrollment(self, enrollment_id: str) -> Optional[Enrollment]:
+        """Deletes an enrollment and unindexes it."""
+        enrollment = self.enrollments.get(enrollment_id)
+        if enrollment is None:
+            return None
+        self._keep_version("enrollments", enrollment_id, enrollment)
+        del self.enrollments[enrollment_id]
+        pair = (enrollment.student_id, enrollment.course_id)
+        if self._enrollment_by_pair.get(pair) == enrollment_id:
+            del self._enrollment_by_pair[pair]
+        _index_discard(self._enrollments_by_student, enrollment.student_id, enrollment_id)
+        _index_discard(self._enrollments_by_course, enrollment.course_id, enrollment_id)
+        _index_discard(self._enrollments_by_status, enrollment.status, enrollment_id)
+        _index_discard(self._enrollments_by_course_status, (enrollment.course_id, enrollment.status), enrollment_id)
+        self._dequeue(enrollment_id, (enrollment.course_id, enrollment.status))
+        self._notify("enrollments", DELETE, enrollment)
+        return enrollment
+
+    @_latched
+    def find_enrollment(self, student_id: str, course_id: str) -> Optional[Enrollment]:
+        """Fetches the enrollment of a student in a course, if any."""
+        eid = self._enrollment_by_pair.get((student_id, course_id))
+        return self.enrollments[eid] if eid is not None else None
+
+    @_latched
+    def get_enrollments_by_student(self, student_id: str) -> List[Enrollment]:
+        """Fetches all enrollments of a student."""
+        return [self.enrollments[eid] for eid in self._enrollments_by_student.get(student_id, ())]
+
+    @_latched
+    def get_enrollments_by_course(self, course_id: str) -> List[Enrollment]:
+        """Fetches all enrollments in a course."""
+        return [self.enrollments[eid] for eid in self._enrollments_by_course.get(course_id, ())]
+
+    @_latched
+    def get_enrollments_by_status(self, status: EnrollmentStatus) -> List[Enrollment]:
+        """Fetches all enrollments with the given status."""
+        return [self.enrollments[eid] for eid in self._enrollments_by_status.get(status, ())]
+
+    @_latched
+    def get_enrollments_by_course_and_status(self, course_id: str, status: EnrollmentStatus) -> List[Enrollment]:
+        """Fetches a course's enrollments with the given status, in the order they entered it."""
+        return [self.enrollments[eid] for eid in self._enrollments_by_course_status.get((course_id, status), ())]
+
+    def count_enrollments(self, course_id: str, status: EnrollmentStatus) -> int:
+        """Counts a course's enrollments with the given status in O(1)."""
+        return len(self._enrollments_by_course_status.get((course_id, status), ()))
+
+    def get_pending_enrollments(self, course_id: str) -> List[Enrollment]:
+        """Fetches the PENDING enrollments of a course (its approval queue)."""
+        return self.get_enrollments_by_course_and_status(course_id, EnrollmentStatus.PENDING)
+
+    @_latched
+    def page_enrollments_by_course_and_status(self, course_id: str, status: EnrollmentStatus,
+                                              after: Optional[int] = None,
+                                              limit: Optional[int] = None) -> List[Tuple[int, Enrollment]]:
+        """
+        Up to `limit` of a course's enrollments with the given status, in the
+        order they entered it, as (position, enrollment) pairs starting after
+        position `after`. Positions only grow, so one stays a valid cursor
+        after its enrollment changes status or is deleted. Seeks in
+        O(log n), then reads only the page.
+        """
+        queue = self._status_queues.get((course_id, status))
+        if queue is None:
+            return []
+        seqs, ids, current = queue.seqs, queue.ids, self._status_seq
+        page: List[Tuple[int, Enrollment]] = []
+        for i in range(0 if after is None else bisect_right(seqs, after), len(seqs)):
+            if limit is not None and len(page) >= limit:
+                break
+            if current.get(ids[i]) == seqs[i]:  # else the enrollment has left the bucket since
+                page.append((seqs[i], self.enrollments[ids[i]]))
+        return page
+
+    def _enqueue(self, enrollment_id: str, key: Tuple[str, EnrollmentStatus]):
+        seq = self._status_seq[enrollment_id] = next(self._next_seq)
+        queue = self._status_queues.get(key)
+        if queue is None:
+            queue = self._status_queues[key] = _StatusQueue()
+        queue.seqs.append(seq)
+        queue.ids.append(enrollment_id)
+
+    def _dequeue(self, enrollment_id: str, key: Tuple[str, EnrollmentStatus]):
+        """Called after the enrollment left the bucket `key`."""
+        self._status_seq.pop(enrollment_id, None)
+        queue = self._status_queues.get(key)
+        if queue is None:
+            return
+        queue.dead += 1
+        if queue.dead * 2 > len(queue.seqs):
+            bucket = self._enrollments_by_course_status.get(key)
+            if not bucket:
+                del self._status_queues[key]
+                return
+            # The bucket keeps the order the enrollments entered it, which is the queue's order
+            queue.ids = list(bucket)
+            queue.seqs = [self._status_seq[eid] for eid in queue.ids]
+            queue.dead = 0
+
+    # --- Grades ---
+
+    @_latched
+    def add_grade(self, grade: Grade):
+        """Inserts a grade and indexes it."""
+        gid = grade.grade_id
+        if gid in self.grades:
+            self.remove_grade(gid)
+        self._keep_version("grades", gid, None)
+        self.grades[gid] = grade
+        self._grade_by_pair[(grade.student_id, grade.course_id)] = gid
+        _index_add(self._grades_by_student, grade.student_id, gid)
+        _index_add(self._grades_by_course, grade.course_id, gid)
+        self._notify("grades", INSERT, new=grade)
+
+    @_latched
+    def add_grades(self, grades: Iterable[Grade]):
+        """Inserts many grades."""
+        for grade in grades:
+            self.add_grade(grade)
+
+    @_latched
+    def update_grade_value(self, grade_id: str, grade_value: str) -> Optional[Grade]:
+        """Changes the value of an existing grade."""
+        old = self.grades.get(grade_id)
+        if old is None:
+            return None
+        grade = dataclasses.replace(old, grade_value=grade_value)
+        self._keep_version("grades", grade_id, old)
+        self.grades[grade_id] = grade
+        self._notify("grades", UPDATE, old, grade)
+        return grade
+
+    @_latched
+    def remove_grade(self, grade_id: str) -> Optional[Grade]:
+        """Deletes a grade and unindexes it."""
+        grade = self.grades.get(grade_id)
+        if grade is None:
+            return None
+        self._keep_version("grades", grade_id, grade)
+        del self.grades[grade_id]
+        pair = (grade.student_id, grade.course_id)
+        if self._grade_by_pair.get(pair) == grade_id:
+            del self._grade_by_pair[pair]
+        _index_discard(self._grades_by_student, grade.student_id, grade_id)
+        _index_discard(self._grades_by_course, grade.course_id, grade_id)
+        self._notify("grades", DELETE, grade)
+        return grade
+
+    @_latched
+    def find_grade(self, student_id: str, course_id: str) -> Optional[Grade]:
+        """Fetches the grade of a student in a course, if any."""
+        gid = self._grade_by_pair.get((student_id, course_id))
+        return self.grades[gid] if gid is not None else None
+
+    @_latched
+    def get_grades_by_student(self, student_id: str) -> List[Grade]:
+        """Fetches all grades of a student."""
+        return [self.grades[gid] for gid in self._grades_by_student.get(student_id, ())]
+
+    @_latched
+    def get_grades_by_course(self, course_id: str) -> List[Grade]:
+        """Fetches all grades in a course."""
+        return [self.grades[gid] for gid in self._grades_by_course.get(course_id, ())]
+
+    def iter_grades_by_student(self, start: Optional[str] = None, stop: Optional[str] = None,
+                               after: Optional[Tuple[str, str, str]] = None) -> Iterator[Grade]:
+        """
+        Yields the grades of students with ids in [start, stop) (None means
+        unbounded) in (student_id, course_id, grade_id) order, resuming
+        after that key if `after` is given: one sorted pass for reports
+        that walk every student. Rows are read from the per-student index
+        about GRADE_SCAN_BATCH at a time under the latch, so writers are
+        held back for one batch at most.
+        """
+        if after is not None:
+            start = after[0] if start is None else max(start, after[0])
+        with self._latch:
+            student_ids = sorted(sid for sid in self._grades_by_student
+                                 if (start is None or sid >= start) and (stop is None or sid < stop))
+        order = attrgetter("student_id", "course_id", "grade_id")
+        position = 0
+        while position < len(student_ids):
+            rows: List[Grade] = []
+            with self._latch:
+                while position < len(student_ids) and len(rows) < GRADE_SCAN_BATCH:
+                    own = [self.grades[gid] for gid in self._grades_by_student.get(student_ids[position], ())]
+                    rows.extend(sorted(own, key=order))
+                    position += 1
+            for row in rows:
+                if after is None or order(row) > after:
+                    yield row
+
+    # --- Foreign-key aware deletes ---
+
+    def _referencing_ids(self, child_table: str, column: str, key: str) -> List[str]:
+        """Ids of the rows in child_table whose FK column equals key, via the indexes."""
+        if child_table == "enrollments":
+            rows = self.get_enrollments_by_student(key) if column == "student_id" else self.get_enrollments_by_course(key)
+            return [en.enrollment_id for en in rows]
+        if child_table == "grades":
+            rows = self.get_grades_by_student(key) if column == "student_id" else self.get_grades_by_course(key)
+            return [grade.grade_id for grade in rows]
+        return [course.course_id for course in self.get_courses_by_coordinator(key)]
+
+    def get_referenced_ids(self, child_table: str, column: str) -> Set[str]:
+        """Distinct values of a FK column, read from the index keys rather than the rows."""
+        index = {
+            ("enrollments", "student_id"): self._enrollments_by_student,
+            ("enrollments", "course_id"): self._enrollments_by_course,
+            ("grades", "student_id"): self._grades_by_student,
+            ("grades", "course_id"): self._grades_by_course,
+            ("courses", "coordinator_id"): self._courses_by_coordinator,
+        }[(child_table, column)]
+        return set(index)
+
+    def _plan_delete(self, table: str, key: str, plan: Dict[str, IdSet]):
+        """
+        Collects the row and everything that cascades from it into `plan`,
+        raising IntegrityError before anything is deleted if a RESTRICT
+        foreign key still references one of them.
+        """
+        if key in plan.setdefault(table, {}):
+            return
+        plan[table][key] = None
+        for child_table, column in FOREIGN_KEYS.get(table, ()):
+            child_ids = self._referencing_ids(child_table, column, key)
+            if not child_ids:
+                continue
+            if self.delete_policies[(child_table, column)] == DeletePolicy.RESTRICT:
+                raise IntegrityError(f"{table} row {key!r} is still referenced by {child_table}.{column}")
+            for child_id in child_ids:
+                self._plan_delete(child_table, child_id, plan)
+
+    def _apply_delete(self, plan: Dict[str, IdSet]):
+        """Deletes the planned rows, children before parents."""
+        removers = (("enrollments", self.remove_enrollment), ("grades", self.remove_grade),
+                    ("courses", self.remove_course), ("users", self.remove_user))
+        with self.transaction():
+            for table, remove in removers:
+                for key in plan.get(table, ()):
+                    remove(key)
+
+    @_latched
+    def delete_user(self, user_id: str) -> Optional[User]:
+        """
+        Deletes a user together with the rows that reference it, following
+        `delete_policies`. Costs O(related rows). Raises IntegrityError
+        (deleting nothing) if a RESTRICT reference exists, e.g. a professor
+        who still coordinates courses.
+        """
+        user = self.users.get(user_id)
+        if user is None:
+            return None
+        plan: Dict[str, IdSet] = {}
+        self._plan_delete("users", user_id, plan)
+        self._apply_delete(plan)
+        return user
+
+    @_latched
+    def delete_course(self, course_id: str) -> Optional[Course]:
+        """Deletes a course together with its enrollments and grades, following `delete_policies`."""
+        course = self.courses.get(course_id)
+        if course is None:
+            return None
+        plan: Dict[str, IdSet] = {}
+        self._plan_delete("courses", course_id, plan)
+        self._apply_delete(plan)
+        return course
+
+    @_latched
+    def purge_orphans(self) -> Dict[str, int]:
+        """
+        Maintenance pass deleting rows left behind by raw `remove_*` calls:
+        rows whose CASCADE foreign key points at a missing parent (and, in
+        turn, whatever cascades from them). Orphans of RESTRICT keys are kept.
+        Returns the number of rows deleted per table.
+        """
+        parents = {child: parent for parent, refs in FOREIGN_KEYS.items() for child in refs}
+        plan: Dict[str, IdSet] = {}
+        for (child_table, column), parent_table in parents.items():
+            if self.delete_policies[(child_table, column)] != DeletePolicy.CASCADE:
+                continue
+            parent_rows = getattr(self, parent_table)
+            for key in self.get_referenced_ids(child_table, column):
+                if key in parent_rows:
+                    continue
+                for child_id in self._referencing_ids(child_table, column, key):
+                    self._plan_delete(child_table, child_id, plan)
+        self._apply_delete(plan)
+        return {table: len(keys) for table, keys in plan.items()}
+
+    @contextmanager
+    def transaction(self) -> Iterator["Database"]:
+        """
+        Groups several mutations into one unit of work. For the in-memory
+        tables this holds the latch, so no other writer interleaves with
+        the batch; storage backends override it.
+        """
+        try:
+            with self._latch:
+                yield self
+        finally:
+            if self._after_latch:
+                self._run_after_latch()
+
+    def for_child_process(self) -> "Database":
+        """
+        The database to use from a forked worker process. Forked children
+        inherit the in-memory tables, so this is the database itself;
+        backends holding connections return a freshly opened one.
+        """
+        return self
+
+    @_latched
+    def clear_table(self, table: str):
+        """Deletes every row of one table, without touching rows that reference it."""
+        rows = getattr(self, table)
+        if self._open_snapshots:
+            for key, row in list(rows.items()):
+                self._keep_version(table, key, row)
+        rows.clear()
+        for index in self._table_indexes[table]:
+            index.clear()
+        self._notify(table, CLEAR)
 
+    @_latched
     def clear_all(self):
         """Clears all data from the mock database."""
-        self.users.clear()
-        self.courses.clear()
-        self.enrollments.clear()
-        self.grades.clear()
+        for table in ("users", "courses", "enrollments", "grades"):
+            self.clear_table(table)
 
 # A single instance to be used across the application
-mock_db = Database()
\ No newline at end of file
+mock_db = Database()
@@ -0,0 +1,237 @@
+"""
+Change-data-capture stream for the College ERP System.
+An EventBus turns every Database mutation into a typed, sequence-numbered
+ChangeEvent, keeps the latest ones in a bounded ring buffer and hands them
+to subscribers in batches. Subscribers read at their own pace, can resume
+from a sequence number, and either hold writers back when they fall too
+far behind or skip what they missed.
+"""
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, List, Optional, Tuple
+from source.college_erp.database import CLEAR, DELETE, INSERT, Change, Database
+from source.college_erp.models.enrollment import EnrollmentStatus
+
+DEFAULT_CAPACITY = 65_536
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_BLOCK_TIMEOUT = 1.0
+
+# What a subscriber that falls a whole buffer behind does
+BLOCK = "block"  # writers wait for it to catch up (up to the bus's block_timeout)
+DROP = "drop"    # the oldest events are overwritten; it skips them and counts them as lost
+
+_SINGULAR = {"users": "user", "courses": "course", "enrollments": "enrollment", "grades": "grade"}
+_STATUS_EVENTS = {
+    EnrollmentStatus.PENDING: "requested",
+    EnrollmentStatus.WAITLISTED: "waitlisted",
+    EnrollmentStatus.ENROLLED: "approved",
+    EnrollmentStatus.REJECTED: "rejected",
+}
+
+def classify(change: Change) -> str:
+    """
+    The event type of a change, e.g. "enrollment.approved",
+    "grade.uploaded" or "user.deleted". Enrollment inserts and status
+    updates are named after the status they lead to; a deleted enrollment
+    is "enrollment.dropped".
+    """
+    entity = _SINGULAR.get(change.table, change.table)
+    if change.action == CLEAR:
+        return f"{entity}.cleared"
+    if entity == "enrollment":
+        if change.action == DELETE:
+            return "enrollment.dropped"
+        if change.action == INSERT or change.old.status != change.new.status:
+            return f"enrollment.{_STATUS_EVENTS[change.new.status]}"
+        return "enrollment.updated"
+    if entity == "grade":
+        return {INSERT: "grade.uploaded", DELETE: "grade.removed"}.get(change.action, "grade.changed")
+    return {INSERT: f"{entity}.added", DELETE: f"{entity}.deleted"}.get(change.action, f"{entity}.updated")
+
+@dataclass(frozen=True, slots=True)
+class ChangeEvent:
+    """One captured mutation."""
+    seq: int          # Position in the stream, starting at 0
+    type: str         # See classify()
+    table: str
+    action: str
+    old: Any = None
+    new: Any = None
+    timestamp: float = 0.0  # time.time() when published
+
+class EventsLost(Exception):
+    """Raised when resuming from a sequence number the ring buffer no longer holds."""
+    def __init__(self, requested: int, oldest: int):
+        super().__init__(f"event {requested} is no longer buffered (oldest is {oldest})")
+        self.requested = requested
+        self.oldest = oldest
+
+class Subscription:
+    """
+    A reader's cursor into the bus. `poll` returns the next batch of
+    events; `start` runs a handler over the batches on a daemon thread.
+    """
+    def __init__(self, bus: "EventBus", cursor: int, batch_size: int, overflow: str):
+        self.bus = bus
+        self.cursor = cursor  # seq of the next event to read
+        self.batch_size = batch_size
+        self.overflow = overflow
+        self.lost = 0
+        self.error: Optional[BaseException] = None
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def lag(self) -> int:
+        """Events published but not read yet."""
+        return self.bus.next_seq - self.cursor
+
+    def poll(self, timeout: Optional[float] = None) -> List[ChangeEvent]:
+        """
+        Returns up to `batch_size` events in sequence order, waiting up to
+        `timeout` seconds (None: forever) for the first one. Returns an
+        empty list on timeout or once the subscription or bus is closed.
+        """
+        return self.bus._read(self, timeout)
+
+    def start(self, handler: Callable[[List[ChangeEvent]], None], poll_interval: float = 0.1):
+        """
+        Delivers batches to `handler` on a daemon thread until `close`.
+        If the handler raises, delivery stops and the exception is kept in `error`.
+        """
+        def deliver():
+            while not self._closed:
+                batch = self.poll(poll_interval)
+                if batch:
+                    try:
+                        handler(batch)
+                    except Exception as exc:
+                        self.error = exc
+                        return
+
+        self._thread = threading.Thread(target=deliver, name="event-subscriber", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stops reading; writers no longer wait for this subscription."""
+        self.bus._unsubscribe(self)
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+class EventBus:
+    """
+    In-process change stream over one database.
+
+    Events live in a ring buffer of `capacity` slots, so memory is bounded
+    and a subscriber can resume from any of the last `capacity` sequence
+    numbers. When a BLOCK subscriber still has to read the slot about to be
+    overwritten, the change is held back instead, and once the writer has
+    released the database latch (at the end of its write or transaction) it
+    waits for the subscriber up to `block_timeout` seconds and then
+    overwrites anyway (the subscriber counts the events as lost). A stuck
+    consumer slows writers down but cannot stall them forever, and a
+    consumer that reads the database is never waiting on a latch the
+    blocked writer holds.
+    """
+    def __init__(self, db: Database, capacity: int = DEFAULT_CAPACITY,
+                 block_timeout: float = DEFAULT_BLOCK_TIMEOUT):
+        if capacity < 1:
+            raise ValueError("the ring buffer needs at least one slot")
+        self.db = db
+        self.capacity = capacity
+        self.block_timeout = block_timeout
+        self.next_seq = 0
+        self._ring: List[Optional[ChangeEvent]] = [None] * capacity
+        self._held: Deque[Tuple[Change, float]] = deque()  # changes waiting for a BLOCK subscriber
+        self._subscriptions: List[Subscription] = []
+        self._cond = threading.Condition()
+        self._closed = False
+        db.add_listener(self._on_change)
+
+    @property
+    def oldest_seq(self) -> int:
+        """Sequence number of the oldest event still buffered."""
+        return max(0, self.next_seq - self.capacity)
+
+    def subscribe(self, from_seq: Optional[int] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                  overflow: str = BLOCK) -> Subscription:
+        """
+        Starts reading at `from_seq` (None: only events published from now
+        on). Raises EventsLost if that event has already been overwritten.
+        """
+        if overflow not in (BLOCK, DROP):
+            raise ValueError(f"unknown overflow policy {overflow!r}")
+        with self._cond:
+            cursor = self.next_seq if from_seq is None else from_seq
+            if cursor < self.oldest_seq:
+                raise EventsLost(cursor, self.oldest_seq)
+            if cursor > self.next_seq:
+                raise ValueError(f"event {cursor} has not been published yet")
+            subscription = Subscription(self, cursor, batch_size, overflow)
+            self._subscriptions.append(subscription)
+            return subscription
+
+    def close(self):
+        """Stops capturing changes and wakes every waiting subscriber."""
+        self.db.remove_listener(self._on_change)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for subscription in list(self._subscriptions):
+            subscription.close()
+
+    def _unsubscribe(self, subscription: Subscription):
+        with self._cond:
+            subscription._closed = True
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+            self._cond.notify_all()
+
+    def _blocked(self) -> bool:
+        """Whether publishing now would overwrite an event a BLOCK subscriber has not read."""
+        limit = self.next_seq - self.capacity
+        return any(sub.overflow == BLOCK and sub.cursor <= limit for sub in self._subscriptions)
+
+    def _on_change(self, change: Change):
+        with self._cond:
+            if not self._held and not self._blocked():
+                self._publish(change, time.time())
+                return
+            self._held.append((change, time.time()))
+        self.db.after_latch(self._drain)
+
+    def _publish(self, change: Change, timestamp: float):
+        seq = self.next_seq
+        self._ring[seq % self.capacity] = ChangeEvent(seq, classify(change), change.table, change.action,
+                                                      change.old, change.new, timestamp)
+        self.next_seq = seq + 1
+        self._cond.notify_all()
+
+    def _drain(self):
+        """Publishes the held events in order, waiting up to `block_timeout` for BLOCK subscribers."""
+        with self._cond:
+            deadline = time.monotonic() + self.block_timeout
+            while self._held:
+                remaining = deadline - time.monotonic()
+                if remaining > 0 and not self._closed and self._blocked():
+                    self._cond.wait(remaining)
+                    continue
+                self._publish(*self._held.popleft())
+
+    def _read(self, subscription: Subscription, timeout: Optional[float]) -> List[ChangeEvent]:
+        with self._cond:
+            if not self._cond.wait_for(lambda: subscription.cursor < self.next_seq
+                                       or subscription._closed or self._closed, timeout):
+                return []
+            if subscription._closed:
+                return []
+            if subscription.cursor < self.oldest_seq:
+                subscription.lost += self.oldest_seq - subscription.cursor
+                subscription.cursor = self.oldest_seq
+            end = min(self.next_seq, subscription.cursor + subscription.batch_size)
+            batch = [self._ring[seq % self.capacity] for seq in range(subscription.cursor, end)]
+            subscription.cursor = end
+            self._cond.notify_all()  # writers may be waiting for this subscriber
+            return batch
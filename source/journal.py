@@ -0,0 +1,471 @@
+"""
+Journal and snapshots for the in-memory Database.
+
+A Journal listens to a Database's changes and appends one record per
+mutation to a segment file ("journal-<n>.log"). The record is taken after
+the mutation has been applied, and appending only encodes into a memory
+buffer; a background thread writes the buffer and fsyncs it every
+`commit_interval` seconds, so one fsync covers every change made in that
+window (group commit).
+
+By default the journal is durable: once a write (or a whole transaction)
+releases the database latch, the writing thread waits for the group fsync
+that covers it, so no service call returns before its change is on disk.
+Concurrent writers still share one fsync. With `durable=False` the journal
+is write-behind instead: services return as soon as the change is applied
+in memory, so a crash can lose the changes of the last `commit_interval`
+seconds (plus the time the fsync takes) even though their callers saw them
+succeed; such callers can wait for the disk with `commit()`.
+
+`snapshot()` writes the full database as compact binary blocks
+("snapshot-<n>.bin") and drops the segments it covers. Recovery loads the
+newest snapshot through mmap and replays the journal segments after it; a
+record torn by a crash at the end of the last segment is discarded.
+
+Records and snapshot blocks are encoded with `marshal` plus a CRC32, which
+is fast and compact but only meant for files this module wrote itself.
+
+Typical use:
+
+    journal = Journal.open(mock_db, "/var/lib/erp")   # recover, then journal
+    ...
+    journal.close()
+"""
+import marshal
+import mmap
+import os
+import re
+import struct
+import threading
+import zlib
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from source.college_erp.database import CLEAR, DELETE, Change, Database
+from source.college_erp.models.user import User, UserRole
+from source.college_erp.models.admin import Admin
+from source.college_erp.models.professor import Professor
+from source.college_erp.models.student import Student
+from source.college_erp.models.course import Course
+from source.college_erp.models.enrollment import Enrollment, EnrollmentStatus
+from source.college_erp.models.grade import Grade
+
+TABLES = ("users", "courses", "enrollments", "grades")
+_TABLE_CODES = {table: code for code, table in enumerate(TABLES)}
+
+# Record operations
+PUT = 0    # insert or replace a row
+DEL = 1    # delete a row by key
+CLR = 2    # empty a table
+
+DEFAULT_COMMIT_INTERVAL = 0.005
+SNAPSHOT_BLOCK_ROWS = 100_000
+
+_RECORD_HEADER = struct.Struct("<II")       # payload length, crc32
+_SNAPSHOT_MAGIC = b"ERPSNAP1"
+_BLOCK_HEADER = struct.Struct("<BQI")       # table code, payload length, crc32
+_SEGMENT_NAME = re.compile(r"^journal-(\d{8})\.log$")
+_SNAPSHOT_NAME = re.compile(r"^snapshot-(\d{8})\.bin$")
+
+# --- Row codecs: model objects <-> tuples of marshal-able primitives ---
+
+def _user_to_tuple(user: User) -> tuple:
+    admitted = getattr(user, "date_of_admission", None)
+    return (user.role.value, user.user_id, user.name, user.password,
+            getattr(user, "branch", None), getattr(user, "cgpa", None),
+            admitted.toordinal() if admitted else None)
+
+def _user_from_tuple(row: tuple) -> User:
+    role, user_id, name, password, branch, cgpa, admitted = row
+    role = UserRole(role)
+    if role == UserRole.STUDENT:
+        return Student(user_id, name, password, branch, cgpa, date.fromordinal(admitted))
+    if role == UserRole.PROFESSOR:
+        return Professor(user_id, name, password, branch)
+    return Admin(user_id, name, password)
+
+def _course_to_tuple(course: Course) -> tuple:
+    return (course.course_id, course.name, course.coordinator_id, course.capacity, course.slots)
+
+def _enrollment_to_tuple(enrollment: Enrollment) -> tuple:
+    return (enrollment.enrollment_id, enrollment.student_id, enrollment.course_id, enrollment.status.value)
+
+_STATUSES = {status.value: status for status in EnrollmentStatus}
+
+def _enrollment_from_tuple(row: tuple) -> Enrollment:
+    enrollment_id, student_id, course_id, status = row
+    return Enrollment(enrollment_id, student_id, course_id, _STATUSES[status])
+
+def _grade_to_tuple(grade: Grade) -> tuple:
+    return (grade.grade_id, grade.student_id, grade.course_id, grade.grade_value)
+
+ROW_CODECS: Dict[str, Tuple[Callable[[Any], tuple], Callable[[tuple], Any]]] = {
+    "users": (_user_to_tuple, _user_from_tuple),
+    "courses": (_course_to_tuple, lambda row: Course(*row)),
+    "enrollments": (_enrollment_to_tuple, _enrollment_from_tuple),
+    "grades": (_grade_to_tuple, lambda row: Grade(*row)),
+}
+
+_ROW_KEYS = {"users": "user_id", "courses": "course_id", "enrollments": "enrollment_id", "grades": "grade_id"}
+
+def encode_change(change: Change) -> bytes:
+    """Encodes a Change as one framed journal record."""
+    if change.action == CLEAR:
+        body = (CLR, _TABLE_CODES[change.table], None)
+    elif change.action == DELETE:
+        body = (DEL, _TABLE_CODES[change.table], getattr(change.old, _ROW_KEYS[change.table]))
+    else:
+        body = (PUT, _TABLE_CODES[change.table], ROW_CODECS[change.table][0](change.new))
+    payload = marshal.dumps(body)
+    return _RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+def _iter_records(buffer) -> Iterator[Tuple[int, tuple]]:
+    """
+    Yields (end offset, record) for each intact record in a segment's bytes,
+    stopping at the first torn or corrupt one.
+    """
+    view = memoryview(buffer)
+    offset, size = 0, len(view)
+    try:
+        while offset + _RECORD_HEADER.size <= size:
+            length, crc = _RECORD_HEADER.unpack_from(view, offset)
+            start = offset + _RECORD_HEADER.size
+            end = start + length
+            if end > size or zlib.crc32(view[start:end]) != crc:
+                return
+            yield end, marshal.loads(view[start:end])
+            offset = end
+    finally:
+        view.release()
+
+def _apply_record(db: Database, record: tuple):
+    """
+    Re-applies one journal record through the Database's own methods.
+    Status and grade changes of an existing row are replayed as in-place
+    updates, which touch two index buckets instead of re-indexing the row.
+    """
+    op, table_code, data = record
+    table = TABLES[table_code]
+    if op == PUT:
+        if table == "enrollments":
+            old = db.enrollments.get(data[0])
+            if old is not None and old.student_id == data[1] and old.course_id == data[2]:
+                db.update_enrollment_status(data[0], _STATUSES[data[3]])
+            else:
+                db.add_enrollment(_enrollment_from_tuple(data))
+        elif table == "grades":
+            old = db.grades.get(data[0])
+            if old is not None and old.student_id == data[1] and old.course_id == data[2]:
+                db.update_grade_value(data[0], data[3])
+            else:
+                db.add_grade(Grade(*data))
+        elif table == "users":
+            db.add_user(_user_from_tuple(data))
+        else:
+            db.add_course(Course(*data))
+    elif op == DEL:
+        remove = {"users": db.remove_user, "courses": db.remove_course,
+                  "enrollments": db.remove_enrollment, "grades": db.remove_grade}[table]
+        remove(data)
+    else:
+        db.clear_table(table)
+
+def _numbered(directory: str, pattern: "re.Pattern[str]") -> List[Tuple[int, str]]:
+    found = []
+    for name in os.listdir(directory):
+        match = pattern.match(name)
+        if match:
+            found.append((int(match.group(1)), os.path.join(directory, name)))
+    return sorted(found)
+
+def _segment_path(directory: str, number: int) -> str:
+    return os.path.join(directory, f"journal-{number:08d}.log")
+
+def _snapshot_path(directory: str, number: int) -> str:
+    return os.path.join(directory, f"snapshot-{number:08d}.bin")
+
+def _fsync_directory(directory: str):
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+# --- Snapshots ---
+
+def write_snapshot(path: str, tables: Dict[str, List[Any]], fsync: bool = True):
+    """
+    Writes table rows as a snapshot file: a magic header followed by blocks of
+    up to SNAPSHOT_BLOCK_ROWS marshalled row tuples, each with a CRC32.
+    The file is written under a temporary name and renamed into place.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as out:
+        out.write(_SNAPSHOT_MAGIC)
+        for table in TABLES:
+            to_tuple = ROW_CODECS[table][0]
+            rows = tables.get(table, ())
+            for start in range(0, len(rows), SNAPSHOT_BLOCK_ROWS):
+                payload = marshal.dumps([to_tuple(row) for row in rows[start:start + SNAPSHOT_BLOCK_ROWS]])
+                out.write(_BLOCK_HEADER.pack(_TABLE_CODES[table], len(payload), zlib.crc32(payload)))
+                out.write(payload)
+        out.flush()
+        if fsync:
+            os.fsync(out.fileno())
+    os.replace(tmp_path, path)
+    if fsync:
+        _fsync_directory(os.path.dirname(path) or ".")
+
+def load_snapshot(db: Database, path: str) -> int:
+    """
+    Loads a snapshot into an empty Database, decoding each block straight
+    from the mmapped file. Returns the number of rows loaded.
+    Raises ValueError if the file is not an intact snapshot.
+    """
+    loaded = 0
+    with open(path, "rb") as src:
+        if os.fstat(src.fileno()).st_size < len(_SNAPSHOT_MAGIC):
+            raise ValueError(f"{path} is not a snapshot")
+        with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                if view[:len(_SNAPSHOT_MAGIC)] != _SNAPSHOT_MAGIC:
+                    raise ValueError(f"{path} is not a snapshot")
+                offset = len(_SNAPSHOT_MAGIC)
+                with db.transaction():
+                    while offset < len(view):
+                        table_code, length, crc = _BLOCK_HEADER.unpack_from(view, offset)
+                        start = offset + _BLOCK_HEADER.size
+                        block = view[start:start + length]
+                        if len(block) != length or zlib.crc32(block) != crc:
+                            raise ValueError(f"{path} has a corrupt block at offset {offset}")
+                        loaded += _load_block(db, TABLES[table_code], marshal.loads(block))
+                        block.release()
+                        offset = start + length
+            finally:
+                view.release()
+    return loaded
+
+def _load_block(db: Database, table: str, rows: List[tuple]) -> int:
+    from_tuple = ROW_CODECS[table][1]
+    if table == "users":
+        db.add_users(map(from_tuple, rows))
+    elif table == "courses":
+        db.add_courses(map(from_tuple, rows))
+    elif table == "enrollments":
+        for row in rows:
+            db.add_enrollment(from_tuple(row))
+    else:
+        for row in rows:
+            db.add_grade(from_tuple(row))
+    return len(rows)
+
+# --- Recovery ---
+
+@dataclass
+class RecoveryReport:
+    """What recovery found: snapshot rows loaded, journal records replayed, torn bytes dropped."""
+    snapshot: Optional[str] = None
+    snapshot_rows: int = 0
+    replayed: int = 0
+    truncated_bytes: int = 0
+    next_segment: int = 1
+
+def recover(db: Database, directory: str) -> RecoveryReport:
+    """
+    Rebuilds a Database from a journal directory: the newest snapshot, then
+    every journal segment written after it. A torn record at the end of the
+    last segment is cut off so appending can continue after it.
+    """
+    report = RecoveryReport()
+    snapshots = _numbered(directory, _SNAPSHOT_NAME)
+    first_segment = 0
+    if snapshots:
+        first_segment, report.snapshot = snapshots[-1]
+        report.snapshot_rows = load_snapshot(db, report.snapshot)
+        report.next_segment = first_segment
+
+    segments = [(n, path) for n, path in _numbered(directory, _SEGMENT_NAME) if n >= first_segment]
+    with db.transaction():
+        for index, (number, path) in enumerate(segments):
+            size = os.path.getsize(path)
+            good = 0
+            if size:
+                with open(path, "rb") as src, mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    for good, record in _iter_records(mapped):
+                        _apply_record(db, record)
+                        report.replayed += 1
+            if good < size:
+                if index != len(segments) - 1:
+                    raise ValueError(f"{path} is corrupt at offset {good}")
+                with open(path, "r+b") as torn:
+                    torn.truncate(good)
+                report.truncated_bytes = size - good
+            report.next_segment = number + 1
+    return report
+
+# --- Journal ---
+
+class Journal:
+    """
+    Append-only journal of a Database's mutations, with group commit.
+
+    With `durable` (the default) every write waits, after releasing the
+    database latch, until it is on disk; with `durable=False` writes return
+    at once and `commit_interval` bounds how long a change can sit in memory
+    before it is written and fsynced. `fsync=False` only writes to the OS
+    (for tests and benchmarks). With `snapshot_every`, a snapshot is taken automatically
+    once that many records were journaled since the last one.
+    """
+    def __init__(self, db: Database, directory: str, segment: int = 1,
+                 commit_interval: float = DEFAULT_COMMIT_INTERVAL,
+                 fsync: bool = True, snapshot_every: Optional[int] = None, durable: bool = True):
+        self.db = db
+        self.directory = directory
+        self.commit_interval = commit_interval
+        self.fsync = fsync
+        self.durable = durable
+        self.snapshot_every = snapshot_every
+        os.makedirs(directory, exist_ok=True)
+
+        self._segment = segment
+        self._file = open(_segment_path(directory, segment), "ab")
+        self._buffer: List[bytes] = []
+        self._appended = 0      # records handed to the journal
+        self._durable = 0       # records written (and fsynced) to disk
+        self._since_snapshot = 0
+        self._rotate_at: Optional[int] = None  # records before this index go to the current segment
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._snapshotter: Optional[threading.Thread] = None
+        self._closed = False
+        self.recovery: Optional[RecoveryReport] = None  # set by Journal.open
+
+        db.add_listener(self._on_change)
+        self._flusher = threading.Thread(target=self._run, name="journal-flush", daemon=True)
+        self._flusher.start()
+
+        # Rows that existed before journaling started are captured by a baseline snapshot
+        fresh = not _numbered(directory, _SNAPSHOT_NAME) and segment == 1
+        if fresh and any(len(getattr(db, table)) for table in TABLES):
+            self.snapshot()
+
+    @classmethod
+    def open(cls, db: Database, directory: str, **options: Any) -> "Journal":
+        """Recovers `db` from the directory (if it holds any data) and starts journaling it."""
+        os.makedirs(directory, exist_ok=True)
+        report = recover(db, directory)
+        journal = cls(db, directory, segment=report.next_segment, **options)
+        journal.recovery = report
+        return journal
+
+    def _on_change(self, change: Change):
+        record = encode_change(change)
+        with self._cond:
+            self._buffer.append(record)
+            self._appended += 1
+            self._since_snapshot += 1
+        if self.durable:
+            # Wait for the disk only once the latch is released, so other writers keep going meanwhile
+            self.db.after_latch(self.commit)
+
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait(self.commit_interval)
+            self._wakeup.clear()
+            self._flush()
+            if self.snapshot_every and self._since_snapshot >= self.snapshot_every and not self._snapshotting():
+                # On its own thread: the flusher never waits for the database latch, so commit()
+                # works even from a thread that holds it
+                self._snapshotter = threading.Thread(target=self.snapshot, name="journal-snapshot", daemon=True)
+                self._snapshotter.start()
+
+    def _snapshotting(self) -> bool:
+        return self._snapshotter is not None and self._snapshotter.is_alive()
+
+    def _flush(self):
+        """
+        Writes and fsyncs everything appended so far (one group commit),
+        switching to a new segment at the point a pending snapshot was taken.
+        """
+        with self._io_lock:
+            with self._cond:
+                records, self._buffer = self._buffer, []
+                target = self._appended
+                rotate_at, self._rotate_at = self._rotate_at, None
+            if rotate_at is not None:
+                split = rotate_at - (target - len(records))
+                self._write(records[:split])
+                records = records[split:]
+                self._file.close()
+                self._segment += 1
+                self._file = open(_segment_path(self.directory, self._segment), "ab")
+            self._write(records)
+            with self._cond:
+                self._durable = max(self._durable, target)
+                self._cond.notify_all()
+
+    def _write(self, records: List[bytes]):
+        if records:
+            self._file.write(b"".join(records))
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+
+    def commit(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until every change made so far is on disk. Concurrent callers
+        share one fsync. Returns False on timeout.
+        """
+        with self._cond:
+            target = self._appended
+            if self._durable >= target:
+                return True
+            self._wakeup.set()
+            return self._cond.wait_for(lambda: self._durable >= target, timeout)
+
+    @property
+    def pending(self) -> int:
+        """Records journaled but not yet on disk."""
+        return self._appended - self._durable
+
+    def snapshot(self) -> str:
+        """
+        Snapshots the database and starts a new journal segment; older
+        snapshots and the segments the new one covers are deleted.
+        Writers are only held back while a point-in-time view of the tables
+        is pinned (O(1)); the rows are copied from that view and written out
+        while they keep going.
+        """
+        with self._snapshot_lock:
+            with self.db.transaction():
+                view = self.db.snapshot()
+                with self._cond:
+                    self._rotate_at = self._appended
+                    self._since_snapshot = 0
+                    segment = self._segment + 1
+            self._flush()
+            with view:
+                tables = {table: list(getattr(view, table).values()) for table in TABLES}
+
+            path = _snapshot_path(self.directory, segment)
+            write_snapshot(path, tables, fsync=self.fsync)
+            for number, old in _numbered(self.directory, _SNAPSHOT_NAME) + _numbered(self.directory, _SEGMENT_NAME):
+                if number < segment:
+                    os.remove(old)
+            return path
+
+    def close(self):
+        """Flushes outstanding records, stops journaling and closes the segment."""
+        if self._closed:
+            return
+        self.db.remove_listener(self._on_change)
+        self._closed = True
+        self._wakeup.set()
+        self._flusher.join()
+        if self._snapshotter is not None:
+            self._snapshotter.join()
+        self._flush()
+        self._file.close()
@@ -0,0 +1,358 @@
+"""
+Opt-in instrumentation for the service layer.
+
+`metrics.enable()` replaces every public function of the instrumented
+service modules (and the Database lookup methods) with timed wrappers;
+`metrics.disable()` puts the originals back. While disabled nothing is
+wrapped, so instrumentation costs nothing.
+
+Per operation it records call and error counts, a latency histogram and
+the rows returned by Database lookups during the call ("rows scanned").
+Table sizes of tracked databases are read at export time. Everything can
+be exported as Prometheus text (`to_prometheus`) or a JSON-ready dict
+(`snapshot`). `SamplingProfiler` samples the stacks of all threads at a
+fixed interval and can be started and stopped at runtime.
+"""
+import contextvars
+import functools
+import importlib
+import inspect
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from source.college_erp.database import Database
+
+INSTRUMENTED_MODULES = (
+    "source.college_erp.services.authentication",
+    "source.college_erp.services.student_service",
+    "source.college_erp.services.professor_service",
+    "source.college_erp.services.admin_service",
+)
+
+# Database methods whose returned rows count as scanned. get_pending_enrollments
+# is left out: it delegates to get_enrollments_by_course_and_status.
+LOOKUP_METHODS = (
+    "get_user_by_id", "get_all_courses", "get_courses_by_coordinator",
+    "find_enrollment", "get_enrollments_by_student", "get_enrollments_by_course",
+    "get_enrollments_by_status", "get_enrollments_by_course_and_status", "page_enrollments_by_course_and_status",
+    "find_grade", "get_grades_by_student", "get_grades_by_course",
+)
+
+TABLES = ("users", "courses", "enrollments", "grades")
+
+# Prometheus `le` bounds in seconds
+PROMETHEUS_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+                      1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_SUB_BUCKET_BITS = 3
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS           # 8 buckets per power of two: <= 12.5% error
+_LINEAR_LIMIT = 2 * _SUB_BUCKETS                 # values below this get a bucket each
+
+class Histogram:
+    """
+    HDR-style log-linear histogram of non-negative integers (nanoseconds).
+    Each power of two is split into 8 equal buckets, so any recorded value
+    is known to within 12.5% while recording stays O(1) and memory is
+    bounded by the value range, not the number of samples.
+    """
+    def __init__(self):
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def bucket_of(value: int) -> int:
+        if value < _LINEAR_LIMIT:
+            return value
+        shift = value.bit_length() - _SUB_BUCKET_BITS - 1
+        return shift * _SUB_BUCKETS + (value >> shift)
+
+    @staticmethod
+    def upper_bound(bucket: int) -> int:
+        """Largest value that falls into a bucket."""
+        if bucket < _LINEAR_LIMIT:
+            return bucket
+        shift, sub = divmod(bucket, _SUB_BUCKETS)
+        shift -= 1
+        return ((sub + _SUB_BUCKETS + 1) << shift) - 1
+
+    def record(self, value: int):
+        bucket = self.bucket_of(value)
+        self._counts[bucket] = self._counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def buckets(self) -> Iterator[Tuple[int, int]]:
+        """Yields (upper bound, count) for each non-empty bucket, in increasing order."""
+        for bucket in sorted(self._counts):
+            yield self.upper_bound(bucket), self._counts[bucket]
+
+    def percentile(self, q: float) -> int:
+        """Upper bound of the bucket holding the q-th percentile (0 < q <= 100)."""
+        if not self.count:
+            return 0
+        rank = max(1, round(self.count * q / 100))
+        seen = 0
+        for bound, count in self.buckets():
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+@dataclass
+class OperationStats:
+    """Counters for one instrumented function."""
+    calls: int = 0
+    errors: int = 0
+    rows_scanned: int = 0
+    latency_ns: Histogram = field(default_factory=Histogram)
+
+# Rows scanned by the innermost running operation
+_rows_scanned: contextvars.ContextVar[Optional[List[int]]] = contextvars.ContextVar("rows_scanned", default=None)
+
+def _rows_in(result: Any) -> int:
+    if result is None:
+        return 0
+    return len(result) if isinstance(result, (list, tuple)) else 1
+
+class Metrics:
+    """Registry of operation stats plus the enable/disable switch."""
+    def __init__(self):
+        self._stats: Dict[str, OperationStats] = {}
+        self._lock = threading.Lock()
+        self._patched: List[Tuple[Any, str, Any]] = []
+        self._databases: List[Database] = []
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._patched)
+
+    def track_database(self, db: Database):
+        """Exports the table sizes of a database along with the operation stats."""
+        if db not in self._databases:
+            self._databases.append(db)
+
+    def _stats_for(self, name: str) -> OperationStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(name, OperationStats())
+        return stats
+
+    def _observe(self, stats: OperationStats, elapsed_ns: int, rows: int, failed: bool):
+        with self._lock:
+            stats.calls += 1
+            stats.errors += failed
+            stats.rows_scanned += rows
+            stats.latency_ns.record(elapsed_ns)
+
+    def _wrap_operation(self, name: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        stats = self._stats_for(name)
+        observe = self._observe
+
+        def finish(start: int, token: contextvars.Token, rows: List[int], failed: bool):
+            _rows_scanned.reset(token)
+            outer = _rows_scanned.get()
+            if outer is not None:
+                outer[0] += rows[0]  # nested operations count towards their caller too
+            observe(stats, time.perf_counter_ns() - start, rows[0], failed)
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def timed_async(*args: Any, **kwargs: Any) -> Any:
+                rows = [0]
+                token = _rows_scanned.set(rows)
+                start = time.perf_counter_ns()
+                failed = True
+                try:
+                    result = await fn(*args, **kwargs)
+                    failed = False
+                    return result
+                finally:
+                    finish(start, token, rows, failed)
+            return timed_async
+
+        @functools.wraps(fn)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            rows = [0]
+            token = _rows_scanned.set(rows)
+            start = time.perf_counter_ns()
+            failed = True
+            try:
+                result = fn(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                finish(start, token, rows, failed)
+        return timed
+
+    @staticmethod
+    def _wrap_lookup(fn: Callable[..., Any]) -> Callable[..., Any]:
+        get_rows = _rows_scanned.get
+
+        @functools.wraps(fn)
+        def counted(*args: Any, **kwargs: Any) -> Any:
+            result = fn(*args, **kwargs)
+            rows = get_rows()
+            if rows is not None:
+                rows[0] += _rows_in(result)
+            return result
+        return counted
+
+    def _patch(self, owner: Any, name: str, replacement: Any):
+        self._patched.append((owner, name, owner.__dict__[name]))
+        setattr(owner, name, replacement)
+
+    def enable(self, modules: Iterable[str] = INSTRUMENTED_MODULES):
+        """Instruments the public functions of the given service modules."""
+        if self.enabled:
+            return
+        for module_name in modules:
+            module = importlib.import_module(module_name)
+            short = module_name.rsplit(".", 1)[-1]
+            for name, fn in list(vars(module).items()):
+                if name.startswith("_") or not inspect.isfunction(fn) or fn.__module__ != module_name:
+                    continue
+                self._patch(module, name, self._wrap_operation(f"{short}.{name}", fn))
+
+        classes = [Database]
+        while classes:
+            cls = classes.pop()
+            classes.extend(cls.__subclasses__())
+            for name in LOOKUP_METHODS:
+                if name in cls.__dict__:
+                    self._patch(cls, name, self._wrap_lookup(cls.__dict__[name]))
+
+    def disable(self):
+        """Restores the original functions; recorded stats are kept."""
+        while self._patched:
+            owner, name, original = self._patched.pop()
+            setattr(owner, name, original)
+
+    def reset(self):
+        """Zeroes all recorded stats."""
+        with self._lock:
+            for stats in self._stats.values():  # in place: the wrappers hold on to these objects
+                stats.calls = stats.errors = stats.rows_scanned = 0
+                stats.latency_ns = Histogram()
+
+    def _table_sizes(self) -> List[Dict[str, int]]:
+        return [{table: len(getattr(db, table)) for table in TABLES} for db in self._databases]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-ready view of every operation's stats (latencies in microseconds) and table sizes."""
+        with self._lock:
+            operations = {}
+            for name, stats in sorted(self._stats.items()):
+                if not stats.calls:
+                    continue
+                hist = stats.latency_ns
+                operations[name] = {
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "rows_scanned": stats.rows_scanned,
+                    "latency_us": {
+                        "mean": hist.total / hist.count / 1e3,
+                        "p50": hist.percentile(50) / 1e3,
+                        "p90": hist.percentile(90) / 1e3,
+                        "p99": hist.percentile(99) / 1e3,
+                        "max": hist.max / 1e3,
+                    },
+                }
+        return {"enabled": self.enabled, "operations": operations, "tables": self._table_sizes()}
+
+    def to_prometheus(self) -> str:
+        """Renders the stats in the Prometheus text exposition format."""
+        lines = [
+            "# HELP erp_operation_calls_total Calls of an ERP service function.",
+            "# TYPE erp_operation_calls_total counter",
+            "# HELP erp_operation_errors_total Calls that raised an exception.",
+            "# TYPE erp_operation_errors_total counter",
+            "# HELP erp_operation_rows_scanned_total Rows returned by Database lookups during the calls.",
+            "# TYPE erp_operation_rows_scanned_total counter",
+            "# HELP erp_operation_duration_seconds Latency of an ERP service function.",
+            "# TYPE erp_operation_duration_seconds histogram",
+        ]
+        with self._lock:
+            for name, stats in sorted(self._stats.items()):
+                if not stats.calls:
+                    continue
+                label = f'operation="{name}"'
+                lines.append(f"erp_operation_calls_total{{{label}}} {stats.calls}")
+                lines.append(f"erp_operation_errors_total{{{label}}} {stats.errors}")
+                lines.append(f"erp_operation_rows_scanned_total{{{label}}} {stats.rows_scanned}")
+                buckets = list(stats.latency_ns.buckets())
+                cumulative, i = 0, 0
+                for bound in PROMETHEUS_BUCKETS:
+                    while i < len(buckets) and buckets[i][0] <= bound * 1e9:
+                        cumulative += buckets[i][1]
+                        i += 1
+                    lines.append(f'erp_operation_duration_seconds_bucket{{{label},le="{bound:g}"}} {cumulative}')
+                lines.append(f'erp_operation_duration_seconds_bucket{{{label},le="+Inf"}} {stats.calls}')
+                lines.append(f"erp_operation_duration_seconds_sum{{{label}}} {stats.latency_ns.total / 1e9:.9f}")
+                lines.append(f"erp_operation_duration_seconds_count{{{label}}} {stats.calls}")
+        lines.append("# HELP erp_table_rows Rows currently stored in a table.")
+        lines.append("# TYPE erp_table_rows gauge")
+        for index, sizes in enumerate(self._table_sizes()):
+            for table, rows in sizes.items():
+                lines.append(f'erp_table_rows{{database="{index}",table="{table}"}} {rows}')
+        return "\n".join(lines) + "\n"
+
+class SamplingProfiler:
+    """
+    Statistical profiler: a daemon thread samples every other thread's stack
+    each `interval` seconds and counts the stacks in folded form
+    ("outer;inner;leaf"), ready for flame graph tools. Costs nothing until
+    started; can be started and stopped while the application runs.
+    """
+    def __init__(self, interval: float = 0.005, max_depth: int = 64):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        """Stops sampling and returns the folded stack counts collected so far."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        return self.samples
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    code = frame.f_code
+                    stack.append(f"{code.co_filename.rsplit('/', 1)[-1]}:{code.co_name}")
+                    frame = frame.f_back
+                self.samples[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        """The samples as folded-stack text, one "stack count" line per stack."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+# A single registry to be used across the application
+metrics = Metrics()
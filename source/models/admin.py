@@ -1,14 +1,13 @@
 """
 Data model for Admin, inheriting from User.
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from source.college_erp.models.user import User, UserRole
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Admin(User):
     """
     Represents an Admin user.
     Corresponds to the Admin class in the class diagram.
     """
-    def __init__(self, user_id: str, name: str, password: str):
-        super().__init__(user_id, name, password, UserRole.ADMIN)
\ No newline at end of file
+    role: UserRole = field(default=UserRole.ADMIN, init=False)
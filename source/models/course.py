@@ -1,9 +1,13 @@
 """
 Data model for Course.
 """
+import sys
 from dataclasses import dataclass, field
+from typing import Optional, Tuple
 
-@dataclass
+HOURS_PER_WEEK = 168
+
+@dataclass(frozen=True, slots=True)
 class Course:
     """
     Represents a Course.
@@ -11,4 +15,20 @@ class Course:
     """
     course_id: str
     name: str
-    coordinator_id: str  # FK to Professor.user_id
\ No newline at end of file
+    coordinator_id: str  # FK to Professor.user_id
+    capacity: Optional[int] = None  # Seats available; None means unlimited
+    slots: Tuple[int, ...] = ()     # Weekly meeting hours: day * 24 + hour, Monday 0:00 being 0
+    # The slots as a 168-bit week bitmap, so clash checks are a single AND
+    slot_mask: int = field(init=False, repr=False, compare=False, default=0)
+
+    def __post_init__(self):
+        # Interned so every row referencing this course shares one id string
+        object.__setattr__(self, "course_id", sys.intern(self.course_id))
+        slots = tuple(sorted(set(self.slots)))
+        if slots and not (0 <= slots[0] and slots[-1] < HOURS_PER_WEEK):
+            raise ValueError(f"course slots must be hours of the week (0-{HOURS_PER_WEEK - 1})")
+        mask = 0
+        for slot in slots:
+            mask |= 1 << slot
+        object.__setattr__(self, "slots", slots)
+        object.__setattr__(self, "slot_mask", mask)
@@ -1,6 +1,7 @@
 """
 Data model for Enrollment.
 """
+import sys
 from dataclasses import dataclass
 from enum import Enum
 
@@ -9,8 +10,9 @@ class EnrollmentStatus(Enum):
     PENDING = "Pending"
     ENROLLED = "Enrolled"
     REJECTED = "Rejected"
+    WAITLISTED = "Waitlisted"  # Course was full; promoted to PENDING when a seat frees
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Enrollment:
     """
     Represents an Enrollment record.
@@ -20,4 +22,9 @@ class Enrollment:
     enrollment_id: str
     student_id: str  # FK to Student.user_id
     course_id: str   # FK to Course.course_id
-    status: EnrollmentStatus = EnrollmentStatus.PENDING
\ No newline at end of file
+    status: EnrollmentStatus = EnrollmentStatus.PENDING
+
+    def __post_init__(self):
+        # FK ids repeat across millions of rows; interning stores each string once
+        object.__setattr__(self, "student_id", sys.intern(self.student_id))
+        object.__setattr__(self, "course_id", sys.intern(self.course_id))
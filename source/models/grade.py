@@ -1,9 +1,10 @@
 """
 Data model for Grade.
 """
+import sys
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Grade:
     """
     Represents a Grade.
@@ -12,4 +13,10 @@ class Grade:
     grade_id: str
     student_id: str  # FK to Student.user_id
     course_id: str   # FK to Course.course_id
-    grade_value: str # e.g., "A+", "B", "F"
\ No newline at end of file
+    grade_value: str # e.g., "A+", "B", "F"
+
+    def __post_init__(self):
+        # FK ids repeat across millions of rows; interning stores each string once
+        object.__setattr__(self, "student_id", sys.intern(self.student_id))
+        object.__setattr__(self, "course_id", sys.intern(self.course_id))
+        object.__setattr__(self, "grade_value", sys.intern(self.grade_value))
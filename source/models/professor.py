@@ -1,17 +1,14 @@
 """
 Data model for Professor, inheriting from User.
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from source.college_erp.models.user import User, UserRole
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Professor(User):
     """
     Represents a Professor user.
     Corresponds to the Professor class in the class diagram.
     """
+    role: UserRole = field(default=UserRole.PROFESSOR, init=False)
     branch: str
-
-    def __init__(self, user_id: str, name: str, password: str, branch: str):
-        super().__init__(user_id, name, password, UserRole.PROFESSOR)
-        self.branch = branch
\ No newline at end of file
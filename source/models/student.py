@@ -1,23 +1,17 @@
 """
 Data model for Student, inheriting from User.
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
 from source.college_erp.models.user import User, UserRole
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Student(User):
     """
     Represents a Student user.
     Corresponds to the Student class in the class diagram.
     """
-    cgpa: float
-    date_of_admission: date
+    role: UserRole = field(default=UserRole.STUDENT, init=False)
     branch: str
-
-    def __init__(self, user_id: str, name: str, password: str, 
-                 branch: str, cgpa: float = 0.0, date_of_admission: date = date.today()):
-        super().__init__(user_id, name, password, UserRole.STUDENT)
-        self.branch = branch
-        self.cgpa = cgpa
-        self.date_of_admission = date_of_admission
\ No newline at end of file
+    cgpa: float = 0.0
+    date_of_admission: date = field(default_factory=date.today)
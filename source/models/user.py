@@ -1,8 +1,10 @@
 """
 Base User model and Role enumeration.
 """
+import sys
 from dataclasses import dataclass
 from enum import Enum
+from source.college_erp.passwords import verify_password
 
 class UserRole(Enum):
     """Enumeration for user roles."""
@@ -10,14 +12,22 @@ class UserRole(Enum):
     PROFESSOR = "professor"
     ADMIN = "admin"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class User:
-    """Base class for a user in the system."""
+    """
+    Base class for a user in the system.
+    Users are immutable; the database updates a user by storing a modified
+    copy (see Database.update_user), so a fetched user never changes under
+    its holder.
+    """
     user_id: str
     name: str
-    password: str
+    password: str  # Encoded hash (see passwords.py), or legacy plaintext
     role: UserRole
 
+    def __post_init__(self):
+        object.__setattr__(self, "user_id", sys.intern(self.user_id))
+
     def check_password(self, password_to_check: str) -> bool:
-        """Compares the provided password with the stored one."""
-        return self.password == password_to_check
\ No newline at end of file
+        """Verifies the provided password against the stored credential."""
+        return verify_password(password_to_check, self.password)
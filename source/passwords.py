@@ -0,0 +1,105 @@
+"""
+Password hashing for the College ERP System.
+Credentials are stored as self-describing strings such as
+"scrypt$16384$8$1$<salt>$<key>" or "pbkdf2_sha256$600000$<salt>$<key>",
+so a hash can always be verified with the parameters it was created with.
+"""
+import base64
+import binascii
+import hashlib
+import hmac
+import os
+from dataclasses import dataclass
+
+SCRYPT = "scrypt"
+PBKDF2_SHA256 = "pbkdf2_sha256"
+
+def _b64encode(raw: bytes) -> str:
+    return base64.b64encode(raw).decode("ascii")
+
+def _b64decode(text: str) -> bytes:
+    return base64.b64decode(text.encode("ascii"))
+
+def is_password_hash(stored: str) -> bool:
+    """Tells an encoded hash apart from a legacy plaintext password."""
+    parts = stored.split("$")
+    return ((parts[0] == SCRYPT and len(parts) == 6) or
+            (parts[0] == PBKDF2_SHA256 and len(parts) == 4))
+
+@dataclass(frozen=True)
+class PasswordHasher:
+    """
+    Hashes passwords with scrypt or PBKDF2-SHA256 at a configurable cost.
+    `n`, `r` and `p` are the scrypt parameters; `iterations` is the PBKDF2 round count.
+    """
+    algorithm: str = SCRYPT
+    n: int = 2 ** 14
+    r: int = 8
+    p: int = 1
+    iterations: int = 600_000
+    salt_bytes: int = 16
+    key_bytes: int = 32
+
+    def __post_init__(self):
+        if self.algorithm not in (SCRYPT, PBKDF2_SHA256):
+            raise ValueError(f"Unsupported password hash algorithm: {self.algorithm}")
+
+    def hash(self, password: str) -> str:
+        """Hashes a password with a fresh random salt."""
+        salt = os.urandom(self.salt_bytes)
+        if self.algorithm == SCRYPT:
+            key = _scrypt(password, salt, self.n, self.r, self.p, self.key_bytes)
+            return f"{SCRYPT}${self.n}${self.r}${self.p}${_b64encode(salt)}${_b64encode(key)}"
+        key = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, self.iterations, self.key_bytes)
+        return f"{PBKDF2_SHA256}${self.iterations}${_b64encode(salt)}${_b64encode(key)}"
+
+    def needs_rehash(self, stored: str) -> bool:
+        """True if the stored credential is plaintext or was hashed with other parameters."""
+        if not is_password_hash(stored):
+            return True
+        parts = stored.split("$")
+        if parts[0] != self.algorithm or len(_b64decode(parts[-1])) != self.key_bytes:
+            return True
+        if self.algorithm == SCRYPT:
+            return tuple(map(int, parts[1:4])) != (self.n, self.r, self.p)
+        return int(parts[1]) != self.iterations
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int, key_bytes: int) -> bytes:
+    # scrypt needs 128 * n * r bytes of working memory; allow that plus some headroom
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p, dklen=key_bytes,
+                          maxmem=256 * n * r + 2 ** 20)
+
+def verify_password(password: str, stored: str) -> bool:
+    """
+    Checks a password against a stored credential, using the parameters
+    encoded in it. Legacy plaintext credentials are compared in constant time;
+    a malformed hash matches no password.
+    """
+    if not is_password_hash(stored):
+        return hmac.compare_digest(password.encode(), stored.encode())
+    parts = stored.split("$")
+    try:
+        salt, expected = _b64decode(parts[-2]), _b64decode(parts[-1])
+        if parts[0] == SCRYPT:
+            n, r, p = map(int, parts[1:4])
+            key = _scrypt(password, salt, n, r, p, len(expected))
+        else:
+            key = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, int(parts[1]), len(expected))
+    except (ValueError, binascii.Error):
+        return False
+    return hmac.compare_digest(key, expected)
+
+_default_hasher = PasswordHasher()
+
+def get_default_hasher() -> PasswordHasher:
+    """Returns the hasher used for new credentials and rehash-on-login."""
+    return _default_hasher
+
+def set_default_hasher(hasher: PasswordHasher):
+    """Changes the cost parameters; existing users are rehashed on their next login."""
+    global _default_hasher
+    _default_hasher = hasher
+
+def hash_password(password: str) -> str:
+    """Hashes a password with the default hasher."""
+    return _default_hasher.hash(password)
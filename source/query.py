@@ -0,0 +1,253 @@
+"""
+Query layer over the Database tables.
+`db.query("enrollments").where(course_id="CS101", status=EnrollmentStatus.PENDING)`
+builds a Query; `order_by`, `after` (keyset pagination), `limit` and
+`select` (projection) refine it, and `all`, `first`, `page` or `explain`
+run it. The access path is chosen from the indexes the Database API
+already exposes (primary key, (student, course) pair, course + status,
+single-column indexes), so a query reads only the rows its most selective
+equality predicate leads to, on every storage backend.
+"""
+import dataclasses
+from dataclasses import dataclass
+from enum import Enum
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from source.college_erp.database import Database
+
+# Primary key of each table; appended to every ordering so keyset pages are stable
+PRIMARY_KEYS = {"users": "user_id", "courses": "course_id", "enrollments": "enrollment_id", "grades": "grade_id"}
+
+# Columns each table can be filtered and ordered on
+COLUMNS = {
+    "users": ("user_id", "name", "role", "branch", "cgpa", "date_of_admission"),
+    "courses": ("course_id", "name", "coordinator_id", "capacity"),
+    "enrollments": ("enrollment_id", "student_id", "course_id", "status"),
+    "grades": ("grade_id", "student_id", "course_id", "grade_value"),
+}
+
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": lambda value, operand: value == operand,
+    "ne": lambda value, operand: value != operand,
+    "lt": lambda value, operand: value is not None and value < operand,
+    "lte": lambda value, operand: value is not None and value <= operand,
+    "gt": lambda value, operand: value is not None and value > operand,
+    "gte": lambda value, operand: value is not None and value >= operand,
+    "in": lambda value, operand: value in operand,
+}
+
+@dataclass(frozen=True)
+class _AccessPath:
+    """An index reachable through the Database API, keyed by equality on `columns`."""
+    name: str
+    columns: Tuple[str, ...]
+    fetch: Callable[..., List[Any]]  # (db, *key values) -> rows
+
+def _by_key(table: str) -> Callable[..., List[Any]]:
+    def fetch(db: "Database", key: Any) -> List[Any]:
+        row = getattr(db, table).get(key)
+        return [] if row is None else [row]
+    return fetch
+
+def _single(method: str) -> Callable[..., List[Any]]:
+    def fetch(db: "Database", *key: Any) -> List[Any]:
+        row = getattr(db, method)(*key)
+        return [] if row is None else [row]
+    return fetch
+
+def _many(method: str) -> Callable[..., List[Any]]:
+    return lambda db, *key: getattr(db, method)(*key)
+
+# Most selective first; the first path whose columns all have equality predicates wins
+ACCESS_PATHS: Dict[str, Tuple[_AccessPath, ...]] = {
+    "users": (
+        _AccessPath("primary key", ("user_id",), _by_key("users")),
+    ),
+    "courses": (
+        _AccessPath("primary key", ("course_id",), _by_key("courses")),
+        _AccessPath("coordinator index", ("coordinator_id",), _many("get_courses_by_coordinator")),
+    ),
+    "enrollments": (
+        _AccessPath("primary key", ("enrollment_id",), _by_key("enrollments")),
+        _AccessPath("student-course index", ("student_id", "course_id"), _single("find_enrollment")),
+        _AccessPath("student index", ("student_id",), _many("get_enrollments_by_student")),
+        _AccessPath("course-status index", ("course_id", "status"), _many("get_enrollments_by_course_and_status")),
+        _AccessPath("course index", ("course_id",), _many("get_enrollments_by_course")),
+        _AccessPath("status index", ("status",), _many("get_enrollments_by_status")),
+    ),
+    "grades": (
+        _AccessPath("primary key", ("grade_id",), _by_key("grades")),
+        _AccessPath("student-course index", ("student_id", "course_id"), _single("find_grade")),
+        _AccessPath("student index", ("student_id",), _many("get_grades_by_student")),
+        _AccessPath("course index", ("course_id",), _many("get_grades_by_course")),
+    ),
+}
+
+@dataclass(frozen=True)
+class QueryPlan:
+    """What `Query.explain` reports: the access path taken and the rows it touched."""
+    table: str
+    access_path: str             # e.g. "course-status index" or "full scan"
+    index_key: Dict[str, Any]    # equality predicates answered by the index
+    residual: Tuple[str, ...]    # predicates checked row by row, as "column op"
+    order: Tuple[str, ...]
+    rows_scanned: int            # rows read through the access path
+    rows_matched: int            # rows left after the residual predicates
+    rows_returned: int           # rows left after the cursor and limit
+
+def _sortable(value: Any) -> Tuple:
+    """Sort key for a column value: Enums by value, None before everything else."""
+    if isinstance(value, Enum):
+        value = value.value
+    return (0,) if value is None else (1, value)
+
+@dataclass(frozen=True)
+class Query:
+    """An immutable query over one table; every refinement returns a new Query."""
+    db: "Database"
+    table: str
+    predicates: Tuple[Tuple[str, str, Any], ...] = ()  # (column, operator, operand)
+    order: Tuple[str, ...] = ()                         # columns, "-column" for descending
+    cursor: Optional[Tuple[Any, ...]] = None
+    max_rows: Optional[int] = None
+    columns: Optional[Tuple[str, ...]] = None
+
+    def __post_init__(self):
+        if self.table not in COLUMNS:
+            raise ValueError(f"unknown table {self.table!r}")
+
+    def _check_column(self, column: str):
+        if column not in COLUMNS[self.table]:
+            raise ValueError(f"{self.table} has no column {column!r}")
+
+    def where(self, **conditions: Any) -> "Query":
+        """
+        Adds predicates, ANDed together: `column=value` for equality or
+        `column__op=value` with op one of ne, lt, lte, gt, gte, in.
+        """
+        predicates = list(self.predicates)
+        for name, operand in conditions.items():
+            column, _, op = name.partition("__")
+            op = op or "eq"
+            self._check_column(column)
+            if op not in OPERATORS:
+                raise ValueError(f"unknown operator {op!r}")
+            predicates.append((column, op, operand))
+        return dataclasses.replace(self, predicates=tuple(predicates))
+
+    def order_by(self, *columns: str) -> "Query":
+        """Orders by the given columns ("-column" sorts descending), then by primary key."""
+        for column in columns:
+            self._check_column(column.lstrip("-"))
+        return dataclasses.replace(self, order=tuple(columns))
+
+    def after(self, cursor: Optional[Tuple[Any, ...]]) -> "Query":
+        """Starts after the row whose ordering key is `cursor` (as returned by `page`)."""
+        return dataclasses.replace(self, cursor=None if cursor is None else tuple(cursor))
+
+    def limit(self, rows: int) -> "Query":
+        return dataclasses.replace(self, max_rows=rows)
+
+    def select(self, *columns: str) -> "Query":
+        """Returns dicts holding only the given columns instead of model objects."""
+        for column in columns:
+            self._check_column(column)
+        return dataclasses.replace(self, columns=tuple(columns))
+
+    # --- Execution ---
+
+    def _plan(self) -> Tuple[Optional[_AccessPath], Dict[str, Any], List[Tuple[str, str, Any]]]:
+        """Picks the access path and splits the predicates into index key and residual."""
+        equalities: Dict[str, Any] = {}
+        for column, op, operand in self.predicates:
+            if op == "eq":
+                equalities.setdefault(column, operand)
+        for path in ACCESS_PATHS[self.table]:
+            if all(column in equalities for column in path.columns):
+                key = {column: equalities[column] for column in path.columns}
+                residual = [pred for pred in self.predicates
+                            if not (pred[1] == "eq" and pred[0] in key and pred[2] == key[pred[0]])]
+                return path, key, residual
+        return None, {}, list(self.predicates)
+
+    def _ordering(self) -> List[Tuple[str, bool]]:
+        primary_key = PRIMARY_KEYS[self.table]
+        ordering = [(column.lstrip("-"), column.startswith("-")) for column in self.order]
+        if primary_key not in (column for column, _ in ordering):
+            ordering.append((primary_key, False))
+        return ordering
+
+    def _sort_key(self, row: Any, ordering: List[Tuple[str, bool]]) -> Tuple[Any, ...]:
+        return tuple(getattr(row, column, None) for column, _ in ordering)
+
+    def _run(self) -> Tuple[List[Any], QueryPlan]:
+        path, key, residual = self._plan()
+        if path is None:
+            rows: Iterable[Any] = list(getattr(self.db, self.table).values())
+        else:
+            rows = path.fetch(self.db, *key.values())
+        scanned = len(rows)
+        tests = [(column, OPERATORS[op], operand) for column, op, operand in residual]
+        matched = [row for row in rows
+                   if all(test(getattr(row, column, None), operand) for column, test, operand in tests)]
+
+        ordering = self._ordering()
+        for column, descending in reversed(ordering):  # stable sorts, least significant column first
+            matched.sort(key=lambda row: _sortable(getattr(row, column, None)), reverse=descending)
+        result = matched
+        if self.cursor is not None:
+            result = [row for row in result if self._is_after(self._sort_key(row, ordering), ordering)]
+        if self.max_rows is not None:
+            result = result[:self.max_rows]
+
+        plan = QueryPlan(
+            table=self.table,
+            access_path=path.name if path else "full scan",
+            index_key=key,
+            residual=tuple(f"{column} {op}" for column, op, _ in residual),
+            order=tuple(f"{column} {'desc' if descending else 'asc'}" for column, descending in ordering),
+            rows_scanned=scanned,
+            rows_matched=len(matched),
+            rows_returned=len(result)
+        )
+        return result, plan
+
+    def _is_after(self, values: Tuple[Any, ...], ordering: List[Tuple[str, bool]]) -> bool:
+        for value, bound, (_, descending) in zip(values, self.cursor, ordering):
+            value, bound = _sortable(value), _sortable(bound)
+            if value != bound:
+                return (value < bound) if descending else (value > bound)
+        return False
+
+    def _project(self, rows: List[Any]) -> List[Any]:
+        if self.columns is None:
+            return rows
+        return [{column: getattr(row, column, None) for column in self.columns} for row in rows]
+
+    def all(self) -> List[Any]:
+        """Runs the query and returns the rows (or projected dicts)."""
+        return self._project(self._run()[0])
+
+    def first(self) -> Optional[Any]:
+        rows = self.limit(1).all()
+        return rows[0] if rows else None
+
+    def count(self) -> int:
+        """Number of matching rows, ignoring cursor and limit."""
+        return self._run()[1].rows_matched
+
+    def page(self, size: int) -> Tuple[List[Any], Optional[Tuple[Any, ...]]]:
+        """
+        Returns up to `size` rows and the cursor to pass to `after` for the
+        next page (None on the last page).
+        """
+        rows, plan = self.limit(size)._run()
+        cursor = None
+        if rows and plan.rows_returned == size:
+            cursor = self._sort_key(rows[-1], self._ordering())
+        return self._project(rows), cursor
+
+    def explain(self) -> QueryPlan:
+        """Runs the query and reports the access path chosen and the rows it touched."""
+        return self._run()[1]
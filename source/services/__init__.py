@@ -0,0 +1,14 @@
+"""
+Service layer of the College ERP System.
+Service modules are imported on first attribute access
+(`services.student_service`), so a process only pays for the services it uses.
+"""
+import importlib
+
+__all__ = ("admin_service", "aio", "analytics_service", "authentication", "cgpa_service", "professor_service",
+           "seat_service", "sessions", "student_cache", "student_service", "timetable_service", "transcript_service")
+
+def __getattr__(name: str):
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,12 +2,71 @@
 Service layer for Admin operations.
 Corresponds to methods in the Admin class and "Perform Admin Management" in DFD.
 """
-from typing import Optional, Union
-from source.college_erp.database import Database
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Set, Tuple, Union
+from source.college_erp.database import Database, IntegrityError
 from source.college_erp.models.user import User, UserRole
 from source.college_erp.models.student import Student
 from source.college_erp.models.professor import Professor
 from source.college_erp.models.course import Course
+from source.college_erp.passwords import hash_password, is_password_hash
+from source.college_erp.services import seat_service, timetable_service
+
+# Rows validated and inserted per transaction by the bulk import functions
+BULK_BATCH_SIZE = 10_000
+
+@dataclass
+class BulkImportReport:
+    """Outcome of a bulk import: rows added and (row number, reason) per rejected row."""
+    added: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+
+def build_user(user_id: str, role: Union[UserRole, str, None], user_data: dict) -> Optional[User]:
+    """
+    Creates a Student or Professor from user data; other roles yield None.
+    The "password" is hashed; an already encoded hash can be given as
+    "password_hash" instead, and raises ValueError if it is not one.
+    """
+    if role not in (UserRole.STUDENT, UserRole.PROFESSOR):
+        return None
+    if "password_hash" in user_data:
+        password = user_data["password_hash"]
+        if not isinstance(password, str) or not is_password_hash(password):
+            raise ValueError("password_hash is not an encoded password hash")
+    else:
+        password = hash_password(user_data.get("password", ""))
+    if role == UserRole.STUDENT:
+        return Student(
+            user_id=user_id,
+            name=user_data.get("name", ""),
+            password=password,
+            branch=user_data.get("branch", "")
+        )
+    return Professor(
+        user_id=user_id,
+        name=user_data.get("name", ""),
+        password=password,
+        branch=user_data.get("branch", "")
+    )
+
+def parse_role(role: Union[UserRole, str, None]) -> Optional[UserRole]:
+    """Accepts a UserRole or its string value (as read from CSV/JSONL)."""
+    if isinstance(role, UserRole):
+        return role
+    try:
+        return UserRole(role)
+    except ValueError:
+        return None
+
+def _batches(rows: Iterable[dict], size: int) -> Iterator[List[Tuple[int, dict]]]:
+    """Yields numbered rows in lists of at most `size`, without reading ahead further."""
+    numbered = enumerate(rows)
+    while True:
+        batch = list(islice(numbered, size))
+        if not batch:
+            return
+        yield batch
 
 def add_user(db: Database, user_data: dict) -> Optional[User]:
     """
@@ -17,45 +76,51 @@ def add_user(db: Database, user_data: dict) -> Optional[User]:
     if not user_id or user_id in db.users:
         return None  # User ID is invalid or already exists
 
-    role = user_data.get("role")
-    new_user: Optional[User] = None
-
-    if role == UserRole.STUDENT:
-        new_user = Student(
-            user_id=user_id,
-            name=user_data.get("name", ""),
-            password=user_data.get("password", ""),
-            branch=user_data.get("branch", "")
-        )
-    elif role == UserRole.PROFESSOR:
-        new_user = Professor(
-            user_id=user_id,
-            name=user_data.get("name", ""),
-            password=user_data.get("password", ""),
-            branch=user_data.get("branch", "")
-        )
-    
+    try:
+        new_user = build_user(user_id, user_data.get("role"), user_data)
+    except ValueError:
+        return None
     if new_user:
-        db.users[user_id] = new_user
+        db.add_user(new_user)
         return new_user
     
     return None
 
 def remove_user(db: Database, user_id: str) -> bool:
     """
-    Removes a user from the database.
+    Removes a user from the database, along with their enrollments and grades.
+    Seats the user held are offered to the waitlists of those courses.
+    Fails for a professor who still coordinates courses.
     """
     if user_id in db.users:
         # Cannot remove an admin this way
         if db.users[user_id].role == UserRole.ADMIN:
             return False
-        del db.users[user_id]
+        course_ids = {en.course_id for en in db.get_enrollments_by_student(user_id)}
+        try:
+            with db.course_locks(course_ids):
+                db.delete_user(user_id)
+        except IntegrityError:
+            return False
+        for course_id in course_ids:
+            seat_service.promote_waitlist(db, course_id)
         return True
     return False
 
+def parse_capacity(capacity) -> Optional[int]:
+    """Reads an optional seat limit; blank means unlimited. Raises ValueError if invalid."""
+    if capacity is None or capacity == "":
+        return None
+    capacity = int(capacity)
+    if capacity < 0:
+        raise ValueError(f"negative capacity {capacity}")
+    return capacity
+
 def add_course(db: Database, course_data: dict) -> Optional[Course]:
     """
     Adds a new course to the database.
+    An optional "capacity" limits its seats; optional "slots" (e.g.
+    "Mon 9, Wed 9-11", see timetable_service.parse_slots) set its timetable.
     """
     course_id = course_data.get("course_id")
     if not course_id or course_id in db.courses:
@@ -68,20 +133,122 @@ def add_course(db: Database, course_data: dict) -> Optional[Course]:
     if not coordinator or coordinator.role != UserRole.PROFESSOR:
         return None # Invalid coordinator
 
+    try:
+        capacity = parse_capacity(course_data.get("capacity"))
+        slots = timetable_service.parse_slots(course_data.get("slots"))
+    except ValueError:
+        return None # Invalid capacity or slots
+
     new_course = Course(
         course_id=course_id,
         name=course_data.get("name", ""),
-        coordinator_id=coord_id
+        coordinator_id=coord_id,
+        capacity=capacity,
+        slots=slots
     )
-    db.courses[course_id] = new_course
+    db.add_course(new_course)
     return new_course
 
 def remove_course(db: Database, course_id: str) -> bool:
     """
-    Removes a course from the database.
+    Removes a course from the database, along with its enrollments and grades.
     """
     if course_id in db.courses:
-        del db.courses[course_id]
-        # In a real system, you'd also handle related enrollments/grades
+        try:
+            db.delete_course(course_id)
+        except IntegrityError:
+            return False
         return True
-    return False
\ No newline at end of file
+    return False
+
+def bulk_add_users(db: Database, rows: Iterable[dict], batch_size: int = BULK_BATCH_SIZE) -> BulkImportReport:
+    """
+    Adds many users (Students or Professors) from an iterable of user dicts,
+    e.g. a csv.DictReader or a JSONL line reader.
+
+    Rows are consumed in batches: each batch is validated in one pass
+    (missing ids, ids already in the database or earlier in the import,
+    unsupported roles) and its valid rows are inserted in one transaction.
+    Invalid rows are skipped and reported by their 0-based row number.
+    """
+    report = BulkImportReport()
+    for batch in _batches(rows, batch_size):
+        # Earlier batches are already in the database, so only this batch's ids need tracking
+        seen: Set[str] = set()
+        new_users: List[User] = []
+        for row_number, user_data in batch:
+            user_id = user_data.get("user_id")
+            if not user_id:
+                report.errors.append((row_number, "missing user_id"))
+                continue
+            if user_id in seen or user_id in db.users:
+                report.errors.append((row_number, f"duplicate user_id {user_id!r}"))
+                continue
+            try:
+                new_user = build_user(user_id, parse_role(user_data.get("role")), user_data)
+            except ValueError as exc:
+                report.errors.append((row_number, str(exc)))
+                continue
+            if new_user is None:
+                report.errors.append((row_number, f"unsupported role {user_data.get('role')!r}"))
+                continue
+            seen.add(user_id)
+            new_users.append(new_user)
+        with db.transaction():
+            db.add_users(new_users)
+        report.added += len(new_users)
+    return report
+
+def bulk_add_courses(db: Database, rows: Iterable[dict], batch_size: int = BULK_BATCH_SIZE) -> BulkImportReport:
+    """
+    Adds many courses from an iterable of course dicts.
+
+    Validated batch by batch like `bulk_add_users`; each distinct coordinator
+    id is looked up once and remembered in a set of known professors.
+    """
+    report = BulkImportReport()
+    professors: Set[str] = set()
+    non_professors: Set[str] = set()
+    for batch in _batches(rows, batch_size):
+        seen: Set[str] = set()
+        new_courses: List[Course] = []
+        for row_number, course_data in batch:
+            course_id = course_data.get("course_id")
+            coord_id = course_data.get("coordinator_id")
+            if not course_id:
+                report.errors.append((row_number, "missing course_id"))
+                continue
+            if course_id in seen or course_id in db.courses:
+                report.errors.append((row_number, f"duplicate course_id {course_id!r}"))
+                continue
+            if coord_id not in professors and coord_id not in non_professors:
+                coordinator = db.users.get(coord_id)
+                if coordinator and coordinator.role == UserRole.PROFESSOR:
+                    professors.add(coord_id)
+                else:
+                    non_professors.add(coord_id)
+            if coord_id in non_professors:
+                report.errors.append((row_number, f"invalid coordinator_id {coord_id!r}"))
+                continue
+            try:
+                capacity = parse_capacity(course_data.get("capacity"))
+            except ValueError:
+                report.errors.append((row_number, f"invalid capacity {course_data.get('capacity')!r}"))
+                continue
+            try:
+                slots = timetable_service.parse_slots(course_data.get("slots"))
+            except ValueError:
+                report.errors.append((row_number, f"invalid slots {course_data.get('slots')!r}"))
+                continue
+            seen.add(course_id)
+            new_courses.append(Course(
+                course_id=course_id,
+                name=course_data.get("name", ""),
+                coordinator_id=coord_id,
+                capacity=capacity,
+                slots=slots
+            ))
+        with db.transaction():
+            db.add_courses(new_courses)
+        report.added += len(new_courses)
+    return report
@@ -0,0 +1,86 @@
+"""
+Async counterpart of the single-row operations in `source.services.admin_service`.
+Bulk imports are CPU-bound batch jobs and stay synchronous.
+"""
+import asyncio
+from typing import Optional
+from source.college_erp.async_database import AsyncDatabase
+from source.college_erp.database import IntegrityError
+from source.college_erp.models.user import User, UserRole
+from source.college_erp.models.course import Course
+from source.college_erp.services.admin_service import build_user, parse_capacity, parse_role
+from source.college_erp.services.timetable_service import parse_slots
+from source.college_erp.services.aio import seat_service
+
+async def add_user(db: AsyncDatabase, user_data: dict) -> Optional[User]:
+    """
+    Adds a new user (Student or Professor) to the database.
+    The role may be a UserRole or its string value (as sent in JSON).
+    The password is hashed on a worker thread, off the event loop.
+    """
+    user_id = user_data.get("user_id")
+    if not user_id or await db.get_user_by_id(user_id) is not None:
+        return None # User ID is invalid or already exists
+
+    try:
+        new_user = await asyncio.to_thread(build_user, user_id, parse_role(user_data.get("role")), user_data)
+    except ValueError:
+        return None
+    if new_user:
+        await db.add_user(new_user)
+    return new_user
+
+async def remove_user(db: AsyncDatabase, user_id: str) -> bool:
+    """
+    Removes a non-admin user along with their enrollments and grades,
+    offering their seats to the waitlists.
+    """
+    user = await db.get_user_by_id(user_id)
+    if user is None or user.role == UserRole.ADMIN:
+        return False
+    course_ids = {en.course_id for en in await db.get_enrollments_by_student(user_id)}
+    try:
+        async with db.course_locks(course_ids):
+            await db.delete_user(user_id)
+            for course_id in sorted(course_ids):
+                await seat_service.promote_waitlist_locked(db, course_id)
+    except IntegrityError:
+        return False
+    return True
+
+async def add_course(db: AsyncDatabase, course_data: dict) -> Optional[Course]:
+    """Adds a new course, coordinated by an existing professor."""
+    course_id = course_data.get("course_id")
+    if not course_id or await db.get_course_by_id(course_id) is not None:
+        return None # Course ID is invalid or already exists
+
+    coord_id = course_data.get("coordinator_id")
+    coordinator = await db.get_user_by_id(coord_id) if coord_id else None
+    if not coordinator or coordinator.role != UserRole.PROFESSOR:
+        return None # Invalid coordinator
+
+    try:
+        capacity = parse_capacity(course_data.get("capacity"))
+        slots = parse_slots(course_data.get("slots"))
+    except ValueError:
+        return None # Invalid capacity or slots
+
+    new_course = Course(
+        course_id=course_id,
+        name=course_data.get("name", ""),
+        coordinator_id=coord_id,
+        capacity=capacity,
+        slots=slots
+    )
+    await db.add_course(new_course)
+    return new_course
+
+async def remove_course(db: AsyncDatabase, course_id: str) -> bool:
+    """Removes a course along with its enrollments and grades."""
+    if await db.get_course_by_id(course_id) is None:
+        return False
+    try:
+        await db.delete_course(course_id)
+    except IntegrityError:
+        return False
+    return True
@@ -0,0 +1,114 @@
+"""
+Async counterpart of `source.services.professor_service`.
+"""
+import asyncio
+from typing import List, Optional, Tuple
+import uuid
+from source.college_erp.async_database import AsyncDatabase
+from source.college_erp.models.enrollment import Enrollment, EnrollmentStatus
+from source.college_erp.models.grade import Grade
+from source.college_erp.models.user import User
+from source.college_erp.services.aio import seat_service
+from source.college_erp.services.professor_service import PendingCursor
+
+async def view_pending_registrations(db: AsyncDatabase, professor_id: str,
+                                     limit: Optional[int] = None,
+                                     cursor: Optional[PendingCursor] = None) -> List[Enrollment]:
+    """
+    Fetches pending enrollments for courses coordinated by this professor,
+    ordered like the sync `view_pending_registrations`.
+    """
+    return (await view_pending_page(db, professor_id, limit, cursor))[0]
+
+async def view_pending_page(db: AsyncDatabase, professor_id: str, limit: Optional[int] = None,
+                            cursor: Optional[PendingCursor] = None) -> Tuple[List[Enrollment], Optional[PendingCursor]]:
+    """
+    Pages through the approval queue like the sync `view_pending_page`.
+    A page of every course's queue (at most `limit` rows each) is fetched
+    concurrently, then the pages are cut to `limit` in course order.
+    """
+    course_ids = sorted(c.course_id for c in await db.get_courses_by_coordinator(professor_id))
+    if cursor is not None:
+        course_ids = [course_id for course_id in course_ids if course_id >= cursor[0]]
+    queues = await asyncio.gather(*(
+        db.page_enrollments_by_course_and_status(course_id, EnrollmentStatus.PENDING,
+                                                 cursor[1] if cursor is not None and course_id == cursor[0] else None,
+                                                 limit)
+        for course_id in course_ids))
+
+    page: List[Enrollment] = []
+    last: Optional[PendingCursor] = None
+    for course_id, rows in zip(course_ids, queues):
+        for position, enrollment in rows:
+            if limit is not None and len(page) >= limit:
+                return page, last
+            page.append(enrollment)
+            last = (course_id, position, enrollment.enrollment_id)
+    return page, last
+
+async def _can_enroll(db: AsyncDatabase, course_id: str) -> bool:
+    course = await db.get_course_by_id(course_id)
+    if course is None:
+        return False
+    return (course.capacity is None or
+            await db.count_enrollments(course_id, EnrollmentStatus.ENROLLED) < course.capacity)
+
+async def approve_registration(db: AsyncDatabase, enrollment_id: str) -> Optional[Enrollment]:
+    """Approves a pending enrollment, unless the course is already filled."""
+    enrollment = await db.get_enrollment_by_id(enrollment_id)
+    if not enrollment:
+        return None
+    async with db.course_lock(enrollment.course_id):
+        enrollment = await db.get_enrollment_by_id(enrollment_id)
+        if (enrollment and enrollment.status == EnrollmentStatus.PENDING and
+                await _can_enroll(db, enrollment.course_id)):
+            return await db.update_enrollment_status(enrollment_id, EnrollmentStatus.ENROLLED)
+    return None
+
+async def reject_registration(db: AsyncDatabase, professor_id: str, enrollment_id: str) -> Optional[Enrollment]:
+    """Rejects a pending or waitlisted enrollment, offering the seat to the waitlist."""
+    enrollment = await db.get_enrollment_by_id(enrollment_id)
+    if not enrollment:
+        return None
+    async with db.course_lock(enrollment.course_id):
+        enrollment = await db.get_enrollment_by_id(enrollment_id)
+        course = await db.get_course_by_id(enrollment.course_id) if enrollment else None
+        if (not course or course.coordinator_id != professor_id or
+                enrollment.status not in (EnrollmentStatus.PENDING, EnrollmentStatus.WAITLISTED)):
+            return None
+        rejected = await db.update_enrollment_status(enrollment_id, EnrollmentStatus.REJECTED)
+        await seat_service.promote_waitlist_locked(db, course.course_id)
+        return rejected
+
+async def upload_grade(db: AsyncDatabase, professor_id: str, student_id: str,
+                       course_id: str, grade_value: str) -> Optional[Grade]:
+    """Uploads or updates a grade for a student in a course."""
+    course, enrollment, existing_grade = await asyncio.gather(
+        db.get_course_by_id(course_id),
+        db.find_enrollment(student_id, course_id),
+        db.find_grade(student_id, course_id))
+    if not course or course.coordinator_id != professor_id:
+        return None # Professor not authorized for this course
+    if not enrollment or enrollment.status != EnrollmentStatus.ENROLLED:
+        return None # Student not enrolled
+
+    if existing_grade:
+        return await db.update_grade_value(existing_grade.grade_id, grade_value)
+    new_grade = Grade(
+        grade_id=str(uuid.uuid4()),
+        student_id=student_id,
+        course_id=course_id,
+        grade_value=grade_value
+    )
+    await db.add_grade(new_grade)
+    return new_grade
+
+async def view_enrolled_students(db: AsyncDatabase, professor_id: str, course_id: str) -> List[User]:
+    """Views all students enrolled in a course coordinated by the professor."""
+    course = await db.get_course_by_id(course_id)
+    if not course or course.coordinator_id != professor_id:
+        return [] # Not authorized or course doesn't exist
+
+    enrolled = await db.get_enrollments_by_course_and_status(course_id, EnrollmentStatus.ENROLLED)
+    students = await asyncio.gather(*(db.get_user_by_id(en.student_id) for en in enrolled))
+    return [student for student in students if student is not None]
@@ -0,0 +1,36 @@
+"""
+Async counterpart of `source.services.seat_service`.
+Functions ending in `_locked` expect the caller to hold the course's lock.
+"""
+from typing import List
+from source.college_erp.async_database import AsyncDatabase
+from source.college_erp.models.course import Course
+from source.college_erp.models.enrollment import Enrollment, EnrollmentStatus
+
+async def seats_taken(db: AsyncDatabase, course_id: str) -> int:
+    """Number of seats held by PENDING and ENROLLED enrollments."""
+    return (await db.count_enrollments(course_id, EnrollmentStatus.PENDING) +
+            await db.count_enrollments(course_id, EnrollmentStatus.ENROLLED))
+
+async def has_free_seat(db: AsyncDatabase, course: Course) -> bool:
+    """True if the course is uncapped or has a seat left."""
+    return course.capacity is None or await seats_taken(db, course.course_id) < course.capacity
+
+async def view_waitlist(db: AsyncDatabase, course_id: str) -> List[Enrollment]:
+    """Fetches a course's waitlist, first in line first."""
+    return await db.get_enrollments_by_course_and_status(course_id, EnrollmentStatus.WAITLISTED)
+
+async def promote_waitlist_locked(db: AsyncDatabase, course_id: str) -> List[Enrollment]:
+    """Moves waitlisted enrollments to PENDING, oldest first, while seats are free."""
+    course = await db.get_course_by_id(course_id)
+    if course is None:
+        return []
+    waitlist = await view_waitlist(db, course_id)
+    free = len(waitlist) if course.capacity is None else course.capacity - await seats_taken(db, course_id)
+    return [await db.update_enrollment_status(enrollment.enrollment_id, EnrollmentStatus.PENDING)
+            for enrollment in waitlist[:max(free, 0)]]
+
+async def promote_waitlist(db: AsyncDatabase, course_id: str) -> List[Enrollment]:
+    """Takes the course's lock and promotes from its waitlist."""
+    async with db.course_lock(course_id):
+        return await promote_waitlist_locked(db, course_id)
@@ -0,0 +1,60 @@
+"""
+Async counterpart of `source.services.student_service`.
+"""
+from typing import List, Optional
+import uuid
+from source.college_erp.async_database import AsyncDatabase
+from source.college_erp.models.course import Course
+from source.college_erp.models.grade import Grade
+from source.college_erp.models.enrollment import Enrollment, EnrollmentStatus
+from source.college_erp.services.aio import seat_service
+
+async def view_courses(db: AsyncDatabase) -> List[Course]:
+    """Fetches a list of all available courses."""
+    return await db.get_all_courses()
+
+async def register_course(db: AsyncDatabase, student_id: str, course_id: str) -> Optional[Enrollment]:
+    """
+    Creates a new enrollment request for a student.
+    Status is set to PENDING, or WAITLISTED if the course is full.
+    Refused on a timetable clash with the student's other courses.
+    """
+    if await db.get_user_by_id(student_id) is None:
+        return None
+
+    async with db.course_locks((course_id, student_id)):
+        course = await db.get_course_by_id(course_id)
+        if course is None:
+            return None
+        if await db.find_enrollment(student_id, course_id) is not None:
+            return None # Already registered, pending or waitlisted
+        if course.slot_mask and await db.find_clash(student_id, course) is not None:
+            return None # Timetable clash
+
+        new_enrollment = Enrollment(
+            enrollment_id=str(uuid.uuid4()),
+            student_id=student_id,
+            course_id=course_id,
+            status=(EnrollmentStatus.PENDING if await seat_service.has_free_seat(db, course)
+                    else EnrollmentStatus.WAITLISTED)
+        )
+        await db.add_enrollment(new_enrollment)
+        return new_enrollment
+
+async def drop_course(db: AsyncDatabase, student_id: str, course_id: str) -> bool:
+    """Withdraws a student's registration, offering the seat to the waitlist."""
+    async with db.course_lock(course_id):
+        enrollment = await db.find_enrollment(student_id, course_id)
+        if enrollment is None:
+            return False
+        await db.remove_enrollment(enrollment.enrollment_id)
+        await seat_service.promote_waitlist_locked(db, course_id)
+    return True
+
+async def view_grades(db: AsyncDatabase, student_id: str) -> List[Grade]:
+    """Fetches all grades for a specific student."""
+    return await db.get_grades_by_student(student_id)
+
+async def view_registered_courses(db: AsyncDatabase, student_id: str) -> List[Enrollment]:
+    """Fetches all enrollments (pending, approved, rejected) for a student."""
+    return await db.get_enrollments_by_student(student_id)
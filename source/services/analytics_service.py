@@ -0,0 +1,299 @@
+"""
+Service for course analytics: grade distributions, pass rates, enrollment
+status counts and professor approval latency.
+
+The engine keeps columnar copies of the grades and enrollments tables: one
+array per column, with courses, students, grade letters and statuses
+dictionary-encoded as small integers. A group-by is then one np.bincount
+over the combined key group * width + value (as CgpaEngine groups grades),
+which runs in C instead of touching a model object per row. Grouping by
+coordinator or branch joins through arrays that map a course code to its
+coordinator and a student code to their branch.
+
+After `attach`, every row change updates its own slot in O(1), so the
+columns never need rebuilding. Rows carry no timestamps, so approval
+latency (the time a registration spends PENDING before it is approved or
+rejected) covers only decisions taken while the engine is attached, and is
+attributed to the course coordinator.
+"""
+import threading
+import time
+from array import array
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import numpy as np
+from source.college_erp.database import CLEAR, DELETE, Change, Database
+from source.college_erp.metrics import Histogram
+from source.college_erp.models.enrollment import EnrollmentStatus
+from source.college_erp.models.user import UserRole
+
+FAILING_GRADES = frozenset({"F"})
+GROUPINGS = ("course", "coordinator", "branch")
+
+_FREE = -1  # code of a deleted slot, and of a join with no match
+_STATUSES = tuple(EnrollmentStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+
+class _Codes:
+    """Dictionary encoding of a column's values as dense integers."""
+    def __init__(self):
+        self.values: List[Any] = []
+        self._codes: Dict[Any, int] = {}
+
+    def code(self, value: Any) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def encode(self, values: Iterable[Any]) -> array:
+        """Codes a whole column at once."""
+        codes = self._codes
+        column = array("i", [codes.setdefault(value, len(codes)) for value in values])
+        self.values = list(codes)
+        return column
+
+class _Columns:
+    """Integer columns of one table; a deleted row frees its slot for reuse."""
+    def __init__(self, width: int):
+        self.columns = tuple(array("i") for _ in range(width))
+        self.slots: Dict[str, int] = {}
+        self.free: List[int] = []
+
+    def put(self, key: str, values: Tuple[int, ...]):
+        slot = self.slots.get(key)
+        if slot is None:
+            if self.free:
+                slot = self.free.pop()
+            else:
+                slot = len(self.columns[0])
+                for column in self.columns:
+                    column.append(_FREE)
+            self.slots[key] = slot
+        for column, value in zip(self.columns, values):
+            column[slot] = value
+
+    def load(self, keys: Iterable[str], columns: Tuple[array, ...]):
+        """Replaces the contents with whole columns, one row per key."""
+        self.columns = columns
+        self.slots = {key: slot for slot, key in enumerate(keys)}
+        self.free = []
+
+    def remove(self, key: str):
+        slot = self.slots.pop(key, None)
+        if slot is not None:
+            for column in self.columns:
+                column[slot] = _FREE
+            self.free.append(slot)
+
+    def clear(self):
+        self.__init__(len(self.columns))
+
+def _grow(join: array, size: int):
+    """Pads a join array with _FREE up to `size` entries."""
+    if len(join) < size:
+        join.extend([_FREE] * (size - len(join)))
+
+class AnalyticsEngine:
+    """
+    Columnar copy of the grades and enrollments tables with group-by
+    aggregates over them. The columns are built in one pass over each table
+    on first use (or by `refresh`); `attach` keeps them current as rows
+    change.
+    """
+    def __init__(self, db: Database, failing_grades: Iterable[str] = FAILING_GRADES):
+        self.db = db
+        self.failing_grades = frozenset(failing_grades)
+        self._courses = _Codes()
+        self._students = _Codes()
+        self._letters = _Codes()
+        self._labels = _Codes()  # coordinators and branches
+        self._grades = _Columns(3)        # course, student, letter
+        self._enrollments = _Columns(3)   # course, student, status
+        self._coordinator_of = array("i")  # course code -> label code
+        self._branch_of = array("i")       # student code -> label code
+        self._pending_since: Dict[str, int] = {}
+        self._latency: Dict[str, Histogram] = {}
+        # Held while the columns change or are copied; listeners take it under the database latch
+        self._lock = threading.Lock()
+        self._built = False
+
+    # --- Building the columns ---
+
+    def _course_code(self, course_id: str) -> int:
+        code = self._courses.code(course_id)
+        if code >= len(self._coordinator_of):
+            _grow(self._coordinator_of, code + 1)
+            self._coordinator_of[code] = self._coordinator_code(course_id)
+        return code
+
+    def _student_code(self, student_id: str) -> int:
+        code = self._students.code(student_id)
+        if code >= len(self._branch_of):
+            _grow(self._branch_of, code + 1)
+            self._branch_of[code] = self._branch_code(student_id)
+        return code
+
+    def _coordinator_code(self, course_id: str) -> int:
+        course = self.db.courses.get(course_id)
+        return self._labels.code(course.coordinator_id) if course is not None else _FREE
+
+    def _branch_code(self, student_id: str) -> int:
+        student = self.db.users.get(student_id)
+        return self._labels.code(student.branch) if student is not None and student.role == UserRole.STUDENT else _FREE
+
+    def _put_grade(self, grade: Any):
+        self._grades.put(grade.grade_id, (self._course_code(grade.course_id), self._student_code(grade.student_id),
+                                          self._letters.code(grade.grade_value)))
+
+    def _put_enrollment(self, enrollment: Any):
+        self._enrollments.put(enrollment.enrollment_id, (self._course_code(enrollment.course_id),
+                                                         self._student_code(enrollment.student_id),
+                                                         _STATUS_CODES[enrollment.status]))
+
+    def refresh(self):
+        """Rebuilds every column from the tables, a whole column at a time."""
+        with self.db.transaction(), self._lock:
+            courses, students = self._courses, self._students = _Codes(), _Codes()
+            grades = list(self.db.grades.values())
+            self._grades.load(map(attrgetter("grade_id"), grades), (
+                courses.encode(map(attrgetter("course_id"), grades)),
+                students.encode(map(attrgetter("student_id"), grades)),
+                self._letters.encode(map(attrgetter("grade_value"), grades))))
+            enrollments = list(self.db.enrollments.values())
+            self._enrollments.load(map(attrgetter("enrollment_id"), enrollments), (
+                courses.encode(map(attrgetter("course_id"), enrollments)),
+                students.encode(map(attrgetter("student_id"), enrollments)),
+                array("i", [_STATUS_CODES[status] for status in map(attrgetter("status"), enrollments)])))
+            self._coordinator_of = array("i", map(self._coordinator_code, courses.values))
+            self._branch_of = array("i", map(self._branch_code, students.values))
+            self._built = True
+
+    def attach(self):
+        """Builds the columns and starts incremental mode: every row change updates them."""
+        with self.db.transaction():
+            self.refresh()
+            self.db.add_listener(self._on_change)
+
+    def detach(self):
+        """Stops incremental mode."""
+        self.db.remove_listener(self._on_change)
+
+    def _on_change(self, change: Change):
+        with self._lock:
+            if change.table == "grades":
+                self._on_grade(change)
+            elif change.table == "enrollments":
+                self._on_enrollment(change)
+            elif change.table == "courses":
+                self._on_course(change)
+            else:
+                self._on_user(change)
+
+    def _on_grade(self, change: Change):
+        if change.action == CLEAR:
+            self._grades.clear()
+        elif change.action == DELETE:
+            self._grades.remove(change.old.grade_id)
+        else:
+            self._put_grade(change.new)
+
+    def _on_enrollment(self, change: Change):
+        if change.action == CLEAR:
+            self._enrollments.clear()
+            self._pending_since.clear()
+            return
+        if change.action == DELETE:
+            self._enrollments.remove(change.old.enrollment_id)
+            self._pending_since.pop(change.old.enrollment_id, None)
+            return
+        self._put_enrollment(change.new)
+        was_pending = change.old is not None and change.old.status == EnrollmentStatus.PENDING
+        if change.new.status == EnrollmentStatus.PENDING:
+            if not was_pending:
+                self._pending_since[change.new.enrollment_id] = time.monotonic_ns()
+        elif was_pending:
+            since = self._pending_since.pop(change.new.enrollment_id, None)
+            course = self.db.courses.get(change.new.course_id)
+            if since is not None and change.new.status in (EnrollmentStatus.ENROLLED, EnrollmentStatus.REJECTED):
+                coordinator = course.coordinator_id if course is not None else None
+                self._latency.setdefault(coordinator, Histogram()).record(time.monotonic_ns() - since)
+
+    def _on_course(self, change: Change):
+        if change.action == CLEAR:
+            self._coordinator_of[:] = array("i", [_FREE] * len(self._coordinator_of))
+        elif change.action != DELETE:
+            code = self._course_code(change.new.course_id)
+            self._coordinator_of[code] = self._labels.code(change.new.coordinator_id)
+
+    def _on_user(self, change: Change):
+        if change.action == CLEAR:
+            self._branch_of[:] = array("i", [_FREE] * len(self._branch_of))
+        elif change.action != DELETE and change.new.role == UserRole.STUDENT:
+            code = self._student_code(change.new.user_id)
+            self._branch_of[code] = self._labels.code(change.new.branch)
+
+    # --- Aggregates ---
+
+    def _count(self, table: str, by: str) -> Iterator[Tuple[Any, int, int]]:
+        """Yields (group, value code, rows) for the table's value column grouped `by`."""
+        if by not in GROUPINGS:
+            raise ValueError(f"cannot group by {by!r}; use one of {', '.join(GROUPINGS)}")
+        if not self._built:
+            self.refresh()
+        with self._lock:  # writers wait only while the columns are copied
+            columns = self._grades if table == "grades" else self._enrollments
+            course, student, value = (np.array(column, dtype=np.int64) for column in columns.columns)
+            coordinator_of = np.array(self._coordinator_of, dtype=np.int64)
+            branch_of = np.array(self._branch_of, dtype=np.int64)
+            course_ids, labels = self._courses.values, self._labels.values
+        live = value != _FREE  # deleted slots have every column _FREE
+        if by == "course":
+            groups, labels = course[live], course_ids
+        elif by == "coordinator":
+            groups = coordinator_of[course[live]]
+        else:
+            groups = branch_of[student[live]]
+        value = value[live]
+        joined = groups != _FREE  # rows with no course or student to join
+        groups, value = groups[joined], value[joined]
+        if not len(value):
+            return
+        width = int(value.max()) + 1
+        counts = np.bincount(groups * width + value)
+        for key in np.flatnonzero(counts).tolist():
+            group, code = divmod(key, width)
+            yield labels[group], code, int(counts[key])
+
+    def grade_histograms(self, by: str = "course") -> Dict[Any, Dict[str, int]]:
+        """Grade letter counts per course, coordinator or student branch."""
+        histograms: Dict[Any, Dict[str, int]] = {}
+        for group, code, rows in self._count("grades", by):
+            histograms.setdefault(group, {})[self._letters.values[code]] = rows
+        return histograms
+
+    def pass_rates(self, by: str = "course") -> Dict[Any, float]:
+        """Share of grades outside `failing_grades` per course, coordinator or student branch."""
+        return {group: sum(rows for letter, rows in counts.items() if letter not in self.failing_grades) /
+                sum(counts.values()) for group, counts in self.grade_histograms(by).items()}
+
+    def status_counts(self, by: str = "course") -> Dict[Any, Dict[EnrollmentStatus, int]]:
+        """Enrollment counts per status per course, coordinator or student branch."""
+        counts: Dict[Any, Dict[EnrollmentStatus, int]] = {}
+        for group, code, rows in self._count("enrollments", by):
+            counts.setdefault(group, {})[_STATUSES[code]] = rows
+        return counts
+
+    def approval_latency(self) -> Dict[Optional[str], Dict[str, float]]:
+        """
+        Per coordinator: decisions observed, and the mean, median, p90 and
+        maximum time in seconds from PENDING to approval or rejection.
+        """
+        with self._lock:
+            return {
+                coordinator: {"decisions": histogram.count, "mean": histogram.total / histogram.count / 1e9,
+                              "p50": histogram.percentile(50) / 1e9, "p90": histogram.percentile(90) / 1e9,
+                              "max": histogram.max / 1e9}
+                for coordinator, histogram in self._latency.items()
+            }
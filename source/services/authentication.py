@@ -2,9 +2,21 @@
 Service for handling user authentication.
 Corresponds to the "Authenticate User" process in the DFD.
 """
-from typing import Optional
+import os
+from typing import TYPE_CHECKING, Optional
 from source.college_erp.database import Database
 from source.college_erp.models.user import User
+from source.college_erp.passwords import get_default_hasher
+
+# asyncio and concurrent.futures cost more to import than the rest of the
+# login path together, so they are only imported once login_async is used.
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+# Worker threads for login_async; hashlib's KDFs release the GIL, so logins
+# verify in parallel up to this bound without blocking the event loop.
+LOGIN_WORKERS = os.cpu_count() or 1
+_login_pool: Optional["ThreadPoolExecutor"] = None
 
 def login(db: Database, user_id: str, password: str) -> Optional[User]:
     """
@@ -17,10 +29,40 @@ def login(db: Database, user_id: str, password: str) -> Optional[User]:
 
     Returns:
         The User object if authentication is successful, None otherwise.
+        If the stored credential is plaintext or uses outdated hashing
+        parameters, it is transparently rehashed with the current ones.
     """
     user = db.get_user_by_id(user_id)
     
     if user and user.check_password(password):
+        hasher = get_default_hasher()
+        if hasher.needs_rehash(user.password):
+            db.update_user(user_id, password=hasher.hash(password))
+            user = db.get_user_by_id(user_id)
         return user
     
-    return None
\ No newline at end of file
+    return None
+
+def configure_login_pool(max_workers: int):
+    """Replaces the login worker pool with one of the given size."""
+    global _login_pool, LOGIN_WORKERS
+    if _login_pool is not None:
+        _login_pool.shutdown(wait=True)
+        _login_pool = None
+    LOGIN_WORKERS = max_workers
+
+def _get_login_pool() -> "ThreadPoolExecutor":
+    global _login_pool
+    if _login_pool is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _login_pool = ThreadPoolExecutor(max_workers=LOGIN_WORKERS, thread_name_prefix="login")
+    return _login_pool
+
+async def login_async(db: Database, user_id: str, password: str) -> Optional[User]:
+    """
+    Same as `login`, but runs the password check on the bounded login
+    worker pool so the event loop stays responsive during login storms.
+    """
+    import asyncio
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_login_pool(), login, db, user_id, password)
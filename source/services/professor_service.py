@@ -2,89 +2,207 @@
 Service layer for Professor operations.
 Corresponds to methods in the Professor class and "Process Registration" in DFD.
 """
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 import uuid
 from source.college_erp.database import Database
 from source.college_erp.models.enrollment import Enrollment, EnrollmentStatus
 from source.college_erp.models.grade import Grade
 from source.college_erp.models.user import User
+from source.college_erp.services import seat_service
 
-def view_pending_registrations(db: Database, professor_id: str) -> List[Enrollment]:
+# Position in a professor's approval queue: (course_id, queue position, enrollment_id)
+PendingCursor = Tuple[str, int, str]
+
+def view_pending_registrations(db: Database, professor_id: str,
+                               limit: Optional[int] = None,
+                               cursor: Optional[PendingCursor] = None) -> List[Enrollment]:
     """
     Fetches pending enrollments for courses coordinated by this professor.
     Corresponds to "View Pending Registrations" in Sequence Diagram.
+
+    Results are ordered by course_id, then by the order the registrations
+    joined the course's queue. To page through a long queue, use
+    `view_pending_page`, which also returns the cursor for the next page.
     """
-    pending_enrollments = []
-    # Find courses coordinated by this professor
-    prof_course_ids = [
-        course.course_id for course in db.courses.values() 
-        if course.coordinator_id == professor_id
-    ]
-    
-    # Find pending enrollments for those courses
-    for enrollment in db.enrollments.values():
-        if (enrollment.course_id in prof_course_ids and 
-            enrollment.status == EnrollmentStatus.PENDING):
-            pending_enrollments.append(enrollment)
-            
-    return pending_enrollments
+    return view_pending_page(db, professor_id, limit, cursor)[0]
+
+def view_pending_page(db: Database, professor_id: str, limit: Optional[int] = None,
+                      cursor: Optional[PendingCursor] = None) -> Tuple[List[Enrollment], Optional[PendingCursor]]:
+    """
+    Returns up to `limit` pending enrollments after `cursor`, ordered like
+    `view_pending_registrations`, and the cursor to pass for the next page
+    (None if the page is empty). Each course's queue is read from its
+    position index, so a page costs O(limit) however deep it is, and the
+    cursor stays valid after its enrollment is approved, rejected or deleted.
+    """
+    course_ids = sorted(c.course_id for c in db.get_courses_by_coordinator(professor_id))
+    if cursor is not None:
+        course_ids = [course_id for course_id in course_ids if course_id >= cursor[0]]
+    page: List[Enrollment] = []
+    last: Optional[PendingCursor] = None
+    for course_id in course_ids:
+        wanted = None if limit is None else limit - len(page)
+        if wanted == 0:
+            break
+        after = cursor[1] if cursor is not None and course_id == cursor[0] else None
+        rows = db.page_enrollments_by_course_and_status(course_id, EnrollmentStatus.PENDING, after, wanted)
+        if rows:
+            position, enrollment = rows[-1]
+            last = (course_id, position, enrollment.enrollment_id)
+            page.extend(enrollment for _, enrollment in rows)
+    return page, last
 
 def approve_registration(db: Database, enrollment_id: str) -> Optional[Enrollment]:
     """
-    Approves a pending enrollment.
+    Approves a pending enrollment, unless the course is already filled
+    with enrolled students.
     Corresponds to "Approve Registration" in Sequence Diagram.
     """
     enrollment = db.enrollments.get(enrollment_id)
-    if enrollment and enrollment.status == EnrollmentStatus.PENDING:
-        enrollment.status = EnrollmentStatus.ENROLLED
-        db.enrollments[enrollment_id] = enrollment # Update in DB
-        return enrollment
+    if not enrollment:
+        return None
+    with db.course_lock(enrollment.course_id):
+        # Re-read under the lock: another approval may have got here first
+        enrollment = db.enrollments.get(enrollment_id)
+        if enrollment and enrollment.status == EnrollmentStatus.PENDING and _can_enroll(db, enrollment.course_id):
+            return db.update_enrollment_status(enrollment_id, EnrollmentStatus.ENROLLED)
     return None
 
+def _can_enroll(db: Database, course_id: str, already: int = 0) -> bool:
+    """True if `already` more approvals still leave an ENROLLED seat in the course."""
+    course = db.courses.get(course_id)
+    if course is None:
+        return False
+    return (course.capacity is None or
+            db.count_enrollments(course_id, EnrollmentStatus.ENROLLED) + already < course.capacity)
+
+def reject_registration(db: Database, professor_id: str, enrollment_id: str) -> Optional[Enrollment]:
+    """
+    Rejects a pending or waitlisted enrollment in a course coordinated by the
+    professor. A freed seat goes to the first student on the waitlist.
+    """
+    enrollment = db.enrollments.get(enrollment_id)
+    if not enrollment:
+        return None
+    with db.course_lock(enrollment.course_id):
+        enrollment = db.enrollments.get(enrollment_id)
+        course = db.courses.get(enrollment.course_id) if enrollment else None
+        if (not course or course.coordinator_id != professor_id or
+                enrollment.status not in (EnrollmentStatus.PENDING, EnrollmentStatus.WAITLISTED)):
+            return None
+        rejected = db.update_enrollment_status(enrollment_id, EnrollmentStatus.REJECTED)
+        seat_service.promote_waitlist(db, course.course_id)
+        return rejected
+
+def approve_registrations(db: Database, professor_id: str,
+                          enrollment_ids: Iterable[str]) -> Dict[str, Optional[Enrollment]]:
+    """
+    Approves many pending enrollments in courses coordinated by the professor.
+
+    All requests are validated first (coordinator checked once per course),
+    then every valid approval is applied in one transaction, holding the
+    locks of all courses involved. Returns the approved Enrollment per id, or
+    None where the id was unknown, not pending, in a course the professor
+    does not coordinate, or in a course already filled.
+    """
+    enrollment_ids = list(enrollment_ids)
+    course_ids = {en.course_id for en in map(db.enrollments.get, enrollment_ids) if en}
+    results: Dict[str, Optional[Enrollment]] = {}
+    authorized: Dict[str, bool] = {}
+    approving: Dict[str, int] = {}
+    with db.course_locks(course_ids):
+        for enrollment_id in enrollment_ids:
+            enrollment = db.enrollments.get(enrollment_id)
+            if not enrollment or enrollment.status != EnrollmentStatus.PENDING or enrollment_id in results:
+                results.setdefault(enrollment_id, None)
+                continue
+            course_id = enrollment.course_id
+            if course_id not in authorized:
+                course = db.courses.get(course_id)
+                authorized[course_id] = bool(course and course.coordinator_id == professor_id)
+            if authorized[course_id] and _can_enroll(db, course_id, approving.get(course_id, 0)):
+                approving[course_id] = approving.get(course_id, 0) + 1
+                results[enrollment_id] = enrollment
+            else:
+                results[enrollment_id] = None
+
+        with db.transaction():
+            for enrollment_id, enrollment in results.items():
+                if enrollment is not None:
+                    results[enrollment_id] = db.update_enrollment_status(enrollment_id, EnrollmentStatus.ENROLLED)
+    return results
+
 def upload_grade(db: Database, professor_id: str, student_id: str, course_id: str, grade_value: str) -> Optional[Grade]:
     """
     Uploads or updates a grade for a student in a course.
     Corresponds to "Upload Grades" use case.
+
+    The checks and the write run under the course's lock in one transaction,
+    so concurrent uploads for the same student keep a single grade row.
     """
-    # Check if professor coordinates this course
-    course = db.courses.get(course_id)
-    if not course or course.coordinator_id != professor_id:
-        return None # Professor not authorized for this course
-
-    # Check if student is enrolled in this course
-    enrollment_found = False
-    for en in db.enrollments.values():
-        if (en.student_id == student_id and 
-            en.course_id == course_id and 
-            en.status == EnrollmentStatus.ENROLLED):
-            enrollment_found = True
-            break
-    
-    if not enrollment_found:
-        return None # Student not enrolled
-
-    # Find existing grade to update, or create a new one
-    existing_grade: Optional[Grade] = None
-    for grade in db.grades.values():
-        if grade.student_id == student_id and grade.course_id == course_id:
-            existing_grade = grade
-            break
-            
-    if existing_grade:
-        existing_grade.grade_value = grade_value
-        db.grades[existing_grade.grade_id] = existing_grade
-        return existing_grade
-    else:
-        new_grade_id = str(uuid.uuid4())
+    with db.course_lock(course_id), db.transaction():
+        # Check if professor coordinates this course
+        course = db.courses.get(course_id)
+        if not course or course.coordinator_id != professor_id:
+            return None # Professor not authorized for this course
+
+        # Check if student is enrolled in this course
+        enrollment = db.find_enrollment(student_id, course_id)
+        if not enrollment or enrollment.status != EnrollmentStatus.ENROLLED:
+            return None # Student not enrolled
+
+        # Find existing grade to update, or create a new one
+        existing_grade = db.find_grade(student_id, course_id)
+        if existing_grade:
+            return db.update_grade_value(existing_grade.grade_id, grade_value)
         new_grade = Grade(
-            grade_id=new_grade_id,
+            grade_id=str(uuid.uuid4()),
             student_id=student_id,
             course_id=course_id,
             grade_value=grade_value
         )
-        db.grades[new_grade_id] = new_grade
+        db.add_grade(new_grade)
         return new_grade
 
+def upload_grades(db: Database, professor_id: str, course_id: str,
+                  grades: Dict[str, str]) -> Dict[str, Optional[Grade]]:
+    """
+    Uploads or updates a whole grade sheet ({student_id: grade_value}) for a course.
+
+    Under the course's lock and in one transaction, authorization is checked
+    once, the course's enrollments and existing grades are each resolved in
+    a single pass, and all writes are applied. Returns the stored Grade per
+    student, or None for students not enrolled (every entry is None if the
+    professor does not coordinate the course).
+    """
+    results: Dict[str, Optional[Grade]] = {}
+    with db.course_lock(course_id), db.transaction():
+        course = db.courses.get(course_id)
+        if not course or course.coordinator_id != professor_id:
+            return {student_id: None for student_id in grades}
+
+        enrolled = {
+            en.student_id for en in db.get_enrollments_by_course(course_id)
+            if en.status == EnrollmentStatus.ENROLLED
+        }
+        existing = {grade.student_id: grade for grade in db.get_grades_by_course(course_id)}
+
+        for student_id, grade_value in grades.items():
+            if student_id not in enrolled:
+                results[student_id] = None
+            elif student_id in existing:
+                results[student_id] = db.update_grade_value(existing[student_id].grade_id, grade_value)
+            else:
+                new_grade = Grade(
+                    grade_id=str(uuid.uuid4()),
+                    student_id=student_id,
+                    course_id=course_id,
+                    grade_value=grade_value
+                )
+                db.add_grade(new_grade)
+                results[student_id] = new_grade
+    return results
+
 def view_enrolled_students(db: Database, professor_id: str, course_id: str) -> List[User]:
     """
     Views all students enrolled in a specific course coordinated by the professor.
@@ -95,8 +213,9 @@ def view_enrolled_students(db: Database, professor_id: str, course_id: str) -> L
         return [] # Not authorized or course doesn't exist
 
     enrolled_student_ids = [
-        en.student_id for en in db.enrollments.values()
-        if en.course_id == course_id and en.status == EnrollmentStatus.ENROLLED
+        en.student_id for en in db.get_enrollments_by_course(course_id)
+        if en.status == EnrollmentStatus.ENROLLED
     ]
     
-    return [db.users[uid] for uid in enrolled_student_ids if uid in db.users]
\ No newline at end of file
+    students = (db.get_user_by_id(uid) for uid in enrolled_student_ids)
+    return [student for student in students if student is not None]
\ No newline at end of file
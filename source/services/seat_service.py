@@ -0,0 +1,52 @@
+"""
+Service for course seats and waitlists.
+A PENDING or ENROLLED enrollment holds one of a course's `capacity` seats.
+Registrations beyond that are WAITLISTED and promoted to PENDING in FIFO
+order whenever a seat frees (rejection, drop or removal of a student).
+
+Callers that check seats and then write must hold `db.course_lock(course_id)`
+so that concurrent registrations for the same course cannot overbook it.
+"""
+from typing import List, Optional
+from source.college_erp.database import Database
+from source.college_erp.models.course import Course
+from source.college_erp.models.enrollment import Enrollment, EnrollmentStatus
+
+def seats_taken(db: Database, course_id: str) -> int:
+    """Number of seats held by PENDING and ENROLLED enrollments."""
+    return (db.count_enrollments(course_id, EnrollmentStatus.PENDING) +
+            db.count_enrollments(course_id, EnrollmentStatus.ENROLLED))
+
+def has_free_seat(db: Database, course: Course) -> bool:
+    """True if the course is uncapped or has a seat left."""
+    return course.capacity is None or seats_taken(db, course.course_id) < course.capacity
+
+def seats_left(db: Database, course_id: str) -> Optional[int]:
+    """Seats still free in a course; None for an uncapped or unknown course."""
+    course = db.courses.get(course_id)
+    if course is None or course.capacity is None:
+        return None
+    return max(course.capacity - seats_taken(db, course_id), 0)
+
+def view_waitlist(db: Database, course_id: str) -> List[Enrollment]:
+    """Fetches a course's waitlist, first in line first."""
+    return db.get_enrollments_by_course_and_status(course_id, EnrollmentStatus.WAITLISTED)
+
+def promote_waitlist(db: Database, course_id: str) -> List[Enrollment]:
+    """
+    Moves waitlisted enrollments to PENDING, oldest first, while the course
+    has free seats. Returns the promoted enrollments.
+    """
+    promoted: List[Enrollment] = []
+    with db.course_lock(course_id):
+        course = db.courses.get(course_id)
+        if course is None:
+            return promoted
+        waitlist = view_waitlist(db, course_id)
+        free = len(waitlist) if course.capacity is None else course.capacity - seats_taken(db, course_id)
+        if free <= 0 or not waitlist:
+            return promoted
+        with db.transaction():
+            for enrollment in waitlist[:free]:
+                promoted.append(db.update_enrollment_status(enrollment.enrollment_id, EnrollmentStatus.PENDING))
+    return promoted
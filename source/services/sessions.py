@@ -0,0 +1,150 @@
+"""
+Service for session handling on top of authentication.
+A successful login issues a signed session token; later requests present the
+token and are authorized by role without going through password checks again.
+"""
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Set, Tuple
+from source.college_erp.database import Database
+from source.college_erp.models.user import UserRole
+from source.college_erp.services import authentication
+
+DEFAULT_TTL_SECONDS = 8 * 60 * 60
+DEFAULT_MAX_SESSIONS = 100_000
+
+@dataclass(frozen=True)
+class Session:
+    """A logged-in user's session."""
+    user_id: str
+    role: UserRole
+    expires_at: float
+
+class SessionStore:
+    """
+    In-memory session store.
+
+    Tokens have the form "<session id>.<HMAC-SHA256 signature>", so forged or
+    mangled tokens are rejected before the store is consulted. Sessions expire
+    `ttl_seconds` after issue and are evicted lazily on access or by
+    `evict_expired`; beyond `max_sessions` the least recently used session is
+    dropped. All operations are O(1) except `evict_expired`.
+    """
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS,
+                 secret: Optional[bytes] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._secret = secret or secrets.token_bytes(32)
+        self._clock = clock
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._by_user: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _sign(self, session_id: str) -> str:
+        return hmac.new(self._secret, session_id.encode(), hashlib.sha256).hexdigest()
+
+    def _drop(self, session_id: str):
+        session = self._sessions.pop(session_id)
+        tokens = self._by_user.get(session.user_id)
+        if tokens is not None:
+            tokens.discard(session_id)
+            if not tokens:
+                del self._by_user[session.user_id]
+
+    def issue(self, user_id: str, role: UserRole) -> str:
+        """Creates a session and returns its token."""
+        session_id = secrets.token_urlsafe(24)
+        session = Session(user_id=user_id, role=role, expires_at=self._clock() + self.ttl_seconds)
+        with self._lock:
+            self._sessions[session_id] = session
+            self._by_user.setdefault(user_id, set()).add(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._drop(next(iter(self._sessions)))
+        return f"{session_id}.{self._sign(session_id)}"
+
+    def get(self, token: str) -> Optional[Session]:
+        """Returns the live session for a token, or None if invalid or expired."""
+        session_id, _, signature = token.partition(".")
+        if not hmac.compare_digest(signature, self._sign(session_id)):
+            return None
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if session.expires_at <= self._clock():
+                self._drop(session_id)
+                return None
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def revoke(self, token: str) -> bool:
+        """Ends the session for a token (logout)."""
+        session_id = token.partition(".")[0]
+        with self._lock:
+            if session_id not in self._sessions:
+                return False
+            self._drop(session_id)
+            return True
+
+    def revoke_user(self, user_id: str) -> int:
+        """Ends every session of a user, e.g. after a password change or removal."""
+        with self._lock:
+            session_ids = list(self._by_user.get(user_id, ()))
+            for session_id in session_ids:
+                self._drop(session_id)
+            return len(session_ids)
+
+    def evict_expired(self) -> int:
+        """Sweeps out all expired sessions, returning how many were evicted."""
+        now = self._clock()
+        with self._lock:
+            expired = [sid for sid, session in self._sessions.items() if session.expires_at <= now]
+            for session_id in expired:
+                self._drop(session_id)
+            return len(expired)
+
+# A single store to be used across the application
+session_store = SessionStore()
+
+def login_session(db: Database, user_id: str, password: str,
+                  store: SessionStore = session_store) -> Optional[str]:
+    """
+    Logs a user in and issues a session token.
+    Returns None if authentication fails.
+    """
+    user = authentication.login(db, user_id, password)
+    if user is None:
+        return None
+    return store.issue(user.user_id, user.role)
+
+def validate_session(token: str, store: SessionStore = session_store) -> Optional[Tuple[str, UserRole]]:
+    """
+    Checks a session token in O(1).
+    Returns (user_id, role) for a live session, None otherwise.
+    """
+    session = store.get(token)
+    return (session.user_id, session.role) if session else None
+
+def authorize(token: str, *roles: UserRole, store: SessionStore = session_store) -> Optional[str]:
+    """
+    Returns the session's user_id if the token is live and its role is one
+    of `roles` (any role if none are given), None otherwise.
+    """
+    session = store.get(token)
+    if session is None or (roles and session.role not in roles):
+        return None
+    return session.user_id
+
+def logout(token: str, store: SessionStore = session_store) -> bool:
+    """Ends a session."""
+    return store.revoke(token)
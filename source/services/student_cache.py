@@ -0,0 +1,123 @@
+"""
+Read-through cache for the student portal's hot reads.
+Wraps `student_service.view_courses`, `view_grades` and
+`view_registered_courses`, serving repeated page loads from memory until a
+change to the underlying rows invalidates exactly the affected entries.
+"""
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Iterable, Tuple
+from source.college_erp.database import CLEAR, Change, Database
+from source.college_erp.models.course import Course
+from source.college_erp.models.enrollment import Enrollment
+from source.college_erp.models.grade import Grade
+from source.college_erp.services import student_service
+
+DEFAULT_MAX_ENTRIES = 50_000
+
+# Cache keys: the catalog, or (view, student_id)
+CATALOG = ("courses",)
+GRADES = "grades"
+REGISTERED = "registered"
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Counters since the cache was created."""
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+class StudentViewCache:
+    """
+    Bounded LRU cache of student views, invalidated through the database's
+    change listeners: a course change drops the catalog, an enrollment or
+    grade change drops only that student's entry. Results are tuples of
+    frozen rows, so callers cannot corrupt what other callers see.
+
+    Every key has a version that invalidation bumps. A miss records the
+    version before reading the database and only stores its result if the
+    version is unchanged afterwards, so a write that lands mid-read cannot
+    leave a stale entry behind.
+    """
+    def __init__(self, db: Database, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.db = db
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._versions: Dict[Hashable, int] = {}
+        self._generation = 0  # bumped by CLEAR, which invalidates every key at once
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = self._invalidations = 0
+        db.add_listener(self._on_change)
+
+    def detach(self):
+        """Stops invalidation and empties the cache; the cache must not be used afterwards."""
+        self.db.remove_listener(self._on_change)
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, self._invalidations, len(self._entries))
+
+    def _get(self, key: Hashable, compute: Callable[[], Iterable]) -> tuple:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return value
+            self._misses += 1
+            version = (self._generation, self._versions.get(key, 0))
+
+        value = tuple(compute())
+        with self._lock:
+            if (self._generation, self._versions.get(key, 0)) == version:
+                self._entries[key] = value
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+        return value
+
+    def _invalidate(self, key: Hashable):
+        # Called with the lock held
+        self._versions[key] = self._versions.get(key, 0) + 1
+        if self._entries.pop(key, None) is not None:
+            self._invalidations += 1
+
+    def _on_change(self, change: Change):
+        if change.table not in ("courses", "enrollments", "grades"):
+            return
+        with self._lock:
+            if change.action == CLEAR:
+                self._generation += 1
+                self._versions.clear()
+                self._invalidations += len(self._entries)
+                self._entries.clear()
+            elif change.table == "courses":
+                self._invalidate(CATALOG)
+            else:
+                view = REGISTERED if change.table == "enrollments" else GRADES
+                for row in (change.old, change.new):
+                    if row is not None:
+                        self._invalidate((view, row.student_id))
+
+    def view_courses(self) -> Tuple[Course, ...]:
+        """Cached `student_service.view_courses`."""
+        return self._get(CATALOG, lambda: student_service.view_courses(self.db))
+
+    def view_grades(self, student_id: str) -> Tuple[Grade, ...]:
+        """Cached `student_service.view_grades`."""
+        return self._get((GRADES, student_id), lambda: student_service.view_grades(self.db, student_id))
+
+    def view_registered_courses(self, student_id: str) -> Tuple[Enrollment, ...]:
+        """Cached `student_service.view_registered_courses`."""
+        return self._get((REGISTERED, student_id),
+                         lambda: student_service.view_registered_courses(self.db, student_id))
@@ -8,49 +8,74 @@ from source.college_erp.database import Database
 from source.college_erp.models.course import Course
 from source.college_erp.models.grade import Grade
 from source.college_erp.models.enrollment import Enrollment, EnrollmentStatus
+from source.college_erp.services import seat_service, timetable_service
 
 def view_courses(db: Database) -> List[Course]:
     """
     Fetches a list of all available courses.
     Corresponds to "View Available Courses" in Sequence Diagram.
     """
-    return list(db.courses.values())
+    return db.get_all_courses()
 
 def register_course(db: Database, student_id: str, course_id: str) -> Optional[Enrollment]:
     """
     Creates a new enrollment request for a student.
-    Status is set to PENDING.
+    Status is set to PENDING, or WAITLISTED if the course is full.
+    Refused if the course meets at the same time as one the student is
+    already registered in.
     Corresponds to "Request Registration" in Sequence Diagram.
     """
-    # Check if student and course exist
-    if student_id not in db.users or course_id not in db.courses:
+    # Check if student exists
+    if student_id not in db.users:
         return None
 
-    # Check for existing enrollment
-    for enrollment in db.enrollments.values():
-        if enrollment.student_id == student_id and enrollment.course_id == course_id:
-            return None # Already registered or pending
-
-    enrollment_id = str(uuid.uuid4())
-    new_enrollment = Enrollment(
-        enrollment_id=enrollment_id,
-        student_id=student_id,
-        course_id=course_id,
-        status=EnrollmentStatus.PENDING
-    )
-    db.enrollments[enrollment_id] = new_enrollment
-    return new_enrollment
+    # The duplicate, clash and seat checks must not interleave with another
+    # registration for the course, or another registration by the student
+    with db.course_locks((course_id, student_id)):
+        course = db.courses.get(course_id)
+        if course is None:
+            return None
+
+        # Check for existing enrollment
+        if db.find_enrollment(student_id, course_id) is not None:
+            return None # Already registered, pending or waitlisted
+
+        if timetable_service.find_clash(db, student_id, course) is not None:
+            return None # Timetable clash
+
+        enrollment_id = str(uuid.uuid4())
+        new_enrollment = Enrollment(
+            enrollment_id=enrollment_id,
+            student_id=student_id,
+            course_id=course_id,
+            status=EnrollmentStatus.PENDING if seat_service.has_free_seat(db, course) else EnrollmentStatus.WAITLISTED
+        )
+        db.add_enrollment(new_enrollment)
+        return new_enrollment
+
+def drop_course(db: Database, student_id: str, course_id: str) -> bool:
+    """
+    Withdraws a student's registration in a course.
+    A freed seat goes to the first student on the course's waitlist.
+    """
+    with db.course_lock(course_id):
+        enrollment = db.find_enrollment(student_id, course_id)
+        if enrollment is None:
+            return False
+        db.remove_enrollment(enrollment.enrollment_id)
+        seat_service.promote_waitlist(db, course_id)
+    return True
 
 def view_grades(db: Database, student_id: str) -> List[Grade]:
     """
     Fetches all grades for a specific student.
     Corresponds to "View Grades" use case.
     """
-    return [grade for grade in db.grades.values() if grade.student_id == student_id]
+    return db.get_grades_by_student(student_id)
 
 def view_registered_courses(db: Database, student_id: str) -> List[Enrollment]:
     """
     Fetches all enrollments (pending, approved, rejected) for a student.
     Corresponds to "View Registered Courses" use case.
     """
-    return [en for en in db.enrollments.values() if en.student_id == student_id]
\ No newline at end of file
+    return db.get_enrollments_by_student(student_id)
\ No newline at end of file
@@ -0,0 +1,261 @@
+"""
+Service for course timetables and clash detection.
+A course meets in weekly one-hour slots, numbered day * 24 + hour from
+Monday 0:00 (0) to Sunday 23:00 (167). Every Course carries its slots as a
+168-bit bitmap (`Course.slot_mask`), so whether two courses clash is one
+AND of two integers, and a student's whole week is the OR of their
+courses' bitmaps.
+
+A registration books the student's week while it is PENDING, WAITLISTED
+or ENROLLED; REJECTED registrations free it. Each Database gets a
+BookingIndex on first use, a change listener that keeps every student's
+booked week as one integer, so a clash check is a dictionary lookup and
+an AND.
+"""
+import re
+import threading
+import weakref
+from dataclasses import dataclass
+from functools import reduce
+from operator import or_
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+import numpy as np
+from source.college_erp.database import CLEAR, DELETE, Change, Database
+from source.college_erp.models.course import HOURS_PER_WEEK, Course
+from source.college_erp.models.enrollment import EnrollmentStatus
+
+DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+BOOKING_STATUSES = (EnrollmentStatus.PENDING, EnrollmentStatus.WAITLISTED, EnrollmentStatus.ENROLLED)
+
+# A week bitmap packed into three 64-bit words, lowest slots first
+_WORD = (1 << 64) - 1
+_WORD_SHIFTS = (0, 64, 128)
+
+_SLOT_SPEC = re.compile(r"^\s*([A-Za-z]{3})[a-z]*\s+(\d{1,2})(?:\s*-\s*(\d{1,2}))?\s*$")
+
+def slot(day: Union[str, int], hour: int) -> int:
+    """The slot number of a day ("Mon".."Sun" or 0-6) and an hour (0-23)."""
+    day_index = DAYS.index(day[:3].title()) if isinstance(day, str) else day
+    if not (0 <= day_index < 7 and 0 <= hour < 24):
+        raise ValueError(f"no such hour of the week: {day!r} {hour!r}")
+    return day_index * 24 + hour
+
+def slot_label(number: int) -> str:
+    """Human-readable form of a slot, e.g. "Wed 09:00"."""
+    day, hour = divmod(number, 24)
+    return f"{DAYS[day]} {hour:02d}:00"
+
+def parse_slots(spec: Union[str, Iterable[int], None]) -> Tuple[int, ...]:
+    """
+    Reads slots from text such as "Mon 9, Wed 9-11" (a range excludes its
+    end hour, so that is Mon 9:00, Wed 9:00 and Wed 10:00) or from an
+    iterable of slot numbers. Blank means no slots. Raises ValueError if invalid.
+    """
+    if spec is None or spec == "":
+        return ()
+    if not isinstance(spec, str):
+        slots = tuple(int(number) for number in spec)
+        if any(not 0 <= number < HOURS_PER_WEEK for number in slots):
+            raise ValueError(f"slots must be between 0 and {HOURS_PER_WEEK - 1}")
+        return slots
+    slots = []
+    for part in spec.split(","):
+        match = _SLOT_SPEC.match(part)
+        if match is None or match.group(1).title() not in DAYS:
+            raise ValueError(f"invalid slot {part.strip()!r}")
+        start = int(match.group(2))
+        end = int(match.group(3)) if match.group(3) else start + 1
+        if not start < end <= 24:
+            raise ValueError(f"invalid hours in slot {part.strip()!r}")
+        slots.extend(slot(match.group(1), hour) for hour in range(start, end))
+    return tuple(slots)
+
+def mask_slots(mask: int) -> Tuple[int, ...]:
+    """The slot numbers set in a week bitmap."""
+    slots = []
+    while mask:
+        low = mask & -mask  # lowest set bit
+        slots.append(low.bit_length() - 1)
+        mask ^= low
+    return tuple(slots)
+
+class BookingIndex:
+    """
+    Every student's booked week (student_id -> 168-bit int), kept current by
+    a change listener as registrations and course timetables change. It
+    keeps its own copy of the course bitmaps and holds no reference to the
+    database, so it lives exactly as long as the database it listens to.
+    """
+    def __init__(self, db: Database):
+        self._lock = threading.Lock()
+        self._masks: Dict[str, int] = {}                 # course_id -> slot bitmap (scheduled courses)
+        self._booked: Dict[str, Dict[str, int]] = {}     # student_id -> {course_id: booking registrations}
+        self._students: Dict[str, Set[str]] = {}         # course_id -> students booked in it
+        self._weeks: Dict[str, int] = {}                 # student_id -> OR of their booked courses
+        with db.transaction():
+            for course_id, course in list(db.courses.items()):
+                if course.slot_mask:
+                    self._masks[course_id] = course.slot_mask
+            for status in BOOKING_STATUSES:
+                for enrollment in db.get_enrollments_by_status(status):
+                    self._book(enrollment.student_id, enrollment.course_id)
+            db.add_listener(self._on_change)
+
+    def week(self, student_id: str, exclude_course_id: Optional[str] = None) -> int:
+        """The student's booked week, optionally leaving one course out."""
+        with self._lock:
+            booked = self._booked.get(student_id)
+            if not booked:
+                return 0
+            if exclude_course_id not in booked:
+                return self._weeks[student_id]
+            return reduce(or_, (self._masks.get(course_id, 0) for course_id in booked
+                                if course_id != exclude_course_id), 0)
+
+    def clashing_course(self, student_id: str, course: Course) -> Optional[str]:
+        """The first booked course of the student that shares a slot with `course`, or None."""
+        with self._lock:
+            if not self._weeks.get(student_id, 0) & course.slot_mask:
+                return None
+            for other in self._booked[student_id]:
+                if other != course.course_id and self._masks.get(other, 0) & course.slot_mask:
+                    return other
+        return None
+
+    def _book(self, student_id: str, course_id: str):
+        booked = self._booked.setdefault(student_id, {})
+        booked[course_id] = booked.get(course_id, 0) + 1
+        self._students.setdefault(course_id, set()).add(student_id)
+        self._weeks[student_id] = self._weeks.get(student_id, 0) | self._masks.get(course_id, 0)
+
+    def _unbook(self, student_id: str, course_id: str):
+        booked = self._booked.get(student_id, {})
+        if booked.get(course_id, 0) > 1:
+            booked[course_id] -= 1
+            return
+        booked.pop(course_id, None)
+        self._students.get(course_id, set()).discard(student_id)
+        self._rebuild_week(student_id)
+
+    def _rebuild_week(self, student_id: str):
+        booked = self._booked.get(student_id)
+        if booked:
+            self._weeks[student_id] = reduce(or_, (self._masks.get(course_id, 0) for course_id in booked), 0)
+        else:
+            self._booked.pop(student_id, None)
+            self._weeks.pop(student_id, None)
+
+    def _on_change(self, change: Change):
+        with self._lock:
+            if change.table == "enrollments":
+                self._on_enrollment(change)
+            elif change.table == "courses":
+                self._on_course(change)
+
+    def _on_enrollment(self, change: Change):
+        if change.action == CLEAR:
+            self._booked.clear()
+            self._students.clear()
+            self._weeks.clear()
+            return
+        old, new = change.old, change.new
+        if old is not None and old.status in BOOKING_STATUSES:
+            self._unbook(old.student_id, old.course_id)
+        if new is not None and change.action != DELETE and new.status in BOOKING_STATUSES:
+            self._book(new.student_id, new.course_id)
+
+    def _on_course(self, change: Change):
+        if change.action == CLEAR:
+            self._masks.clear()
+            for student_id in list(self._booked):
+                self._rebuild_week(student_id)
+            return
+        course_id = (change.old if change.action == DELETE else change.new).course_id
+        mask = 0 if change.action == DELETE else change.new.slot_mask
+        if self._masks.get(course_id, 0) == mask:
+            return
+        if mask:
+            self._masks[course_id] = mask
+        else:
+            self._masks.pop(course_id, None)
+        for student_id in self._students.get(course_id, ()):
+            self._rebuild_week(student_id)
+
+_indexes: "weakref.WeakKeyDictionary[Database, BookingIndex]" = weakref.WeakKeyDictionary()
+_indexes_lock = threading.Lock()
+
+def booking_index(db: Database) -> BookingIndex:
+    """The database's BookingIndex, built (and attached) on first use."""
+    index = _indexes.get(db)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(db)
+            if index is None:
+                index = _indexes[db] = BookingIndex(db)
+    return index
+
+def booked_mask(db: Database, student_id: str, exclude_course_id: Optional[str] = None) -> int:
+    """The student's booked week: the OR of the bitmaps of their registered courses."""
+    return booking_index(db).week(student_id, exclude_course_id)
+
+def find_clash(db: Database, student_id: str, course: Course) -> Optional[str]:
+    """
+    The id of a course the student is registered in that meets at the same
+    time as `course`, or None. Free for courses without slots; otherwise
+    one AND against the student's indexed week unless there is a clash.
+    """
+    if not course.slot_mask:
+        return None
+    return booking_index(db).clashing_course(student_id, course)
+
+@dataclass(frozen=True, slots=True)
+class Clash:
+    """Two courses a student is registered in that share slots."""
+    student_id: str
+    course_ids: Tuple[str, str]
+    slots: Tuple[int, ...]
+
+def find_all_clashes(db: Database) -> List[Clash]:
+    """
+    Reports every clashing pair of registrations, ordered by student id
+    (then registration order). The booking registrations in scheduled
+    courses become a student column and a course column; with the students
+    sorted, one numpy pass ORs each student's course bitmaps (packed in
+    three uint64 words) into their week and compares its hours with the
+    hours of their courses. Only students whose courses overlap, where the
+    sum is larger, are then compared pair by pair.
+    """
+    course_ids = [course_id for course_id, course in list(db.courses.items()) if course.slot_mask]
+    code = {course_id: index for index, course_id in enumerate(course_ids)}
+    rows = [(enrollment.student_id, code[enrollment.course_id]) for enrollment in list(db.enrollments.values())
+            if enrollment.status in BOOKING_STATUSES and enrollment.course_id in code]
+    if not rows:
+        return []
+    masks = [db.courses[course_id].slot_mask for course_id in course_ids]
+    words = np.array([[mask >> shift & _WORD for shift in _WORD_SHIFTS] for mask in masks], dtype=np.uint64)
+    hours = np.array([mask.bit_count() for mask in masks], dtype=np.int64)
+
+    student_names, students = np.unique(np.array([student_id for student_id, _ in rows]), return_inverse=True)
+    courses = np.fromiter((course for _, course in rows), dtype=np.int64, count=len(rows))
+    order = np.argsort(students, kind="stable")
+    students, courses = students[order], courses[order]
+    starts = np.flatnonzero(np.r_[True, students[1:] != students[:-1]])
+    weeks = np.bitwise_or.reduceat(words[courses], starts, axis=0)
+    week_hours = np.unpackbits(weeks.view(np.uint8), axis=1).sum(axis=1)
+    booked_hours = np.add.reduceat(hours[courses], starts)
+
+    clashes = []
+    ends = np.r_[starts[1:], len(courses)]
+    for group in np.flatnonzero(booked_hours > week_hours):
+        student_id = str(student_names[students[starts[group]]])
+        booked = [course_ids[course] for course in courses[starts[group]:ends[group]].tolist()]
+        clashes.extend(_pair_clashes(student_id, booked, masks, code))
+    return clashes
+
+def _pair_clashes(student_id: str, booked: List[str], masks: List[int], code: Dict[str, int]) -> Iterator[Clash]:
+    for later in range(1, len(booked)):
+        mask = masks[code[booked[later]]]
+        for other in booked[:later]:
+            overlap = masks[code[other]] & mask
+            if overlap:
+                yield Clash(student_id, (other, booked[later]), mask_slots(overlap))
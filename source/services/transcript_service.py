@@ -0,0 +1,245 @@
+"""
+Service for exporting term-end transcripts.
+Merges the students, in id order, with one pass over the grades sorted by
+student id, joining course names and the CGPA computed from the same
+grades. Transcripts are streamed to CSV or JSON Lines, so memory grows with
+the number of students (they are sorted up front) but not with the number
+of grades. Large exports can be sharded by student-id range across worker
+processes.
+"""
+import csv
+import io
+import json
+import os
+from collections import deque
+from contextlib import ExitStack
+from dataclasses import dataclass
+from itertools import groupby
+from operator import attrgetter
+from typing import TYPE_CHECKING, Callable, Deque, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from source.college_erp.database import Database
+from source.college_erp.models.grade import Grade
+from source.college_erp.models.user import User, UserRole
+from source.college_erp.services.cgpa_service import CgpaEngine
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+# Students per job handed to a worker process by a sharded export
+EXPORT_CHUNK = 1_000
+
+CSV_FIELDS = ("student_id", "name", "branch", "cgpa", "course_id", "course_name", "grade", "grade_points")
+
+@dataclass(frozen=True, slots=True)
+class TranscriptLine:
+    """One graded course on a transcript."""
+    course_id: str
+    course_name: str
+    grade: str
+    grade_points: Optional[float]  # None if the grade is not on the scale
+
+@dataclass(frozen=True, slots=True)
+class Transcript:
+    """A student's grades, ordered by course id, with the CGPA they add up to."""
+    student_id: str
+    name: str
+    branch: str
+    cgpa: float
+    lines: Tuple[TranscriptLine, ...]
+
+    def to_record(self) -> dict:
+        """Plain, JSON-serializable form, e.g. for filling a PDF template."""
+        return {
+            "student_id": self.student_id,
+            "name": self.name,
+            "branch": self.branch,
+            "cgpa": round(self.cgpa, 2),
+            "courses": [
+                {"course_id": line.course_id, "course_name": line.course_name,
+                 "grade": line.grade, "grade_points": line.grade_points}
+                for line in self.lines
+            ],
+        }
+
+@dataclass
+class ExportReport:
+    """Outcome of `export_transcripts`."""
+    files: List[str]
+    transcripts: int
+
+def _in_range(key: str, start: Optional[str], stop: Optional[str]) -> bool:
+    return (start is None or key >= start) and (stop is None or key < stop)
+
+def iter_transcripts(db: Database, engine: Optional[CgpaEngine] = None,
+                     start: Optional[str] = None, stop: Optional[str] = None) -> Iterator[Transcript]:
+    """
+    Yields the transcripts of students with ids in [start, stop) (None means
+    unbounded), ordered by student id. Students without grades get an empty
+    transcript. The sorted students are merged with one sorted pass over
+    their grades (`Database.iter_grades_by_student`), so no grades are
+    looked up per student.
+    """
+    engine = engine or CgpaEngine(db)
+    course_names = _course_names(db)
+    for student, grades in _graded_students(db, start, stop):
+        yield _transcript(student.user_id, student.name, getattr(student, "branch", ""), grades,
+                          course_names, engine)
+
+def _course_names(db: Database) -> Dict[str, str]:
+    return {course_id: course.name for course_id, course in list(db.courses.items())}
+
+def _graded_students(db: Database, start: Optional[str] = None,
+                     stop: Optional[str] = None) -> Iterator[Tuple[User, Tuple[Grade, ...]]]:
+    """Yields (student, their grades by course id) in student id order."""
+    students = sorted((user for user in list(db.users.values())
+                       if user.role == UserRole.STUDENT and _in_range(user.user_id, start, stop)),
+                      key=attrgetter("user_id"))
+    by_student = groupby(db.iter_grades_by_student(start, stop), key=attrgetter("student_id"))
+    group = next(by_student, None)
+    for student in students:
+        # Skip grades whose student is gone, then take this student's run if it is next
+        while group is not None and group[0] < student.user_id:
+            group = next(by_student, None)
+        own: Tuple[Grade, ...] = ()
+        if group is not None and group[0] == student.user_id:
+            own = tuple(group[1])
+            group = next(by_student, None)
+        yield student, own
+
+def _transcript(student_id: str, name: str, branch: str, grades: Tuple[Grade, ...],
+                course_names: Dict[str, str], engine: CgpaEngine) -> Transcript:
+    points = engine.grade_points
+    return Transcript(
+        student_id=student_id,
+        name=name,
+        branch=branch,
+        cgpa=engine.cgpa_of(grades),
+        lines=tuple(TranscriptLine(grade.course_id, course_names.get(grade.course_id, ""),
+                                   grade.grade_value, points.get(grade.grade_value))
+                    for grade in grades)
+    )
+
+def write_csv(transcripts: Iterable[Transcript], out: TextIO, header: bool = True) -> int:
+    """
+    Writes one row per graded course (one row with blank course fields for a
+    student without grades). Returns the number of transcripts written.
+    """
+    writer = csv.writer(out)
+    if header:
+        writer.writerow(CSV_FIELDS)
+    written = 0
+    for transcript in transcripts:
+        head = (transcript.student_id, transcript.name, transcript.branch, f"{transcript.cgpa:.2f}")
+        if not transcript.lines:
+            writer.writerow(head + ("", "", "", ""))
+        writer.writerows(head + (line.course_id, line.course_name, line.grade,
+                                 "" if line.grade_points is None else line.grade_points)
+                         for line in transcript.lines)
+        written += 1
+    return written
+
+def write_jsonl(transcripts: Iterable[Transcript], out: TextIO) -> int:
+    """Writes one JSON object per transcript. Returns the number written."""
+    written = 0
+    for transcript in transcripts:
+        out.write(json.dumps(transcript.to_record()))
+        out.write("\n")
+        written += 1
+    return written
+
+WRITERS: Dict[str, Callable[[Iterable[Transcript], TextIO], int]] = {"csv": write_csv, "jsonl": write_jsonl}
+
+def shard_ranges(db: Database, shards: int) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Splits the student ids into at most `shards` [start, stop) ranges of
+    about equal size, and never into more ranges than there are students.
+    """
+    student_ids = sorted(user.user_id for user in list(db.users.values()) if user.role == UserRole.STUDENT)
+    shards = max(1, min(shards, len(student_ids)))
+    bounds = [None] + [student_ids[len(student_ids) * i // shards] for i in range(1, shards)] + [None]
+    return list(zip(bounds, bounds[1:]))
+
+# A student as sent to an export worker: id, name, branch and (grade id, course id, grade) per grade
+_StudentRow = Tuple[str, str, str, Tuple[Tuple[str, str, str], ...]]
+
+# Set in each export worker by _start_worker: course names and the engine computing CGPAs
+_worker: Optional[Tuple[Dict[str, str], CgpaEngine]] = None
+
+def _start_worker(course_names: Dict[str, str], grade_points: Dict[str, float],
+                  course_credits: Dict[str, float], default_credits: float):
+    global _worker
+    _worker = (course_names, CgpaEngine(Database(), grade_points, course_credits, default_credits))
+
+def _format_chunk(fmt: str, rows: List[_StudentRow]) -> Tuple[str, int]:
+    """Worker job: builds and formats some transcripts, returning their text without the CSV header."""
+    course_names, engine = _worker
+    transcripts = (_transcript(student_id, name, branch,
+                               tuple(Grade(grade_id, student_id, course_id, value) for grade_id, course_id, value in grades),
+                               course_names, engine)
+                   for student_id, name, branch, grades in rows)
+    out = io.StringIO()
+    written = write_csv(transcripts, out, header=False) if fmt == "csv" else write_jsonl(transcripts, out)
+    return out.getvalue(), written
+
+def _chunks(db: Database, starts: List[Optional[str]], size: int) -> Iterator[Tuple[int, List[_StudentRow]]]:
+    """Groups the students, in id order, into (range index, up to `size` rows), never across ranges."""
+    index, chunk = 0, []
+    for student, grades in _graded_students(db):
+        while index + 1 < len(starts) and student.user_id >= starts[index + 1]:
+            if chunk:
+                yield index, chunk
+                chunk = []
+            index += 1
+        chunk.append((student.user_id, student.name, getattr(student, "branch", ""),
+                      tuple((grade.grade_id, grade.course_id, grade.grade_value) for grade in grades)))
+        if len(chunk) == size:
+            yield index, chunk
+            chunk = []
+    if chunk:
+        yield index, chunk
+
+def export_transcripts(db: Database, path: str, fmt: str = "csv", workers: int = 1,
+                       engine: Optional[CgpaEngine] = None) -> ExportReport:
+    """
+    Exports every student's transcript to `path` as "csv" or "jsonl".
+    With workers > 1 the students are split by id range into one file per
+    worker ("transcripts-000.csv", ...). This process still makes the one
+    sorted pass over the tables and hands chunks of EXPORT_CHUNK students
+    (with their grades, as plain tuples) to worker processes started with
+    "spawn", which build and format the transcripts. Workers get only that
+    data, so none inherits the database or a lock held by another thread.
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f"unknown transcript format {fmt!r}")
+    if workers <= 1:
+        with open(path, "w", newline="", encoding="utf-8") as out:
+            return ExportReport([path], WRITERS[fmt](iter_transcripts(db, engine), out))
+
+    import multiprocessing  # only sharded exports pay for the process machinery
+    from concurrent.futures import ProcessPoolExecutor
+    root, ext = os.path.splitext(path)
+    starts = [start for start, _ in shard_ranges(db, workers)]
+    paths = [f"{root}-{i:03d}{ext}" for i in range(len(starts))]
+    written = 0
+    with ExitStack() as stack:
+        files = [stack.enter_context(open(shard, "w", newline="", encoding="utf-8")) for shard in paths]
+        if fmt == "csv":
+            for out in files:
+                csv.writer(out).writerow(CSV_FIELDS)
+        engine = engine or CgpaEngine(db)
+        pool = stack.enter_context(ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context("spawn"), initializer=_start_worker,
+            initargs=(_course_names(db), engine.grade_points, engine.course_credits, engine.default_credits)))
+        pending: Deque[Tuple[int, "Future[Tuple[str, int]]"]] = deque()
+        for index, chunk in _chunks(db, starts, EXPORT_CHUNK):
+            pending.append((index, pool.submit(_format_chunk, fmt, chunk)))
+            while len(pending) > 2 * workers:  # bounds the transcripts held in memory
+                written += _write_chunk(files, *pending.popleft())
+        while pending:
+            written += _write_chunk(files, *pending.popleft())
+    return ExportReport(paths, written)
+
+def _write_chunk(files: List[TextIO], index: int, future: "Future[Tuple[str, int]]") -> int:
+    text, written = future.result()
+    files[index].write(text)
+    return written
@@ -0,0 +1,447 @@
+"""
+Sharded storage backend for the College ERP System.
+Hash-partitions enrollments and grades by student_id across worker
+processes, each holding its partition in a plain in-memory Database, so
+their indexes and lookups run on several cores. Users and courses stay in
+the router process. The router keeps the Database API, so services run
+against it unchanged.
+"""
+import heapq
+import itertools
+import multiprocessing
+import threading
+import zlib
+from collections.abc import Mapping
+from contextlib import ExitStack, contextmanager
+from operator import attrgetter, itemgetter
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from source.college_erp.database import CLEAR, DELETE, GRADE_SCAN_BATCH, INSERT, UPDATE, Database, Snapshot, _latched
+from source.college_erp.models.enrollment import Enrollment, EnrollmentStatus
+from source.college_erp.models.grade import Grade
+
+DEFAULT_SHARDS = 4
+SHARDED_TABLES = ("enrollments", "grades")
+
+_position = itemgetter(0)
+
+def shard_of(student_id: str, shards: int) -> int:
+    """The shard holding a student's enrollments and grades (stable across processes and runs)."""
+    return zlib.crc32(student_id.encode()) % shards
+
+# --- Worker side ---
+
+def _put(db: Database, table: str, row: Any) -> Any:
+    """Inserts or replaces a row, returning the row it replaced."""
+    if table == "enrollments":
+        old = db.enrollments.get(row.enrollment_id)
+        db.add_enrollment(row)
+    else:
+        old = db.grades.get(row.grade_id)
+        db.add_grade(row)
+    return old
+
+def _put_many(db: Database, table: str, rows: List[Any]) -> List[Any]:
+    return [_put(db, table, row) for row in rows]
+
+def _update_status(db: Database, enrollment_id: str, status: EnrollmentStatus) -> Tuple[Any, Any]:
+    old = db.enrollments.get(enrollment_id)
+    return old, db.update_enrollment_status(enrollment_id, status)
+
+def _update_grade(db: Database, grade_id: str, grade_value: str) -> Tuple[Any, Any]:
+    old = db.grades.get(grade_id)
+    return old, db.update_grade_value(grade_id, grade_value)
+
+def _get(db: Database, table: str, key: str) -> Any:
+    return getattr(db, table).get(key)
+
+def _values(db: Database, table: str) -> List[Any]:
+    return list(getattr(db, table).values())
+
+def _grades_page(db: Database, start: Optional[str], stop: Optional[str],
+                 after: Optional[Tuple[str, str, str]]) -> List[Grade]:
+    return list(itertools.islice(db.iter_grades_by_student(start, stop, after), GRADE_SCAN_BATCH))
+
+# Operations beyond the Database methods, which workers call by name
+_SHARD_OPS: Dict[str, Callable[..., Any]] = {
+    "put": _put, "put_many": _put_many, "update_status": _update_status,
+    "update_grade": _update_grade, "get": _get, "values": _values, "grades_page": _grades_page,
+}
+
+def _serve(conn: Connection):
+    """Worker process main loop: answers (op, args) requests until it receives None."""
+    db = Database()
+    while True:
+        request = conn.recv()
+        if request is None:
+            break
+        op, args = request
+        try:
+            handler = _SHARD_OPS.get(op)
+            result = handler(db, *args) if handler else getattr(db, op)(*args)
+        except Exception as exc:
+            conn.send((False, exc))
+        else:
+            conn.send((True, result))
+    conn.close()
+
+# --- Router side ---
+
+class _Shard:
+    """Connection to one worker process; one request is in flight at a time."""
+    def __init__(self, context: multiprocessing.context.BaseContext, index: int):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child,), name=f"erp-shard-{index}", daemon=True)
+        self.process.start()
+        child.close()
+        self.lock = threading.RLock()
+
+    def send(self, op: str, *args: Any):
+        self.conn.send((op, args))
+
+    def receive(self) -> Any:
+        ok, result = self.conn.recv()
+        if not ok:
+            raise result
+        return result
+
+    def call(self, op: str, *args: Any) -> Any:
+        with self.lock:
+            self.send(op, *args)
+            return self.receive()
+
+    def close(self):
+        with self.lock:
+            self.conn.send(None)
+            self.conn.close()
+        self.process.join()
+
+def _receive_all(shards: List[_Shard]) -> List[Any]:
+    """
+    Reads one reply from each shard, in order. Every reply is read before the
+    first shard error is raised, so no reply is left in a pipe for the next
+    request to pick up.
+    """
+    results, error = [], None
+    for shard in shards:
+        try:
+            results.append(shard.receive())
+        except Exception as exc:
+            error = error or exc
+            results.append(None)
+    if error is not None:
+        raise error
+    return results
+
+class _ShardedTable(Mapping):
+    """
+    Read-only dict-like view over a sharded table, so code that reads
+    `db.enrollments.get(...)`, `key in db.grades` or `db.grades.values()`
+    keeps working. Key lookups go to the one shard owning the row;
+    `values()` gathers every shard.
+    """
+    def __init__(self, db: "ShardedDatabase", table: str, directory: Dict[str, int]):
+        self._db = db
+        self._table = table
+        self._directory = directory
+
+    def __getitem__(self, key: str):
+        shard = self._directory.get(key)
+        row = None if shard is None else self._db._shards[shard].call("get", self._table, key)
+        if row is None:
+            raise KeyError(key)
+        return row
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._directory
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._directory))
+
+    def __len__(self) -> int:
+        return len(self._directory)
+
+    def values(self) -> Iterator[Any]:
+        return itertools.chain.from_iterable(self._db._gather("values", self._table))
+
+class ShardedDatabase(Database):
+    """
+    Database whose enrollments and grades are split by student_id across
+    `shards` worker processes.
+
+    Student-keyed calls (`get_enrollments_by_student`, `find_enrollment`,
+    `get_grades_by_student`, inserts) go to one shard; course- and
+    status-keyed calls scatter to every shard in parallel and gather the
+    results. The router keeps a directory from enrollment and grade ids to
+    their shard, so updates by id also reach exactly one shard.
+
+    Each shard connection carries one request at a time under its own lock;
+    reads for different shards from different threads run in parallel.
+    Writes run under the latch, then their shard's lock, and notify their
+    listeners before releasing the latch, so listeners see changes one at a
+    time and in commit order, as with the in-memory Database.
+    `transaction()` takes the latch and every shard lock, so it excludes all
+    other writers; like Database's, it does not roll back. Gathered enrollments come back in the order they entered their
+    current status, which keeps waitlists first in, first out.
+    """
+    def __init__(self, shards: int = DEFAULT_SHARDS, context: Optional[multiprocessing.context.BaseContext] = None):
+        super().__init__()
+        if shards < 1:
+            raise ValueError("a sharded database needs at least one shard")
+        context = context or multiprocessing.get_context()
+        self._shards = [_Shard(context, index) for index in range(shards)]
+        self._enrollment_shard: Dict[str, int] = {}
+        self._grade_shard: Dict[str, int] = {}
+        # Sequence number of the moment each enrollment entered its current status
+        self._enrollment_seq: Dict[str, int] = {}
+        self._seq = itertools.count()
+        self.enrollments = _ShardedTable(self, "enrollments", self._enrollment_shard)
+        self.grades = _ShardedTable(self, "grades", self._grade_shard)
+
+    @property
+    def shard_count(self) -> int:
+        return len(self._shards)
+
+    def close(self):
+        """Stops the worker processes."""
+        for shard in self._shards:
+            shard.close()
+
+    def for_child_process(self) -> "ShardedDatabase":
+        raise ValueError("a sharded database cannot be shared with forked worker processes")
+
+    def snapshot(self) -> Snapshot:
+        raise ValueError("a sharded database cannot take snapshots: its shards keep no shared row versions")
+
+    def _shard_for(self, student_id: str) -> "_Shard":
+        return self._shards[shard_of(student_id, len(self._shards))]
+
+    @_latched
+    def _put(self, table: str, row: Any, row_id: str, directory: Dict[str, int]):
+        """Inserts or replaces a row on its student's shard, then reports the change."""
+        index = shard_of(row.student_id, len(self._shards))
+        old = None
+        previous = directory.get(row_id)
+        if previous is not None and previous != index:
+            # The id is reused for another student: drop the copy on the old shard
+            old = self._shards[previous].call("remove_enrollment" if table == "enrollments" else "remove_grade", row_id)
+        shard = self._shards[index]
+        with shard.lock:
+            old = shard.call("put", table, row) or old
+            directory[row_id] = index
+            if table == "enrollments":
+                self._enrollment_seq[row_id] = next(self._seq)
+            if old is not None:
+                self._notify(table, DELETE, old)
+            self._notify(table, INSERT, new=row)
+
+    def _gather(self, op: str, *args: Any) -> List[Any]:
+        """Sends one request to every shard, then collects the answers in shard order."""
+        with ExitStack() as stack:
+            for shard in self._shards:
+                stack.enter_context(shard.lock)
+            for shard in self._shards:
+                shard.send(op, *args)
+            return _receive_all(self._shards)
+
+    def _gather_enrollments(self, op: str, *args: Any) -> List[Enrollment]:
+        rows = list(itertools.chain.from_iterable(self._gather(op, *args)))
+        seq = self._enrollment_seq
+        rows.sort(key=lambda en: seq.get(en.enrollment_id, 0))
+        return rows
+
+    @contextmanager
+    def transaction(self) -> Iterator["ShardedDatabase"]:
+        """Holds the latch and every shard, so no other writer interleaves with the batch."""
+        with super().transaction(), ExitStack() as stack:
+            for shard in self._shards:
+                stack.enter_context(shard.lock)
+            yield self
+
+    def get_referenced_ids(self, child_table: str, column: str) -> Set[str]:
+        """Distinct values of a FK column; for the sharded tables, the union over every shard."""
+        if child_table not in SHARDED_TABLES:
+            return super().get_referenced_ids(child_table, column)
+        return set().union(*self._gather("get_referenced_ids", child_table, column))
+
+    def clear_table(self, table: str):
+        """Deletes every row of one table, without touching rows that reference it."""
+        if table not in SHARDED_TABLES:
+            super().clear_table(table)
+            return
+        with self.transaction():
+            self._gather("clear_table", table)
+            if table == "enrollments":
+                self._enrollment_shard.clear()
+                self._enrollment_seq.clear()
+            else:
+                self._grade_shard.clear()
+            self._notify(table, CLEAR)
+
+    # --- Enrollments ---
+
+    def add_enrollment(self, enrollment: Enrollment):
+        """Inserts an enrollment on its student's shard."""
+        self._put("enrollments", enrollment, enrollment.enrollment_id, self._enrollment_shard)
+
+    def add_enrollments(self, enrollments: Iterable[Enrollment]):
+        """Loads many new enrollments with one request per shard."""
+        self._put_many("enrollments", enrollments, lambda en: en.enrollment_id, self._enrollment_shard)
+
+    def _put_many(self, table: str, rows: Iterable[Any], key: Callable[[Any], str], directory: Dict[str, int]):
+        batches: List[List[Any]] = [[] for _ in self._shards]
+        for row in rows:
+            batches[shard_of(row.student_id, len(self._shards))].append(row)
+        with self.transaction():
+            for index, (shard, batch) in enumerate(zip(self._shards, batches)):
+                if batch:
+                    shard.send("put_many", table, batch)
+            sent = [index for index, batch in enumerate(batches) if batch]
+            replaced = dict(zip(sent, _receive_all([self._shards[index] for index in sent])))
+            for index, batch in enumerate(batches):
+                for row in batch:
+                    directory[key(row)] = index
+                    if table == "enrollments":
+                        self._enrollment_seq[row.enrollment_id] = next(self._seq)
+            if self._listeners:
+                for index, batch in enumerate(batches):
+                    for old, row in zip(replaced.get(index, ()), batch):
+                        if old is not None:
+                            self._notify(table, DELETE, old)
+                        self._notify(table, INSERT, new=row)
+
+    @_latched
+    def update_enrollment_status(self, enrollment_id: str, status: EnrollmentStatus) -> Optional[Enrollment]:
+        """Changes the status of an enrollment on the shard that holds it."""
+        index = self._enrollment_shard.get(enrollment_id)
+        if index is None:
+            return None
+        with self._shards[index].lock:
+            old, enrollment = self._shards[index].call("update_status", enrollment_id, status)
+            if enrollment is not None:
+                self._enrollment_seq[enrollment_id] = next(self._seq)
+                self._notify("enrollments", UPDATE, old, enrollment)
+        return enrollment
+
+    @_latched
+    def remove_enrollment(self, enrollment_id: str) -> Optional[Enrollment]:
+        """Deletes an enrollment from the shard that holds it."""
+        index = self._enrollment_shard.get(enrollment_id)
+        if index is None:
+            return None
+        with self._shards[index].lock:
+            enrollment = self._shards[index].call("remove_enrollment", enrollment_id)
+            self._enrollment_shard.pop(enrollment_id, None)
+            self._enrollment_seq.pop(enrollment_id, None)
+            if enrollment is not None:
+                self._notify("enrollments", DELETE, enrollment)
+        return enrollment
+
+    def find_enrollment(self, student_id: str, course_id: str) -> Optional[Enrollment]:
+        """Fetches the enrollment of a student in a course, if any."""
+        return self._shard_for(student_id).call("find_enrollment", student_id, course_id)
+
+    def get_enrollments_by_student(self, student_id: str) -> List[Enrollment]:
+        """Fetches all enrollments of a student from their shard."""
+        return self._shard_for(student_id).call("get_enrollments_by_student", student_id)
+
+    def get_enrollments_by_course(self, course_id: str) -> List[Enrollment]:
+        """Fetches all enrollments in a course from every shard."""
+        return self._gather_enrollments("get_enrollments_by_course", course_id)
+
+    def get_enrollments_by_status(self, status: EnrollmentStatus) -> List[Enrollment]:
+        """Fetches all enrollments with the given status from every shard."""
+        return self._gather_enrollments("get_enrollments_by_status", status)
+
+    def get_enrollments_by_course_and_status(self, course_id: str, status: EnrollmentStatus) -> List[Enrollment]:
+        """Fetches a course's enrollments with the given status, in the order they entered it."""
+        return self._gather_enrollments("get_enrollments_by_course_and_status", course_id, status)
+
+    def page_enrollments_by_course_and_status(self, course_id: str, status: EnrollmentStatus,
+                                              after: Optional[int] = None,
+                                              limit: Optional[int] = None) -> List[Tuple[int, Enrollment]]:
+        """
+        A page of a course's enrollments with the given status, positioned by
+        the router's sequence numbers. The shards keep no positions, so every
+        shard returns the whole bucket and the router keeps the `limit`
+        smallest positions after `after`.
+        """
+        seq = self._enrollment_seq
+        rows = ((seq.get(en.enrollment_id, 0), en) for en in
+                itertools.chain.from_iterable(self._gather("get_enrollments_by_course_and_status", course_id, status)))
+        if after is not None:
+            rows = (row for row in rows if row[0] > after)
+        if limit is None:
+            return sorted(rows, key=_position)
+        return heapq.nsmallest(limit, rows, key=_position)
+
+    def count_enrollments(self, course_id: str, status: EnrollmentStatus) -> int:
+        """Counts a course's enrollments with the given status across every shard."""
+        return sum(self._gather("count_enrollments", course_id, status))
+
+    # --- Grades ---
+
+    def add_grade(self, grade: Grade):
+        """Inserts a grade on its student's shard."""
+        self._put("grades", grade, grade.grade_id, self._grade_shard)
+
+    def add_grades(self, grades: Iterable[Grade]):
+        """Loads many new grades with one request per shard."""
+        self._put_many("grades", grades, lambda grade: grade.grade_id, self._grade_shard)
+
+    @_latched
+    def update_grade_value(self, grade_id: str, grade_value: str) -> Optional[Grade]:
+        """Changes the value of a grade on the shard that holds it."""
+        index = self._grade_shard.get(grade_id)
+        if index is None:
+            return None
+        with self._shards[index].lock:
+            old, grade = self._shards[index].call("update_grade", grade_id, grade_value)
+            if grade is not None:
+                self._notify("grades", UPDATE, old, grade)
+        return grade
+
+    @_latched
+    def remove_grade(self, grade_id: str) -> Optional[Grade]:
+        """Deletes a grade from the shard that holds it."""
+        index = self._grade_shard.get(grade_id)
+        if index is None:
+            return None
+        with self._shards[index].lock:
+            grade = self._shards[index].call("remove_grade", grade_id)
+            self._grade_shard.pop(grade_id, None)
+            if grade is not None:
+                self._notify("grades", DELETE, grade)
+        return grade
+
+    def find_grade(self, student_id: str, course_id: str) -> Optional[Grade]:
+        """Fetches the grade of a student in a course, if any."""
+        return self._shard_for(student_id).call("find_grade", student_id, course_id)
+
+    def get_grades_by_student(self, student_id: str) -> List[Grade]:
+        """Fetches all grades of a student from their shard."""
+        return self._shard_for(student_id).call("get_grades_by_student", student_id)
+
+    def get_grades_by_course(self, course_id: str) -> List[Grade]:
+        """Fetches all grades in a course from every shard."""
+        return list(itertools.chain.from_iterable(self._gather("get_grades_by_course", course_id)))
+
+    def iter_grades_by_student(self, start: Optional[str] = None, stop: Optional[str] = None,
+                               after: Optional[Tuple[str, str, str]] = None) -> Iterator[Grade]:
+        """
+        Yields the grades of students with ids in [start, stop) in
+        (student_id, course_id, grade_id) order, merging one sorted stream
+        per shard; each stream fetches GRADE_SCAN_BATCH rows per request.
+        """
+        order = attrgetter("student_id", "course_id", "grade_id")
+
+        def pages(shard: _Shard) -> Iterator[Grade]:
+            position = after
+            while True:
+                rows = shard.call("grades_page", start, stop, position)
+                yield from rows
+                if len(rows) < GRADE_SCAN_BATCH:
+                    return
+                position = order(rows[-1])
+
+        return heapq.merge(*(pages(shard) for shard in self._shards), key=order)
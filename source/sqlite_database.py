@@ -0,0 +1,486 @@
+"""
+SQLite storage backend for the College ERP System.
+Persists the ERD tables to a file while keeping the same API as the
+in-memory Database, so services can run against either one.
+"""
+import dataclasses
+import sqlite3
+from collections.abc import Mapping
+from contextlib import contextmanager
+from datetime import date
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Set, Tuple
+from source.college_erp.database import (CLEAR, DEFAULT_DELETE_POLICIES, DELETE, GRADE_SCAN_BATCH, INSERT,
+                                         UPDATE, Change, Database, Snapshot, _latched)
+from source.college_erp.models.user import User, UserRole
+from source.college_erp.models.admin import Admin
+from source.college_erp.models.professor import Professor
+from source.college_erp.models.student import Student
+from source.college_erp.models.course import Course
+from source.college_erp.models.enrollment import Enrollment, EnrollmentStatus
+from source.college_erp.models.grade import Grade
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    password TEXT NOT NULL,
+    role TEXT NOT NULL,
+    branch TEXT,
+    cgpa REAL,
+    date_of_admission TEXT
+);
+CREATE TABLE IF NOT EXISTS courses (
+    course_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    coordinator_id TEXT NOT NULL,
+    capacity INTEGER,
+    slots TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_courses_coordinator ON courses (coordinator_id);
+CREATE TABLE IF NOT EXISTS enrollments (
+    enrollment_id TEXT PRIMARY KEY,
+    student_id TEXT NOT NULL,
+    course_id TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_enrollments_student_course ON enrollments (student_id, course_id);
+CREATE INDEX IF NOT EXISTS idx_enrollments_course_status ON enrollments (course_id, status);
+CREATE INDEX IF NOT EXISTS idx_enrollments_status ON enrollments (status);
+CREATE TABLE IF NOT EXISTS grades (
+    grade_id TEXT PRIMARY KEY,
+    student_id TEXT NOT NULL,
+    course_id TEXT NOT NULL,
+    grade_value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_grades_student_course ON grades (student_id, course_id);
+CREATE INDEX IF NOT EXISTS idx_grades_course ON grades (course_id);
+"""
+
+USER_COLUMNS = "user_id, name, password, role, branch, cgpa, date_of_admission"
+COURSE_COLUMNS = "course_id, name, coordinator_id, capacity, slots"
+ENROLLMENT_COLUMNS = "enrollment_id, student_id, course_id, status"
+GRADE_COLUMNS = "grade_id, student_id, course_id, grade_value"
+
+def _user_from_row(row: tuple) -> User:
+    """Builds the right User subclass from a users row."""
+    user_id, name, password, role, branch, cgpa, admitted = row
+    role = UserRole(role)
+    if role == UserRole.STUDENT:
+        return Student(user_id, name, password, branch, cgpa, date.fromisoformat(admitted))
+    if role == UserRole.PROFESSOR:
+        return Professor(user_id, name, password, branch)
+    return Admin(user_id, name, password)
+
+def _user_to_row(user: User) -> tuple:
+    """Flattens a User subclass into a users row."""
+    admitted = getattr(user, "date_of_admission", None)
+    return (user.user_id, user.name, user.password, user.role.value,
+            getattr(user, "branch", None), getattr(user, "cgpa", None),
+            admitted.isoformat() if admitted else None)
+
+def _course_from_row(row: tuple) -> Course:
+    course_id, name, coordinator_id, capacity, slots = row
+    return Course(course_id, name, coordinator_id, capacity,
+                  tuple(int(slot) for slot in slots.split(",")) if slots else ())
+
+def _course_to_row(course: Course) -> tuple:
+    # Slots are stored as comma-separated hours of the week
+    return (course.course_id, course.name, course.coordinator_id, course.capacity,
+            ",".join(map(str, course.slots)) or None)
+
+def _enrollment_from_row(row: tuple) -> Enrollment:
+    enrollment_id, student_id, course_id, status = row
+    return Enrollment(enrollment_id, student_id, course_id, EnrollmentStatus(status))
+
+def _grade_from_row(row: tuple) -> Grade:
+    return Grade(*row)
+
+class _Table(Mapping):
+    """
+    Read-only dict-like view over one SQL table, so code that reads
+    `db.users[...]`, `key in db.courses` or `db.grades.values()` keeps working.
+    Rows are returned as fresh model objects; write through the Database methods.
+    """
+    def __init__(self, conn: sqlite3.Connection, table: str, key: str,
+                 columns: str, from_row: Callable[[tuple], Any]):
+        self._conn = conn
+        self._from_row = from_row
+        self._select_one = f"SELECT {columns} FROM {table} WHERE {key} = ?"
+        self._select_all = f"SELECT {columns} FROM {table} ORDER BY rowid"
+        self._select_keys = f"SELECT {key} FROM {table} ORDER BY rowid"
+        self._exists = f"SELECT 1 FROM {table} WHERE {key} = ?"
+        self._count = f"SELECT COUNT(*) FROM {table}"
+
+    def __getitem__(self, key: str):
+        row = self._conn.execute(self._select_one, (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return self._from_row(row)
+
+    def __contains__(self, key: object) -> bool:
+        return self._conn.execute(self._exists, (key,)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return (row[0] for row in self._conn.execute(self._select_keys))
+
+    def __len__(self) -> int:
+        return self._conn.execute(self._count).fetchone()[0]
+
+    def values(self) -> Iterator[Any]:
+        return (self._from_row(row) for row in self._conn.execute(self._select_all))
+
+class SQLiteDatabase(Database):
+    """
+    Database backed by an SQLite file.
+
+    The connection runs in WAL mode. Every statement is a constant,
+    parameterized SQL string, so sqlite3's statement cache reuses the
+    prepared statements. Each mutation commits on its own unless it runs
+    inside `transaction()`, which batches everything into one commit.
+    """
+    def __init__(self, path: str = ":memory:"):
+        super().__init__()
+        self.path = path
+        self._conn = sqlite3.connect(path, isolation_level=None, cached_statements=256,
+                                     check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+        self._tx_depth = 0
+        self._pending_changes: List[Change] = []
+
+        self.users = _Table(self._conn, "users", "user_id", USER_COLUMNS, _user_from_row)
+        self.courses = _Table(self._conn, "courses", "course_id", COURSE_COLUMNS, _course_from_row)
+        self.enrollments = _Table(self._conn, "enrollments", "enrollment_id", ENROLLMENT_COLUMNS,
+                                  _enrollment_from_row)
+        self.grades = _Table(self._conn, "grades", "grade_id", GRADE_COLUMNS, _grade_from_row)
+
+    def _migrate(self):
+        """Adds columns introduced after a database file was first created."""
+        course_columns = {row[1] for row in self._conn.execute("PRAGMA table_info(courses)")}
+        if "capacity" not in course_columns:
+            self._conn.execute("ALTER TABLE courses ADD COLUMN capacity INTEGER")
+        if "slots" not in course_columns:
+            self._conn.execute("ALTER TABLE courses ADD COLUMN slots TEXT")
+
+    def close(self):
+        """Closes the underlying connection."""
+        self._conn.close()
+
+    def for_child_process(self) -> "SQLiteDatabase":
+        """Opens the same file on a new connection; connections must not cross a fork."""
+        if self.path == ":memory:":
+            raise ValueError("an in-memory SQLite database cannot be shared with worker processes")
+        return SQLiteDatabase(self.path)
+
+    def snapshot(self) -> Snapshot:
+        """
+        Opens a read transaction on a second connection. In WAL mode it
+        reads the database as of its first read, and writers go on
+        committing without waiting for it.
+        """
+        if self.path == ":memory:":
+            raise ValueError("an in-memory SQLite database cannot be read from a second connection")
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        conn.execute("BEGIN")
+        conn.execute("SELECT COUNT(*) FROM users").fetchone()  # pins the read snapshot now
+        tables = {
+            "users": _Table(conn, "users", "user_id", USER_COLUMNS, _user_from_row),
+            "courses": _Table(conn, "courses", "course_id", COURSE_COLUMNS, _course_from_row),
+            "enrollments": _Table(conn, "enrollments", "enrollment_id", ENROLLMENT_COLUMNS, _enrollment_from_row),
+            "grades": _Table(conn, "grades", "grade_id", GRADE_COLUMNS, _grade_from_row),
+        }
+        return Snapshot(tables, conn.close)
+
+    @contextmanager
+    def transaction(self) -> Iterator["SQLiteDatabase"]:
+        """
+        Runs the enclosed mutations in a single transaction.
+        Nested blocks join the outermost one; an exception rolls it back.
+        The connection is shared, so other threads' writes wait on the
+        latch until the transaction ends.
+        """
+        with super().transaction():
+            if self._tx_depth == 0:
+                self._conn.execute("BEGIN")
+            self._tx_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._tx_depth -= 1
+                if self._tx_depth == 0:
+                    self._conn.execute("ROLLBACK")
+                    self._pending_changes.clear()
+                raise
+            self._tx_depth -= 1
+            if self._tx_depth == 0:
+                self._conn.execute("COMMIT")
+                changes, self._pending_changes = self._pending_changes, []
+                for change in changes:
+                    super()._notify(change.table, change.action, change.old, change.new)
+
+    def _notify(self, table: str, action: str, old: Any = None, new: Any = None):
+        """Delivers a Change to the listeners, holding it back until COMMIT inside a transaction."""
+        if not self._listeners:
+            return
+        if self._tx_depth:
+            self._pending_changes.append(Change(table, action, old, new))
+        else:
+            super()._notify(table, action, old, new)
+
+    def _fetch(self, sql: str, params: tuple, from_row: Callable[[tuple], Any]) -> List[Any]:
+        return [from_row(row) for row in self._conn.execute(sql, params)]
+
+    def get_referenced_ids(self, child_table: str, column: str) -> Set[str]:
+        """Distinct values of a FK column, answered from the column's index."""
+        if (child_table, column) not in DEFAULT_DELETE_POLICIES:
+            raise KeyError((child_table, column))
+        return {row[0] for row in self._conn.execute(f"SELECT DISTINCT {column} FROM {child_table}")}
+
+    # --- Users and courses ---
+
+    def get_user_by_id(self, user_id: str) -> Optional[User]:
+        """Fetches a user by their ID."""
+        return self.users.get(user_id)
+
+    @_latched
+    def add_user(self, user: User):
+        """Inserts or replaces a user."""
+        old = self.users.get(user.user_id) if self._listeners else None
+        self._conn.execute(f"INSERT OR REPLACE INTO users ({USER_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                           _user_to_row(user))
+        self._notify("users", UPDATE if old else INSERT, old, user)
+
+    @_latched
+    def add_users(self, users: Iterable[User]):
+        """Inserts or replaces many users with one executemany."""
+        if self._listeners:
+            with self.transaction():
+                for user in users:
+                    self.add_user(user)
+            return
+        self._conn.executemany(f"INSERT OR REPLACE INTO users ({USER_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                               (_user_to_row(user) for user in users))
+
+    @_latched
+    def update_user(self, user_id: str, **changes: Any) -> Optional[User]:
+        """Updates fields of a user."""
+        user = self.users.get(user_id)
+        if user is None:
+            return None
+        updated = dataclasses.replace(user, **changes)
+        row = _user_to_row(updated)
+        self._conn.execute("UPDATE users SET name = ?, password = ?, role = ?, branch = ?, cgpa = ?, "
+                           "date_of_admission = ? WHERE user_id = ?", row[1:] + row[:1])
+        self._notify("users", UPDATE, user, updated)
+        return updated
+
+    @_latched
+    def remove_user(self, user_id: str) -> Optional[User]:
+        """Deletes only the user row, returning it. See delete_user for FK handling."""
+        user = self.users.get(user_id)
+        if user is not None:
+            self._conn.execute("DELETE FROM users WHERE user_id = ?", (user_id,))
+            self._notify("users", DELETE, user)
+        return user
+
+    @_latched
+    def add_course(self, course: Course):
+        """Inserts or replaces a course."""
+        old = self.courses.get(course.course_id) if self._listeners else None
+        self._conn.execute(f"INSERT OR REPLACE INTO courses ({COURSE_COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+                           _course_to_row(course))
+        self._notify("courses", UPDATE if old else INSERT, old, course)
+
+    @_latched
+    def add_courses(self, courses: Iterable[Course]):
+        """Inserts or replaces many courses with one executemany."""
+        if self._listeners:
+            with self.transaction():
+                for course in courses:
+                    self.add_course(course)
+            return
+        self._conn.executemany(f"INSERT OR REPLACE INTO courses ({COURSE_COLUMNS}) VALUES (?, ?, ?, ?, ?)",
+                               (_course_to_row(course) for course in courses))
+
+    @_latched
+    def remove_course(self, course_id: str) -> Optional[Course]:
+        """Deletes only the course row, returning it. See delete_course for FK handling."""
+        course = self.courses.get(course_id)
+        if course is not None:
+            self._conn.execute("DELETE FROM courses WHERE course_id = ?", (course_id,))
+            self._notify("courses", DELETE, course)
+        return course
+
+    def get_courses_by_coordinator(self, professor_id: str) -> List[Course]:
+        """Fetches all courses coordinated by a professor."""
+        return self._fetch(f"SELECT {COURSE_COLUMNS} FROM courses WHERE coordinator_id = ? ORDER BY rowid",
+                           (professor_id,), _course_from_row)
+
+    # --- Enrollments ---
+
+    @_latched
+    def add_enrollment(self, enrollment: Enrollment):
+        """Inserts an enrollment."""
+        self._conn.execute(f"INSERT OR REPLACE INTO enrollments ({ENROLLMENT_COLUMNS}) VALUES (?, ?, ?, ?)",
+                           (enrollment.enrollment_id, enrollment.student_id,
+                            enrollment.course_id, enrollment.status.value))
+        self._notify("enrollments", INSERT, new=enrollment)
+
+    @_latched
+    def update_enrollment_status(self, enrollment_id: str, status: EnrollmentStatus) -> Optional[Enrollment]:
+        """Changes the status of an enrollment."""
+        old = self.enrollments.get(enrollment_id) if self._listeners else None
+        cursor = self._conn.execute("UPDATE enrollments SET status = ? WHERE enrollment_id = ?",
+                                    (status.value, enrollment_id))
+        if not cursor.rowcount:
+            return None
+        enrollment = self.enrollments.get(enrollment_id)
+        self._notify("enrollments", UPDATE, old, enrollment)
+        return enrollment
+
+    @_latched
+    def remove_enrollment(self, enrollment_id: str) -> Optional[Enrollment]:
+        """Deletes an enrollment, returning the removed row."""
+        enrollment = self.enrollments.get(enrollment_id)
+        if enrollment is not None:
+            self._conn.execute("DELETE FROM enrollments WHERE enrollment_id = ?", (enrollment_id,))
+            self._notify("enrollments", DELETE, enrollment)
+        return enrollment
+
+    def find_enrollment(self, student_id: str, course_id: str) -> Optional[Enrollment]:
+        """Fetches the enrollment of a student in a course, if any."""
+        row = self._conn.execute(f"SELECT {ENROLLMENT_COLUMNS} FROM enrollments "
+                                 "WHERE student_id = ? AND course_id = ? ORDER BY rowid DESC LIMIT 1",
+                                 (student_id, course_id)).fetchone()
+        return _enrollment_from_row(row) if row else None
+
+    def get_enrollments_by_student(self, student_id: str) -> List[Enrollment]:
+        """Fetches all enrollments of a student."""
+        return self._fetch(f"SELECT {ENROLLMENT_COLUMNS} FROM enrollments WHERE student_id = ? ORDER BY rowid",
+                           (student_id,), _enrollment_from_row)
+
+    def get_enrollments_by_course(self, course_id: str) -> List[Enrollment]:
+        """Fetches all enrollments in a course."""
+        return self._fetch(f"SELECT {ENROLLMENT_COLUMNS} FROM enrollments WHERE course_id = ? ORDER BY rowid",
+                           (course_id,), _enrollment_from_row)
+
+    def get_enrollments_by_status(self, status: EnrollmentStatus) -> List[Enrollment]:
+        """Fetches all enrollments with the given status."""
+        return self._fetch(f"SELECT {ENROLLMENT_COLUMNS} FROM enrollments WHERE status = ? ORDER BY rowid",
+                           (status.value,), _enrollment_from_row)
+
+    def get_enrollments_by_course_and_status(self, course_id: str, status: EnrollmentStatus) -> List[Enrollment]:
+        """Fetches a course's enrollments with the given status, oldest first."""
+        return self._fetch(f"SELECT {ENROLLMENT_COLUMNS} FROM enrollments "
+                           "WHERE course_id = ? AND status = ? ORDER BY rowid",
+                           (course_id, status.value), _enrollment_from_row)
+
+    def page_enrollments_by_course_and_status(self, course_id: str, status: EnrollmentStatus,
+                                              after: Optional[int] = None,
+                                              limit: Optional[int] = None) -> List[Tuple[int, Enrollment]]:
+        """
+        Up to `limit` of a course's enrollments with the given status, oldest
+        first, as (rowid, enrollment) pairs after rowid `after`: one range
+        read on the (course_id, status) index, which ends in the rowid.
+        """
+        rows = self._conn.execute(f"SELECT rowid, {ENROLLMENT_COLUMNS} FROM enrollments "
+                                  "WHERE course_id = ? AND status = ? AND rowid > ? ORDER BY rowid LIMIT ?",
+                                  (course_id, status.value, -1 if after is None else after,
+                                   -1 if limit is None else limit))
+        return [(row[0], _enrollment_from_row(row[1:])) for row in rows]
+
+    def count_enrollments(self, course_id: str, status: EnrollmentStatus) -> int:
+        """Counts a course's enrollments with the given status from the (course_id, status) index."""
+        return self._conn.execute("SELECT COUNT(*) FROM enrollments WHERE course_id = ? AND status = ?",
+                                  (course_id, status.value)).fetchone()[0]
+
+    # --- Grades ---
+
+    @_latched
+    def add_grade(self, grade: Grade):
+        """Inserts a grade."""
+        self._conn.execute(f"INSERT OR REPLACE INTO grades ({GRADE_COLUMNS}) VALUES (?, ?, ?, ?)",
+                           (grade.grade_id, grade.student_id, grade.course_id, grade.grade_value))
+        self._notify("grades", INSERT, new=grade)
+
+    @_latched
+    def update_grade_value(self, grade_id: str, grade_value: str) -> Optional[Grade]:
+        """Changes the value of an existing grade."""
+        old = self.grades.get(grade_id) if self._listeners else None
+        cursor = self._conn.execute("UPDATE grades SET grade_value = ? WHERE grade_id = ?",
+                                    (grade_value, grade_id))
+        if not cursor.rowcount:
+            return None
+        grade = self.grades.get(grade_id)
+        self._notify("grades", UPDATE, old, grade)
+        return grade
+
+    @_latched
+    def remove_grade(self, grade_id: str) -> Optional[Grade]:
+        """Deletes a grade, returning the removed row."""
+        grade = self.grades.get(grade_id)
+        if grade is not None:
+            self._conn.execute("DELETE FROM grades WHERE grade_id = ?", (grade_id,))
+            self._notify("grades", DELETE, grade)
+        return grade
+
+    def find_grade(self, student_id: str, course_id: str) -> Optional[Grade]:
+        """Fetches the grade of a student in a course, if any."""
+        row = self._conn.execute(f"SELECT {GRADE_COLUMNS} FROM grades "
+                                 "WHERE student_id = ? AND course_id = ? ORDER BY rowid DESC LIMIT 1",
+                                 (student_id, course_id)).fetchone()
+        return _grade_from_row(row) if row else None
+
+    def get_grades_by_student(self, student_id: str) -> List[Grade]:
+        """Fetches all grades of a student."""
+        return self._fetch(f"SELECT {GRADE_COLUMNS} FROM grades WHERE student_id = ? ORDER BY rowid",
+                           (student_id,), _grade_from_row)
+
+    def get_grades_by_course(self, course_id: str) -> List[Grade]:
+        """Fetches all grades in a course."""
+        return self._fetch(f"SELECT {GRADE_COLUMNS} FROM grades WHERE course_id = ? ORDER BY rowid",
+                           (course_id,), _grade_from_row)
+
+    def iter_grades_by_student(self, start: Optional[str] = None, stop: Optional[str] = None,
+                               after: Optional[Tuple[str, str, str]] = None) -> Iterator[Grade]:
+        """
+        Yields the grades of students with ids in [start, stop) in
+        (student_id, course_id, grade_id) order, as keyset pages of
+        GRADE_SCAN_BATCH rows walking the (student_id, course_id) index.
+        """
+        bounds, params = [], []
+        if start is not None:
+            bounds.append("student_id >= ?")
+            params.append(start)
+        if stop is not None:
+            bounds.append("student_id < ?")
+            params.append(stop)
+        while True:
+            conditions = bounds + ([] if after is None else ["(student_id, course_id, grade_id) > (?, ?, ?)"])
+            where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+            with self._latch:
+                rows = self._fetch(f"SELECT {GRADE_COLUMNS} FROM grades {where}"
+                                   "ORDER BY student_id, course_id, grade_id LIMIT ?",
+                                   (*params, *(after or ()), GRADE_SCAN_BATCH), _grade_from_row)
+            yield from rows
+            if len(rows) < GRADE_SCAN_BATCH:
+                return
+            last = rows[-1]
+            after = (last.student_id, last.course_id, last.grade_id)
+
+    @_latched
+    def clear_table(self, table: str):
+        """Deletes every row of one table."""
+        if table not in ("users", "courses", "enrollments", "grades"):
+            raise KeyError(table)
+        self._conn.execute(f"DELETE FROM {table}")
+        self._notify(table, CLEAR)
+
+    @_latched
+    def clear_all(self):
+        """Deletes all rows from every table."""
+        with self.transaction():
+            for table in ("users", "courses", "enrollments", "grades"):
+                self.clear_table(table)
@@ -0,0 +1,113 @@
+"""
+Deterministic synthetic data for load tests and benchmarks.
+The same Scale and seed always produce the same rows, so benchmark results
+from different runs and machines are comparable.
+"""
+import random
+from dataclasses import dataclass, field
+from typing import List, Optional, Set, Tuple
+from source.college_erp.database import Database
+from source.college_erp.models.user import User
+from source.college_erp.models.professor import Professor
+from source.college_erp.models.student import Student
+from source.college_erp.models.course import Course
+from source.college_erp.models.enrollment import Enrollment, EnrollmentStatus
+from source.college_erp.models.grade import Grade
+from source.college_erp.passwords import hash_password
+
+BRANCHES = ("CSE", "ECE", "EEE", "ME", "CE", "CHE")
+GRADE_VALUES = ("A+", "A", "B+", "B", "C+", "C", "D", "F")
+# Share of enrollments per status; grades are only given to ENROLLED rows
+STATUS_WEIGHTS = ((EnrollmentStatus.ENROLLED, 0.7), (EnrollmentStatus.PENDING, 0.2),
+                  (EnrollmentStatus.REJECTED, 0.1))
+PASSWORD = "password"
+
+@dataclass(frozen=True)
+class Scale:
+    """Row counts of a synthetic dataset."""
+    students: int
+    professors: int
+    courses: int
+    enrollments: int
+    grades: int
+
+TINY = Scale(students=50, professors=5, courses=10, enrollments=200, grades=100)
+SMALL = Scale(students=5_000, professors=100, courses=250, enrollments=50_000, grades=30_000)
+LARGE = Scale(students=100_000, professors=2_000, courses=5_000, enrollments=1_000_000, grades=1_000_000)
+SCALES = {"tiny": TINY, "small": SMALL, "large": LARGE}
+
+def student_id(i: int) -> str:
+    return f"S{i:07d}"
+
+def professor_id(i: int) -> str:
+    return f"P{i:05d}"
+
+def course_id(i: int) -> str:
+    return f"C{i:05d}"
+
+@dataclass
+class SyntheticData:
+    """Generated rows, in insertion order."""
+    users: List[User] = field(default_factory=list)
+    courses: List[Course] = field(default_factory=list)
+    enrollments: List[Enrollment] = field(default_factory=list)
+    grades: List[Grade] = field(default_factory=list)
+
+def generate(scale: Scale, seed: int = 0, password_hash: Optional[str] = None) -> SyntheticData:
+    """
+    Generates a dataset. Every user shares one password ("password") hashed
+    once, since hashing per user would dominate generation time.
+    Course popularity is skewed (a few courses draw many registrations) and
+    each (student, course) pair is enrolled at most once. Grades cover at
+    most the ENROLLED rows, so `scale.grades` is capped at their number.
+    """
+    rng = random.Random(seed)
+    password = password_hash or hash_password(PASSWORD)
+    data = SyntheticData()
+
+    data.users.extend(Professor(user_id=professor_id(i), name=f"Professor {i}", password=password,
+                                branch=BRANCHES[i % len(BRANCHES)]) for i in range(scale.professors))
+    data.users.extend(Student(user_id=student_id(i), name=f"Student {i}", password=password,
+                              branch=BRANCHES[i % len(BRANCHES)]) for i in range(scale.students))
+    data.courses.extend(Course(course_id=course_id(i), name=f"Course {i}",
+                               coordinator_id=professor_id(rng.randrange(scale.professors)))
+                        for i in range(scale.courses))
+
+    max_pairs = scale.students * scale.courses
+    if scale.enrollments > max_pairs // 2:
+        raise ValueError(f"{scale.enrollments} enrollments is too dense for {max_pairs} (student, course) pairs")
+    statuses = [status for status, _ in STATUS_WEIGHTS]
+    weights = [weight for _, weight in STATUS_WEIGHTS]
+    seen: Set[Tuple[int, int]] = set()
+    while len(data.enrollments) < scale.enrollments:
+        student = rng.randrange(scale.students)
+        if rng.random() < 0.3:
+            # Popular courses: a heavy-tailed pick concentrated on the first course ids
+            course = min(int(rng.paretovariate(1.16)) - 1, scale.courses - 1)
+        else:
+            course = rng.randrange(scale.courses)
+        if (student, course) in seen:
+            continue
+        seen.add((student, course))
+        data.enrollments.append(Enrollment(
+            enrollment_id=f"E{len(data.enrollments):08d}",
+            student_id=student_id(student),
+            course_id=course_id(course),
+            status=rng.choices(statuses, weights)[0]
+        ))
+
+    enrolled = [en for en in data.enrollments if en.status == EnrollmentStatus.ENROLLED]
+    for i, enrollment in enumerate(enrolled[:scale.grades]):
+        data.grades.append(Grade(grade_id=f"G{i:08d}", student_id=enrollment.student_id,
+                                 course_id=enrollment.course_id, grade_value=rng.choice(GRADE_VALUES)))
+    return data
+
+def populate(db: Database, scale: Scale, seed: int = 0, password_hash: Optional[str] = None) -> SyntheticData:
+    """Generates a dataset and loads it into `db` in one transaction; returns the rows."""
+    data = generate(scale, seed, password_hash)
+    with db.transaction():
+        db.add_users(data.users)
+        db.add_courses(data.courses)
+        db.add_enrollments(data.enrollments)
+        db.add_grades(data.grades)
+    return data
@@ -25,25 +25,14 @@ def populated_db() -> Database:
     stud1 = Student(user_id="stud_a", name="Student A", password="stud_pass_a", branch="Branch 1")
     stud2 = Student(user_id="stud_b", name="Student B", password="stud_pass_b", branch="Branch 2")
     
-    mock_db.users = {
-        "admin_user": admin,
-        "prof_a": prof1,
-        "prof_b": prof2,
-        "stud_a": stud1,
-        "stud_b": stud2
-    }
+    for user in (admin, prof1, prof2, stud1, stud2):
+        mock_db.add_user(user)
     
     # Add Courses
     course1 = Course(course_id="SUBJ-X", name="Subject X", coordinator_id="prof_a")
     course2 = Course(course_id="SUBJ-Y", name="Subject Y", coordinator_id="prof_b")
     
-    mock_db.courses = {
-        "SUBJ-X": course1,
-        "SUBJ-Y": course2
-    }
-    
-    # Clear enrollments and grades
-    mock_db.enrollments.clear()
-    mock_db.grades.clear()
+    mock_db.add_course(course1)
+    mock_db.add_course(course2)
     
     return mock_db
\ No newline at end of file
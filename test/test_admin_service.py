@@ -3,7 +3,7 @@ Tests for the admin service.
 """
 import pytest
 from source.college_erp.database import Database
-from source.college_erp.services import admin_service
+from source.college_erp.services import admin_service, student_service
 from source.college_erp.models.user import UserRole
 
 def test_admin_add_student(populated_db: Database):
@@ -103,4 +103,52 @@ def test_admin_remove_course(populated_db: Database):
     assert "SUBJ-X" in populated_db.courses
     result = admin_service.remove_course(populated_db, "SUBJ-X")
     assert result is True
-    assert "SUBJ-X" not in populated_db.courses
\ No newline at end of file
+    assert "SUBJ-X" not in populated_db.courses
+
+def test_admin_bulk_add_users(populated_db: Database):
+    """Test a bulk user import with a per-row error report."""
+    rows = [
+        {"user_id": "stud_c", "name": "Student C", "role": UserRole.STUDENT, "branch": "Branch 1"},
+        {"user_id": "prof_c", "name": "Professor C", "role": "professor", "branch": "Branch 3"},
+        {"user_id": "stud_a", "name": "Existing", "role": UserRole.STUDENT},
+        {"user_id": "stud_c", "name": "Repeated", "role": UserRole.STUDENT},
+        {"name": "No Id", "role": UserRole.STUDENT},
+        {"user_id": "admin_2", "name": "Admin", "role": UserRole.ADMIN},
+        {"user_id": "stud_d", "name": "Student D", "role": "student"},
+    ]
+    report = admin_service.bulk_add_users(populated_db, iter(rows), batch_size=3)
+    assert report.added == 3
+    assert [row for row, _ in report.errors] == [2, 3, 4, 5]
+    assert populated_db.users["prof_c"].role == UserRole.PROFESSOR
+    assert populated_db.users["stud_d"].role == UserRole.STUDENT
+    assert populated_db.users["stud_a"].name == "Student A"
+    assert "admin_2" not in populated_db.users
+
+def test_admin_bulk_add_courses(populated_db: Database):
+    """Test a bulk course import validating ids and coordinators."""
+    rows = [
+        {"course_id": "SUBJ-Z", "name": "Subject Z", "coordinator_id": "prof_a"},
+        {"course_id": "SUBJ-X", "name": "Duplicate", "coordinator_id": "prof_a"},
+        {"course_id": "SUBJ-W", "name": "Subject W", "coordinator_id": "stud_a"},
+        {"course_id": "SUBJ-V", "name": "Subject V", "coordinator_id": "prof_z"},
+        {"course_id": "SUBJ-U", "name": "Subject U", "coordinator_id": "prof_b"},
+    ]
+    report = admin_service.bulk_add_courses(populated_db, rows, batch_size=2)
+    assert report.added == 2
+    assert [row for row, _ in report.errors] == [1, 2, 3]
+    assert "SUBJ-Z" in populated_db.courses
+    assert "SUBJ-U" in populated_db.courses
+    assert [c.course_id for c in populated_db.get_courses_by_coordinator("prof_a")] == ["SUBJ-X", "SUBJ-Z"]
+
+def test_admin_remove_course_cascades(populated_db: Database):
+    """Test that removing a course also removes its enrollments."""
+    student_service.register_course(populated_db, "stud_a", "SUBJ-X")
+    assert admin_service.remove_course(populated_db, "SUBJ-X") is True
+    assert student_service.view_registered_courses(populated_db, "stud_a") == []
+
+def test_admin_remove_coordinating_professor(populated_db: Database):
+    """Test failure when removing a professor who still coordinates a course."""
+    assert admin_service.remove_user(populated_db, "prof_a") is False
+    assert "prof_a" in populated_db.users
+    admin_service.remove_course(populated_db, "SUBJ-X")
+    assert admin_service.remove_user(populated_db, "prof_a") is True
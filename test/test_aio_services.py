@@ -0,0 +1,75 @@
+"""
+Tests for the async service layer over the thread-pool database adapter.
+"""
+import asyncio
+import pytest
+from source.college_erp.async_database import ThreadPoolDatabase
+from source.college_erp.database import Database
+from source.college_erp.services import student_service
+from source.college_erp.services.aio import admin_service, professor_service, seat_service
+from source.college_erp.services.aio import student_service as aio_student_service
+from source.college_erp.models.enrollment import EnrollmentStatus
+from source.college_erp.models.student import Student
+from source.college_erp.models.course import Course
+
+@pytest.fixture
+def adb(populated_db: Database) -> ThreadPoolDatabase:
+    """Async adapter over the populated in-memory database."""
+    adapter = ThreadPoolDatabase(populated_db, max_workers=4)
+    yield adapter
+    adapter.close()
+
+def test_aio_registration_flow(adb: ThreadPoolDatabase):
+    """Register, approve, grade and view through the async API."""
+    async def flow():
+        enrollment = await aio_student_service.register_course(adb, "stud_a", "SUBJ-X")
+        assert await aio_student_service.register_course(adb, "stud_a", "SUBJ-X") is None
+        pending = await professor_service.view_pending_registrations(adb, "prof_a")
+        assert [en.enrollment_id for en in pending] == [enrollment.enrollment_id]
+        approved = await professor_service.approve_registration(adb, enrollment.enrollment_id)
+        assert approved.status == EnrollmentStatus.ENROLLED
+        assert await professor_service.upload_grade(adb, "prof_b", "stud_a", "SUBJ-X", "A") is None
+        await professor_service.upload_grade(adb, "prof_a", "stud_a", "SUBJ-X", "A")
+        grades = await aio_student_service.view_grades(adb, "stud_a")
+        students = await professor_service.view_enrolled_students(adb, "prof_a", "SUBJ-X")
+        return grades, students
+
+    grades, students = asyncio.run(flow())
+    assert [g.grade_value for g in grades] == ["A"]
+    assert [s.user_id for s in students] == ["stud_a"]
+
+def test_aio_admin_operations(adb: ThreadPoolDatabase):
+    """Admin adds and removes users and courses asynchronously."""
+    async def flow():
+        user = await admin_service.add_user(adb, {"user_id": "s9", "name": "S", "password": "pw", "role": "student"})
+        course = await admin_service.add_course(adb, {"course_id": "C9", "coordinator_id": "prof_a", "capacity": 1})
+        await aio_student_service.register_course(adb, "s9", "C9")
+        waiting = await aio_student_service.register_course(adb, "stud_a", "C9")
+        assert waiting.status == EnrollmentStatus.WAITLISTED
+        assert await admin_service.remove_user(adb, "s9")
+        assert await admin_service.remove_user(adb, "admin_user") is False
+        return user, course, await adb.get_enrollment_by_id(waiting.enrollment_id)
+
+    user, course, promoted = asyncio.run(flow())
+    assert user.password != "pw"
+    assert course.capacity == 1
+    assert promoted.status == EnrollmentStatus.PENDING
+
+def test_aio_concurrent_registration_shares_sync_locks(adb: ThreadPoolDatabase):
+    """Async and sync registrations for one course together never overbook it."""
+    db = adb.db
+    db.add_course(Course(course_id="HOT", name="Hot", coordinator_id="prof_a", capacity=5))
+    students = [f"s{i:02d}" for i in range(40)]
+    db.add_users(Student(user_id=sid, name=sid, password="pw", branch="B") for sid in students)
+
+    async def storm():
+        loop = asyncio.get_running_loop()
+        sync_calls = [loop.run_in_executor(None, student_service.register_course, db, sid, "HOT")
+                      for sid in students]
+        async_calls = [aio_student_service.register_course(adb, sid, "HOT") for sid in students]
+        return await asyncio.gather(*sync_calls, *async_calls)
+
+    results = asyncio.run(storm())
+    assert sum(result is not None for result in results) == len(students)
+    assert db.count_enrollments("HOT", EnrollmentStatus.PENDING) == 5
+    assert len(asyncio.run(seat_service.view_waitlist(adb, "HOT"))) == len(students) - 5
@@ -0,0 +1,89 @@
+"""
+Tests for the course analytics engine.
+"""
+import pytest
+from source.college_erp.database import Database
+from source.college_erp.models.course import Course
+from source.college_erp.models.enrollment import Enrollment, EnrollmentStatus
+from source.college_erp.models.grade import Grade
+from source.college_erp.services import professor_service, student_service
+from source.college_erp.services.analytics_service import AnalyticsEngine
+
+@pytest.fixture
+def graded_db(populated_db: Database) -> Database:
+    """stud_a (Branch 1) and stud_b (Branch 2) graded in SUBJ-X (prof_a) and SUBJ-Y (prof_b)."""
+    populated_db.add_enrollments([
+        Enrollment("e1", "stud_a", "SUBJ-X", EnrollmentStatus.ENROLLED),
+        Enrollment("e2", "stud_b", "SUBJ-X", EnrollmentStatus.ENROLLED),
+        Enrollment("e3", "stud_a", "SUBJ-Y", EnrollmentStatus.ENROLLED),
+        Enrollment("e4", "stud_b", "SUBJ-Y", EnrollmentStatus.REJECTED)])
+    populated_db.add_grades([
+        Grade("g1", "stud_a", "SUBJ-X", "A"),
+        Grade("g2", "stud_b", "SUBJ-X", "F"),
+        Grade("g3", "stud_a", "SUBJ-Y", "A")])
+    return populated_db
+
+def test_group_by_course_coordinator_and_branch(graded_db: Database):
+    """One engine answers the same aggregates grouped three ways."""
+    engine = AnalyticsEngine(graded_db)
+    assert engine.grade_histograms() == {"SUBJ-X": {"A": 1, "F": 1}, "SUBJ-Y": {"A": 1}}
+    assert engine.grade_histograms(by="branch") == {"Branch 1": {"A": 2}, "Branch 2": {"F": 1}}
+    assert engine.pass_rates() == {"SUBJ-X": 0.5, "SUBJ-Y": 1.0}
+    assert engine.pass_rates(by="coordinator") == {"prof_a": 0.5, "prof_b": 1.0}
+    assert engine.status_counts(by="coordinator") == {
+        "prof_a": {EnrollmentStatus.ENROLLED: 2},
+        "prof_b": {EnrollmentStatus.ENROLLED: 1, EnrollmentStatus.REJECTED: 1}}
+    assert engine.status_counts(by="branch")["Branch 2"] == {EnrollmentStatus.ENROLLED: 1,
+                                                             EnrollmentStatus.REJECTED: 1}
+    with pytest.raises(ValueError):
+        engine.status_counts(by="semester")
+
+def test_attached_engine_follows_changes(graded_db: Database):
+    """Updates, deletes, new courses and clears reach the columns without a rebuild."""
+    engine = AnalyticsEngine(graded_db)
+    engine.attach()
+    graded_db.update_grade_value("g2", "B")
+    graded_db.remove_grade("g3")
+    graded_db.add_course(Course("SUBJ-Z", "Subject Z", "prof_b"))
+    graded_db.add_grade(Grade("g4", "stud_b", "SUBJ-Z", "C"))
+    graded_db.add_course(Course("SUBJ-X", "Subject X", "prof_b"))  # handed over to prof_b
+    assert engine.grade_histograms() == {"SUBJ-X": {"A": 1, "B": 1}, "SUBJ-Z": {"C": 1}}
+    assert engine.grade_histograms(by="coordinator") == {"prof_b": {"A": 1, "B": 1, "C": 1}}
+
+    graded_db.delete_user("stud_b")
+    assert engine.status_counts() == {"SUBJ-X": {EnrollmentStatus.ENROLLED: 1},
+                                      "SUBJ-Y": {EnrollmentStatus.ENROLLED: 1}}
+    graded_db.clear_table("grades")
+    assert engine.grade_histograms() == {}
+
+    engine.detach()
+    graded_db.add_grade(Grade("g5", "stud_a", "SUBJ-X", "A"))
+    assert engine.grade_histograms() == {}
+    engine.refresh()
+    assert engine.grade_histograms() == {"SUBJ-X": {"A": 1}}
+
+def test_approval_latency_per_coordinator(populated_db: Database):
+    """Time from PENDING to a decision is recorded for the course coordinator."""
+    engine = AnalyticsEngine(populated_db)
+    engine.attach()
+    first = student_service.register_course(populated_db, "stud_a", "SUBJ-X")
+    second = student_service.register_course(populated_db, "stud_b", "SUBJ-X")
+    student_service.register_course(populated_db, "stud_a", "SUBJ-Y")
+    professor_service.approve_registration(populated_db, first.enrollment_id)
+    professor_service.reject_registration(populated_db, "prof_a", second.enrollment_id)
+
+    latency = engine.approval_latency()
+    assert list(latency) == ["prof_a"]
+    assert latency["prof_a"]["decisions"] == 2
+    assert 0 < latency["prof_a"]["p50"] <= latency["prof_a"]["max"]
+
+def test_unjoined_rows_are_left_out(graded_db: Database):
+    """Rows whose course lost its coordinator are counted by course but not by coordinator."""
+    engine = AnalyticsEngine(graded_db)
+    engine.attach()
+    graded_db.remove_grade("g1")  # frees a slot
+    graded_db.clear_table("courses")
+    assert engine.grade_histograms() == {"SUBJ-X": {"F": 1}, "SUBJ-Y": {"A": 1}}
+    assert engine.grade_histograms(by="coordinator") == {}
+    assert engine.grade_histograms(by="branch") == {"Branch 1": {"A": 1}, "Branch 2": {"F": 1}}
+    engine.detach()
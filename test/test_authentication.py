@@ -1,6 +1,7 @@
 """
 Pytest configuration file for fixtures.
 """
+import asyncio
 import pytest
 from datetime import date
 from source.college_erp.database import Database, mock_db
@@ -8,6 +9,10 @@ from source.college_erp.models.admin import Admin
 from source.college_erp.models.professor import Professor
 from source.college_erp.models.student import Student
 from source.college_erp.models.course import Course
+from source.college_erp.models.user import UserRole
+from source.college_erp.passwords import (PasswordHasher, get_default_hasher, is_password_hash,
+                                          set_default_hasher, verify_password)
+from source.college_erp.services import admin_service, authentication
 
 @pytest.fixture(scope="function")
 def populated_db() -> Database:
@@ -25,25 +30,84 @@ def populated_db() -> Database:
     stud1 = Student(user_id="stud_a", name="Student A", password="stud_pass_a", branch="Branch 1")
     stud2 = Student(user_id="stud_b", name="Student B", password="stud_pass_b", branch="Branch 2")
     
-    mock_db.users = {
-        "admin_user": admin,
-        "prof_a": prof1,
-        "prof_b": prof2,
-        "stud_a": stud1,
-        "stud_b": stud2
-    }
+    for user in (admin, prof1, prof2, stud1, stud2):
+        mock_db.add_user(user)
     
     # Add Courses
     course1 = Course(course_id="SUBJ-X", name="Subject X", coordinator_id="prof_a")
     course2 = Course(course_id="SUBJ-Y", name="Subject Y", coordinator_id="prof_b")
     
-    mock_db.courses = {
-        "SUBJ-X": course1,
-        "SUBJ-Y": course2
-    }
+    mock_db.add_course(course1)
+    mock_db.add_course(course2)
     
-    # Clear enrollments and grades
-    mock_db.enrollments.clear()
-    mock_db.grades.clear()
-    
-    return mock_db
\ No newline at end of file
+    return mock_db
+
+@pytest.fixture
+def fast_hasher():
+    """Fixture installing cheap hashing parameters for the duration of a test."""
+    previous = get_default_hasher()
+    hasher = PasswordHasher(algorithm="pbkdf2_sha256", iterations=1_000)
+    set_default_hasher(hasher)
+    yield hasher
+    set_default_hasher(previous)
+
+def test_password_hasher_round_trip():
+    """Test hashing and verifying with both supported algorithms."""
+    for hasher in (PasswordHasher(n=2 ** 10), PasswordHasher(algorithm="pbkdf2_sha256", iterations=1_000)):
+        stored = hasher.hash("secret")
+        assert is_password_hash(stored)
+        assert verify_password("secret", stored)
+        assert not verify_password("wrong", stored)
+        assert not hasher.needs_rehash(stored)
+    assert PasswordHasher(n=2 ** 11).needs_rehash(PasswordHasher(n=2 ** 10).hash("secret"))
+
+def test_login_success_and_failure(populated_db: Database, fast_hasher):
+    """Test logging in with correct and incorrect credentials."""
+    user = authentication.login(populated_db, "stud_a", "stud_pass_a")
+    assert user is not None
+    assert user.user_id == "stud_a"
+    assert authentication.login(populated_db, "stud_a", "wrong") is None
+    assert authentication.login(populated_db, "stud_z", "stud_pass_a") is None
+
+def test_login_rehashes_outdated_credentials(populated_db: Database, fast_hasher):
+    """Test that plaintext and outdated hashes are upgraded on successful login."""
+    authentication.login(populated_db, "prof_a", "prof_pass_a")
+    stored = populated_db.users["prof_a"].password
+    assert is_password_hash(stored)
+    assert not fast_hasher.needs_rehash(stored)
+
+    set_default_hasher(PasswordHasher(algorithm="pbkdf2_sha256", iterations=2_000))
+    assert authentication.login(populated_db, "prof_a", "prof_pass_a") is not None
+    assert populated_db.users["prof_a"].password.startswith("pbkdf2_sha256$2000$")
+
+def test_admin_added_user_is_stored_hashed(populated_db: Database, fast_hasher):
+    """Test that new users never have their password stored in plaintext."""
+    admin_service.add_user(populated_db, {"user_id": "stud_c", "password": "pw", "role": UserRole.STUDENT})
+    assert is_password_hash(populated_db.users["stud_c"].password)
+    assert authentication.login(populated_db, "stud_c", "pw") is not None
+
+def test_login_async(populated_db: Database, fast_hasher):
+    """Test the thread-pool login variant under concurrent calls."""
+    async def storm():
+        attempts = [authentication.login_async(populated_db, "stud_b", "stud_pass_b") for _ in range(20)]
+        attempts.append(authentication.login_async(populated_db, "stud_b", "wrong"))
+        return await asyncio.gather(*attempts)
+
+    results = asyncio.run(storm())
+    assert all(user.user_id == "stud_b" for user in results[:-1])
+    assert results[-1] is None
+
+def test_hash_shaped_passwords_are_hashed(populated_db: Database, fast_hasher):
+    """A password that looks like a hash is still hashed; a precomputed hash needs password_hash."""
+    malformed = "scrypt$1$2$3$4$5"
+    assert not verify_password("anything", malformed)
+    admin_service.add_user(populated_db, {"user_id": "stud_c", "password": malformed, "role": UserRole.STUDENT})
+    assert populated_db.users["stud_c"].password != malformed
+    assert authentication.login(populated_db, "stud_c", malformed) is not None
+
+    stored = fast_hasher.hash("pw")
+    admin_service.add_user(populated_db, {"user_id": "stud_d", "password_hash": stored, "role": UserRole.STUDENT})
+    assert populated_db.users["stud_d"].password == stored
+    assert admin_service.add_user(populated_db, {"user_id": "stud_e", "password_hash": "pw", "role": UserRole.STUDENT}) is None
+    report = admin_service.bulk_add_users(populated_db, [{"user_id": "stud_e", "password_hash": "pw", "role": "student"}])
+    assert report.added == 0 and report.errors == [(0, "password_hash is not an encoded password hash")]
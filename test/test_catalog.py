@@ -0,0 +1,74 @@
+"""
+Tests for catalog snapshots and lazily attached tables.
+"""
+import pytest
+from source.college_erp.catalog import CatalogTable, attach_catalog, write_catalog
+from source.college_erp.database import Database
+from source.college_erp.journal import Journal
+from source.college_erp.models.course import Course
+from source.college_erp.models.student import Student
+from source.college_erp.services import authentication, professor_service, student_service
+
+@pytest.fixture
+def attached_db(populated_db: Database, tmp_path) -> Database:
+    path = str(tmp_path / "catalog.bin")
+    populated_db.add_course(Course("MATH", "Math", "prof_a", capacity=30, slots=(9, 57)))
+    assert write_catalog(populated_db, path, fsync=False) == 8
+    db = Database()
+    assert attach_catalog(db, path) == 8
+    return db
+
+def test_rows_are_decoded_on_first_access(attached_db: Database, populated_db: Database):
+    """Attaching decodes nothing; lookups decode only the rows they touch."""
+    assert isinstance(attached_db.users, CatalogTable)
+    assert attached_db.users.decoded == attached_db.courses.decoded == 0
+    assert authentication.login(attached_db, "stud_a", "stud_pass_a").name == "Student A"
+    assert attached_db.users.decoded == 1
+    assert attached_db.courses["MATH"] == populated_db.courses["MATH"]
+    assert attached_db.courses["MATH"].slot_mask == populated_db.courses["MATH"].slot_mask
+    assert "SUBJ-Y" in attached_db.courses and attached_db.courses.decoded == 1
+    assert list(attached_db.users) == list(populated_db.users)
+    assert attached_db.users["prof_b"] == populated_db.users["prof_b"]
+    assert list(attached_db.courses) == list(populated_db.courses)
+
+def test_writes_and_indexes_on_attached_tables(attached_db: Database):
+    """Services read and write attached tables like plain ones, without touching the file."""
+    assert [course.course_id for course in attached_db.get_courses_by_coordinator("prof_a")] == ["SUBJ-X", "MATH"]
+    enrollment = student_service.register_course(attached_db, "stud_a", "SUBJ-X")
+    assert professor_service.view_pending_registrations(attached_db, "prof_a")[0].enrollment_id == \
+        enrollment.enrollment_id
+
+    attached_db.add_user(Student(user_id="stud_c", name="Student C", password="pw", branch="B"))
+    attached_db.update_user("stud_b", name="Renamed")
+    assert attached_db.delete_user("stud_a").user_id == "stud_a"
+    assert "stud_a" not in attached_db.users and attached_db.users.get("stud_a") is None
+    assert len(attached_db.users) == 5
+    assert list(attached_db.users)[-1] == "stud_c"
+    assert attached_db.users["stud_b"].name == "Renamed"
+    with pytest.raises(KeyError):
+        del attached_db.users["stud_a"]
+
+    attached_db.clear_all()
+    assert len(attached_db.users) == 0 and attached_db.users.get("prof_a") is None
+
+def test_attach_rejects_bad_targets(attached_db: Database, tmp_path):
+    path = str(tmp_path / "catalog.bin")
+    with pytest.raises(ValueError):
+        attach_catalog(attached_db, path)
+    with pytest.raises(ValueError):
+        attach_catalog(Database(), __file__)
+    corrupt = bytearray(open(path, "rb").read())
+    corrupt[20] ^= 0xFF
+    (tmp_path / "corrupt.bin").write_bytes(bytes(corrupt))
+    with pytest.raises(ValueError):
+        attach_catalog(Database(), str(tmp_path / "corrupt.bin"))
+
+def test_journal_on_attached_database(attached_db: Database, tmp_path):
+    """Journaling an attached database snapshots its catalog rows like any others."""
+    journal = Journal.open(attached_db, str(tmp_path / "journal"), fsync=False)
+    attached_db.update_user("prof_b", name="Professor Bee")
+    journal.close()
+    recovered = Database()
+    Journal.open(recovered, str(tmp_path / "journal"), fsync=False).close()
+    assert dict(recovered.users) == dict(attached_db.users)
+    assert recovered.users["prof_b"].name == "Professor Bee"
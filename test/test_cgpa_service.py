@@ -0,0 +1,67 @@
+"""
+Tests for the CGPA service.
+"""
+import pytest
+from source.college_erp.database import Database
+from source.college_erp.models.grade import Grade
+from source.college_erp.services import professor_service, student_service
+from source.college_erp.services.cgpa_service import CgpaEngine
+
+@pytest.fixture
+def graded_db(populated_db: Database) -> Database:
+    """Fixture with stud_a graded in both courses and stud_b in one."""
+    populated_db.add_grade(Grade("g1", "stud_a", "SUBJ-X", "A+"))
+    populated_db.add_grade(Grade("g2", "stud_a", "SUBJ-Y", "B"))
+    populated_db.add_grade(Grade("g3", "stud_b", "SUBJ-Y", "C"))
+    return populated_db
+
+def test_compute_all_with_credits(graded_db: Database):
+    """Test credit-weighted CGPA over the default 10-point scale."""
+    engine = CgpaEngine(graded_db, course_credits={"SUBJ-X": 4.0, "SUBJ-Y": 2.0})
+    cgpas = engine.compute_all()
+    assert cgpas["stud_a"] == pytest.approx((10.0 * 4 + 7.0 * 2) / 6)
+    assert cgpas["stud_b"] == pytest.approx(5.0)
+    assert engine.compute_for("stud_a") == pytest.approx(cgpas["stud_a"])
+
+def test_custom_scale_skips_unknown_letters(graded_db: Database):
+    """Test a custom grade scale; letters outside it do not count."""
+    engine = CgpaEngine(graded_db, grade_points={"A+": 4.0, "B": 3.0})
+    assert engine.compute_all() == {"stud_a": pytest.approx(3.5)}
+
+def test_recompute_all_stores_cgpa(graded_db: Database):
+    """Test that a full recompute writes CGPAs to the students."""
+    engine = CgpaEngine(graded_db)
+    assert engine.recompute_all() == 2
+    assert graded_db.get_user_by_id("stud_a").cgpa == pytest.approx(8.5)
+    assert engine.recompute_all() == 0
+
+def test_incremental_mode_follows_upload_grade(populated_db: Database):
+    """Test that an attached engine updates CGPA when a grade is uploaded or changed."""
+    engine = CgpaEngine(populated_db)
+    engine.attach()
+    enrollment = student_service.register_course(populated_db, "stud_a", "SUBJ-X")
+    professor_service.approve_registration(populated_db, enrollment.enrollment_id)
+
+    professor_service.upload_grade(populated_db, "prof_a", "stud_a", "SUBJ-X", "B+")
+    assert populated_db.get_user_by_id("stud_a").cgpa == pytest.approx(8.0)
+    professor_service.upload_grade(populated_db, "prof_a", "stud_a", "SUBJ-X", "A")
+    assert populated_db.get_user_by_id("stud_a").cgpa == pytest.approx(9.0)
+    assert populated_db.get_user_by_id("stud_b").cgpa == 0.0
+
+    engine.detach()
+    professor_service.upload_grade(populated_db, "prof_a", "stud_a", "SUBJ-X", "F")
+    assert populated_db.get_user_by_id("stud_a").cgpa == pytest.approx(9.0)
+
+def test_attached_columns_match_a_fresh_read(graded_db: Database):
+    """The columns an attached engine keeps give the same CGPAs as reading the grades again."""
+    engine = CgpaEngine(graded_db, course_credits={"SUBJ-X": 4.0})
+    engine.attach()
+    graded_db.update_grade_value("g1", "I")  # no longer counted
+    graded_db.remove_grade("g3")
+    graded_db.add_grade(Grade("g4", "stud_b", "SUBJ-X", "B+"))
+    assert engine.compute_all() == CgpaEngine(graded_db, course_credits={"SUBJ-X": 4.0}).compute_all()
+    assert engine.compute_all() == {"stud_a": pytest.approx(7.0), "stud_b": pytest.approx(8.0)}
+    graded_db.clear_table("grades")
+    assert engine.compute_all() == {}
+    assert graded_db.get_user_by_id("stud_a").cgpa == 0.0
+    engine.detach()
@@ -0,0 +1,147 @@
+"""
+Tests for the mock database and its secondary indexes.
+"""
+import pytest
+from source.college_erp.database import DELETE, INSERT, UPDATE, Database, DeletePolicy, IntegrityError
+from source.college_erp.models.enrollment import Enrollment, EnrollmentStatus
+from source.college_erp.models.grade import Grade
+from source.college_erp.models.student import Student
+
+def test_enrollment_indexes_follow_inserts_and_updates(populated_db: Database):
+    """Test that enrollment lookups reflect inserts and status changes."""
+    populated_db.add_enrollment(Enrollment("e1", "stud_a", "SUBJ-X"))
+    populated_db.add_enrollment(Enrollment("e2", "stud_a", "SUBJ-Y"))
+    populated_db.add_enrollment(Enrollment("e3", "stud_b", "SUBJ-X"))
+
+    assert populated_db.find_enrollment("stud_a", "SUBJ-Y").enrollment_id == "e2"
+    assert populated_db.find_enrollment("stud_b", "SUBJ-Y") is None
+    assert [e.enrollment_id for e in populated_db.get_enrollments_by_student("stud_a")] == ["e1", "e2"]
+    assert [e.enrollment_id for e in populated_db.get_enrollments_by_course("SUBJ-X")] == ["e1", "e3"]
+    assert len(populated_db.get_enrollments_by_status(EnrollmentStatus.PENDING)) == 3
+
+    populated_db.update_enrollment_status("e1", EnrollmentStatus.ENROLLED)
+    assert [e.enrollment_id for e in populated_db.get_enrollments_by_status(EnrollmentStatus.ENROLLED)] == ["e1"]
+    assert len(populated_db.get_enrollments_by_status(EnrollmentStatus.PENDING)) == 2
+
+def test_enrollment_indexes_follow_deletes(populated_db: Database):
+    """Test that a deleted enrollment disappears from every index."""
+    populated_db.add_enrollment(Enrollment("e1", "stud_a", "SUBJ-X"))
+    removed = populated_db.remove_enrollment("e1")
+    assert removed.enrollment_id == "e1"
+    assert populated_db.find_enrollment("stud_a", "SUBJ-X") is None
+    assert populated_db.get_enrollments_by_student("stud_a") == []
+    assert populated_db.get_enrollments_by_course("SUBJ-X") == []
+    assert populated_db.get_enrollments_by_status(EnrollmentStatus.PENDING) == []
+    assert populated_db.remove_enrollment("e1") is None
+
+def test_grade_indexes(populated_db: Database):
+    """Test grade lookups by pair, student and course."""
+    populated_db.add_grade(Grade("g1", "stud_a", "SUBJ-X", "A"))
+    populated_db.add_grade(Grade("g2", "stud_b", "SUBJ-X", "B"))
+
+    assert populated_db.find_grade("stud_a", "SUBJ-X").grade_id == "g1"
+    assert [g.grade_id for g in populated_db.get_grades_by_course("SUBJ-X")] == ["g1", "g2"]
+
+    populated_db.update_grade_value("g1", "A+")
+    assert populated_db.get_grades_by_student("stud_a")[0].grade_value == "A+"
+
+    populated_db.remove_grade("g2")
+    assert populated_db.find_grade("stud_b", "SUBJ-X") is None
+    assert populated_db.get_grades_by_student("stud_b") == []
+
+def test_clear_all_resets_indexes(populated_db: Database):
+    """Test that clearing the database also clears the indexes."""
+    populated_db.add_enrollment(Enrollment("e1", "stud_a", "SUBJ-X"))
+    populated_db.add_grade(Grade("g1", "stud_a", "SUBJ-X", "A"))
+    populated_db.clear_all()
+    assert populated_db.find_enrollment("stud_a", "SUBJ-X") is None
+    assert populated_db.find_grade("stud_a", "SUBJ-X") is None
+    assert populated_db.get_enrollments_by_status(EnrollmentStatus.PENDING) == []
+
+def test_coordinator_and_pending_indexes(populated_db: Database):
+    """Test the coordinator -> courses index and the per-course PENDING queue."""
+    assert [c.course_id for c in populated_db.get_courses_by_coordinator("prof_a")] == ["SUBJ-X"]
+    populated_db.add_enrollment(Enrollment("e1", "stud_a", "SUBJ-X"))
+    populated_db.add_enrollment(Enrollment("e2", "stud_b", "SUBJ-X"))
+    assert [e.enrollment_id for e in populated_db.get_pending_enrollments("SUBJ-X")] == ["e1", "e2"]
+
+    populated_db.update_enrollment_status("e1", EnrollmentStatus.ENROLLED)
+    assert [e.enrollment_id for e in populated_db.get_pending_enrollments("SUBJ-X")] == ["e2"]
+
+    populated_db.remove_course("SUBJ-X")
+    assert populated_db.get_courses_by_coordinator("prof_a") == []
+
+def test_get_user_by_id_returns_read_only_user(populated_db: Database):
+    """Test that fetched users cannot be modified."""
+    user = populated_db.get_user_by_id("stud_a")
+    assert isinstance(user, Student)
+    assert user.user_id == "stud_a"
+    assert user.check_password("stud_pass_a")
+    assert user == populated_db.users["stud_a"]
+    with pytest.raises(AttributeError):
+        user.name = "Changed"
+    assert populated_db.users["stud_a"].name == "Student A"
+
+def test_update_user_is_copy_on_write(populated_db: Database):
+    """Test that an earlier fetched user keeps the old values after an update."""
+    before = populated_db.get_user_by_id("stud_a")
+    populated_db.update_user("stud_a", cgpa=9.1)
+    after = populated_db.get_user_by_id("stud_a")
+    assert before.cgpa == 0.0
+    assert after.cgpa == 9.1
+    assert populated_db.update_user("stud_z", cgpa=1.0) is None
+
+def test_delete_user_cascades_to_enrollments_and_grades(populated_db: Database):
+    """Test that deleting a student removes their enrollments and grades."""
+    populated_db.add_enrollment(Enrollment("e1", "stud_a", "SUBJ-X", EnrollmentStatus.ENROLLED))
+    populated_db.add_enrollment(Enrollment("e2", "stud_b", "SUBJ-X"))
+    populated_db.add_grade(Grade("g1", "stud_a", "SUBJ-X", "A"))
+
+    populated_db.delete_user("stud_a")
+    assert "stud_a" not in populated_db.users
+    assert list(populated_db.enrollments) == ["e2"]
+    assert populated_db.grades == {}
+    assert populated_db.get_enrollments_by_student("stud_a") == []
+
+def test_delete_user_restricted_by_coordinated_courses(populated_db: Database):
+    """Test the RESTRICT policy on courses.coordinator_id, and switching it to CASCADE."""
+    populated_db.add_enrollment(Enrollment("e1", "stud_a", "SUBJ-X"))
+    with pytest.raises(IntegrityError):
+        populated_db.delete_user("prof_a")
+    assert "prof_a" in populated_db.users
+    assert "e1" in populated_db.enrollments
+
+    populated_db.delete_policies[("courses", "coordinator_id")] = DeletePolicy.CASCADE
+    populated_db.delete_user("prof_a")
+    assert "SUBJ-X" not in populated_db.courses
+    assert populated_db.enrollments == {}
+
+def test_purge_orphans(populated_db: Database):
+    """Test that rows orphaned by raw removes are purged in one pass."""
+    populated_db.add_enrollment(Enrollment("e1", "stud_a", "SUBJ-X"))
+    populated_db.add_enrollment(Enrollment("e2", "stud_b", "SUBJ-Y"))
+    populated_db.add_grade(Grade("g1", "stud_a", "SUBJ-Y", "B"))
+    populated_db.remove_user("stud_a")
+    populated_db.remove_course("SUBJ-X")
+
+    assert populated_db.purge_orphans() == {"enrollments": 1, "grades": 1}
+    assert list(populated_db.enrollments) == ["e2"]
+    assert populated_db.grades == {}
+    assert populated_db.purge_orphans() == {}
+
+def test_change_listeners(populated_db: Database):
+    """Test that mutations are reported to listeners with old and new rows."""
+    changes = []
+    populated_db.add_listener(changes.append)
+    populated_db.add_enrollment(Enrollment("e1", "stud_a", "SUBJ-X"))
+    populated_db.update_enrollment_status("e1", EnrollmentStatus.ENROLLED)
+    populated_db.remove_enrollment("e1")
+    populated_db.update_user("stud_a", cgpa=7.0)
+    populated_db.remove_listener(changes.append)
+    populated_db.add_grade(Grade("g1", "stud_a", "SUBJ-X", "A"))
+
+    assert [(c.table, c.action) for c in changes] == [
+        ("enrollments", INSERT), ("enrollments", UPDATE), ("enrollments", DELETE), ("users", UPDATE)]
+    assert changes[1].old.status == EnrollmentStatus.PENDING
+    assert changes[1].new.status == EnrollmentStatus.ENROLLED
+    assert changes[3].new.cgpa == 7.0
@@ -0,0 +1,110 @@
+"""
+Tests for the change-data-capture event bus.
+"""
+import threading
+import time
+import pytest
+from source.college_erp.database import Database
+from source.college_erp.events import DROP, EventBus, EventsLost
+from source.college_erp.models.grade import Grade
+from source.college_erp.services import admin_service, professor_service, student_service
+
+@pytest.fixture
+def bus(populated_db: Database) -> EventBus:
+    event_bus = EventBus(populated_db, capacity=8, block_timeout=0.05)
+    yield event_bus
+    event_bus.close()
+
+def test_service_mutations_become_typed_events(bus: EventBus, populated_db: Database):
+    """Each service write publishes one typed, sequence-numbered event."""
+    subscription = bus.subscribe()
+    enrollment = student_service.register_course(populated_db, "stud_a", "SUBJ-X")
+    professor_service.approve_registration(populated_db, enrollment.enrollment_id)
+    professor_service.upload_grade(populated_db, "prof_a", "stud_a", "SUBJ-X", "A")
+    professor_service.upload_grade(populated_db, "prof_a", "stud_a", "SUBJ-X", "B")
+    admin_service.remove_course(populated_db, "SUBJ-X")
+
+    events = subscription.poll(timeout=0)
+    assert [event.type for event in events] == [
+        "enrollment.requested", "enrollment.approved", "grade.uploaded", "grade.changed",
+        "enrollment.dropped", "grade.removed", "course.deleted"]
+    assert [event.seq for event in events] == list(range(7))
+    assert events[1].old.enrollment_id == events[1].new.enrollment_id == enrollment.enrollment_id
+    assert subscription.poll(timeout=0) == [] and subscription.lag == 0
+
+def test_batches_and_resume(bus: EventBus, populated_db: Database):
+    """Polls return bounded batches; a new subscription can resume from a buffered seq."""
+    for i in range(6):
+        populated_db.add_grade(Grade(f"g{i}", "stud_a", "SUBJ-X", "A"))
+    subscription = bus.subscribe(from_seq=0, batch_size=4)
+    assert [event.seq for event in subscription.poll(timeout=0)] == [0, 1, 2, 3]
+    assert [event.seq for event in subscription.poll(timeout=0)] == [4, 5]
+
+    resumed = bus.subscribe(from_seq=3)
+    assert [event.seq for event in resumed.poll(timeout=0)] == [3, 4, 5]
+    with pytest.raises(ValueError):
+        bus.subscribe(from_seq=7)
+
+    for i in range(6, 12):
+        populated_db.add_grade(Grade(f"g{i}", "stud_a", "SUBJ-X", "A"))
+    with pytest.raises(EventsLost):
+        bus.subscribe(from_seq=2)
+
+def test_drop_subscribers_skip_and_count(bus: EventBus, populated_db: Database):
+    """A lapped DROP subscriber jumps to the oldest buffered event."""
+    subscription = bus.subscribe(overflow=DROP)
+    for i in range(11):
+        populated_db.add_grade(Grade(f"g{i}", "stud_a", "SUBJ-X", "A"))
+    assert subscription.poll(timeout=0)[0].seq == 3
+    assert subscription.lost == 3
+
+def test_block_subscribers_slow_writers_down(bus: EventBus, populated_db: Database):
+    """Writers wait for a BLOCK subscriber that keeps up, and give up on one that is stuck."""
+    received = []
+    done = threading.Event()
+
+    def handler(batch):
+        received.extend(event.seq for event in batch)
+        if len(received) == 40:
+            done.set()
+
+    bus.block_timeout = 5.0
+    consumer = bus.subscribe(batch_size=3)
+    consumer.start(handler, poll_interval=0.01)
+    for i in range(40):
+        populated_db.add_grade(Grade(f"g{i}", "stud_a", "SUBJ-X", "A"))
+    assert done.wait(5)
+    assert received == list(range(40))
+    assert consumer.lost == 0 and consumer.error is None
+    consumer.close()
+
+    bus.block_timeout = 0.005
+    stuck = bus.subscribe()
+    for i in range(12):
+        populated_db.add_grade(Grade(f"h{i}", "stud_a", "SUBJ-X", "A"))
+    stuck.poll(timeout=0)
+    assert stuck.lost == 4
+
+def test_block_subscriber_may_read_the_database(bus: EventBus, populated_db: Database):
+    """A transaction outrunning the buffer does not wait under the latch for a handler that reads the database."""
+    received = []
+    done = threading.Event()
+
+    def handler(batch):
+        for event in batch:
+            received.append(populated_db.find_grade(event.new.student_id, event.new.course_id) is not None)
+        if len(received) == 12:
+            done.set()
+
+    bus.block_timeout = 2.0
+    consumer = bus.subscribe(batch_size=2)
+    consumer.start(handler, poll_interval=0.01)
+    start = time.monotonic()
+    with populated_db.transaction():
+        for i in range(12):
+            populated_db.add_grade(Grade(f"g{i}", "stud_a", "SUBJ-X", "A"))
+    assert done.wait(5)
+    assert time.monotonic() - start < bus.block_timeout
+    assert received == [True] * 12
+    assert consumer.lost == 0 and consumer.error is None
+    consumer.close()
@@ -0,0 +1,121 @@
+"""
+Tests for the journal, snapshots and recovery.
+"""
+import os
+import time
+import pytest
+from source.college_erp.database import Database
+from source.college_erp.journal import Journal, recover
+from source.college_erp.services import admin_service, professor_service, student_service
+from source.college_erp.models.enrollment import EnrollmentStatus
+
+def state(db: Database) -> dict:
+    """Comparable contents of every table."""
+    return {table: dict(getattr(db, table)) for table in ("users", "courses", "enrollments", "grades")}
+
+def exercise(db: Database):
+    """Runs a little of everything through the services."""
+    admin_service.add_course(db, {"course_id": "C1", "name": "C1", "coordinator_id": "prof_a", "capacity": 1})
+    enrollment = student_service.register_course(db, "stud_a", "SUBJ-X")
+    professor_service.approve_registration(db, enrollment.enrollment_id)
+    professor_service.upload_grade(db, "prof_a", "stud_a", "SUBJ-X", "B")
+    professor_service.upload_grade(db, "prof_a", "stud_a", "SUBJ-X", "A")
+    student_service.register_course(db, "stud_a", "C1")
+    student_service.register_course(db, "stud_b", "C1")
+    student_service.drop_course(db, "stud_a", "C1")
+    db.update_user("stud_b", name="Renamed")
+
+def test_journal_replays_mutations(populated_db: Database, tmp_path):
+    """A fresh Database recovered from the journal matches the journaled one."""
+    journal = Journal(populated_db, str(tmp_path), fsync=False)
+    populated_db.add_user(populated_db.users["stud_a"])  # already-present rows are journaled too
+    exercise(populated_db)
+    assert journal.commit(timeout=5)
+    admin_service.remove_user(populated_db, "stud_b")
+    journal.close()
+
+    recovered = Database()
+    report = recover(recovered, str(tmp_path))
+    assert report.snapshot is not None  # baseline of the rows present before journaling
+    assert report.replayed > 0
+    assert state(recovered) == state(populated_db)
+    assert recovered.find_enrollment("stud_b", "C1") is None
+    assert recovered.get_grades_by_student("stud_a")[0].grade_value == "A"
+
+def test_snapshot_then_tail(populated_db: Database, tmp_path):
+    """Recovery loads the snapshot and replays only the segments after it."""
+    journal = Journal(populated_db, str(tmp_path), fsync=False)
+    exercise(populated_db)
+    snapshot = journal.snapshot()
+    populated_db.update_user("stud_a", name="After snapshot")
+    journal.close()
+    assert sorted(os.listdir(tmp_path)) == ["journal-00000003.log", os.path.basename(snapshot)]
+
+    recovered = Database()
+    reopened = Journal.open(recovered, str(tmp_path), fsync=False)
+    assert reopened.recovery.replayed == 1
+    assert state(recovered) == state(populated_db)
+    assert recovered.get_enrollments_by_course_and_status("C1", EnrollmentStatus.PENDING)[0].student_id == "stud_b"
+    recovered.clear_all()
+    reopened.close()
+
+    cleared = Database()
+    recover(cleared, str(tmp_path))
+    assert state(cleared) == state(recovered)
+
+def test_torn_tail_is_discarded(populated_db: Database, tmp_path):
+    """A partially written last record is cut off; everything before it survives."""
+    journal = Journal(populated_db, str(tmp_path), fsync=False)
+    exercise(populated_db)
+    journal.close()
+    expected = state(populated_db)
+    segment = sorted(tmp_path.glob("journal-*.log"))[-1]
+    with open(segment, "ab") as out:
+        out.write(b"\x40\x00\x00\x00\x01\x02")  # header of a record that never made it
+
+    recovered = Database()
+    report = recover(recovered, str(tmp_path))
+    assert report.truncated_bytes == 6
+    assert state(recovered) == expected
+    assert os.path.getsize(segment) > 0
+
+def test_automatic_snapshots(populated_db: Database, tmp_path):
+    """With snapshot_every, the flusher snapshots once enough records accumulate."""
+    journal = Journal(populated_db, str(tmp_path), fsync=True, commit_interval=0.001, snapshot_every=5)
+    exercise(populated_db)
+    assert journal.commit(timeout=5)
+    journal.close()
+    assert any(name.startswith("snapshot-") for name in os.listdir(tmp_path))
+    recovered = Database()
+    recover(recovered, str(tmp_path))
+    assert state(recovered) == state(populated_db)
+
+def test_commit_inside_a_transaction(populated_db: Database, tmp_path):
+    """commit() from a thread holding the latch returns while an automatic snapshot waits for it."""
+    journal = Journal(populated_db, str(tmp_path), fsync=False, commit_interval=0.001, snapshot_every=2)
+    with populated_db.transaction():
+        exercise(populated_db)
+        time.sleep(0.05)  # the flusher writes these and finds a snapshot due
+        populated_db.update_user("stud_a", name="Committed")
+        assert journal.commit(timeout=2)
+    journal.close()
+    recovered = Database()
+    recover(recovered, str(tmp_path))
+    assert state(recovered) == state(populated_db)
+
+def test_durable_writes_wait_for_the_disk(populated_db: Database, tmp_path):
+    """A durable journal acknowledges each write only once it is written; write-behind leaves it pending."""
+    journal = Journal(populated_db, str(tmp_path / "durable"), fsync=False, commit_interval=60)
+    populated_db.update_user("stud_a", name="Durable")
+    assert journal.pending == 0
+    with populated_db.transaction():
+        populated_db.update_user("stud_b", name="Batched")
+        assert journal.pending == 1  # the whole transaction shares one wait
+    assert journal.pending == 0
+    journal.close()
+
+    behind = Journal(populated_db, str(tmp_path / "behind"), fsync=False, commit_interval=60, durable=False)
+    populated_db.update_user("stud_a", name="Behind")
+    assert behind.pending == 1
+    assert behind.commit(timeout=5)
+    behind.close()
@@ -0,0 +1,104 @@
+"""
+Tests for the opt-in service instrumentation.
+"""
+import asyncio
+import json
+import threading
+import time
+import pytest
+from source.college_erp.database import Database
+from source.college_erp.metrics import Histogram, Metrics, SamplingProfiler
+from source.college_erp.services import authentication, professor_service, student_service
+
+@pytest.fixture
+def metrics() -> Metrics:
+    registry = Metrics()
+    yield registry
+    registry.disable()
+
+def test_histogram_buckets_bound_the_error():
+    """Every value lands in a bucket whose bound is within 12.5% above it."""
+    hist = Histogram()
+    for value in (0, 1, 15, 16, 17, 1000, 123_456, 10**9):
+        bucket = Histogram.bucket_of(value)
+        assert value <= Histogram.upper_bound(bucket) <= value * 1.125 + 1
+        assert Histogram.bucket_of(Histogram.upper_bound(bucket)) == bucket
+    for value in range(1, 101):
+        hist.record(value * 1000)
+    assert 50_000 <= hist.percentile(50) <= 50_000 * 1.125
+    assert hist.percentile(100) == hist.max == 100_000
+
+def test_enable_and_disable_swap_the_functions(metrics: Metrics):
+    """Disabled means the original functions, untouched."""
+    original = student_service.view_courses
+    metrics.enable()
+    assert student_service.view_courses is not original
+    assert student_service.view_courses.__wrapped__ is original
+    metrics.disable()
+    assert student_service.view_courses is original
+    assert not metrics.enabled
+
+def test_counts_errors_and_rows_scanned(metrics: Metrics, populated_db: Database):
+    """Calls, failures and the rows read by Database lookups are recorded per operation."""
+    metrics.enable()
+    metrics.track_database(populated_db)
+    student_service.view_courses(populated_db)
+    student_service.register_course(populated_db, "stud_a", "SUBJ-X")
+    assert student_service.register_course(populated_db, "stud_a", "SUBJ-X") is None
+    with pytest.raises(AttributeError):
+        student_service.register_course(None, "stud_a", "SUBJ-X")
+
+    ops = metrics.snapshot()["operations"]
+    assert ops["student_service.view_courses"]["calls"] == 1
+    assert ops["student_service.view_courses"]["rows_scanned"] == 2
+    assert ops["student_service.register_course"]["calls"] == 3
+    assert ops["student_service.register_course"]["errors"] == 1
+    assert ops["student_service.register_course"]["latency_us"]["max"] > 0
+    assert metrics.snapshot()["tables"] == [{"users": 5, "courses": 2, "enrollments": 1, "grades": 0}]
+
+    metrics.reset()
+    student_service.view_courses(populated_db)
+    assert metrics.snapshot()["operations"]["student_service.view_courses"]["calls"] == 1
+
+def test_async_functions_stay_async(metrics: Metrics, populated_db: Database):
+    """Coroutine functions get coroutine wrappers."""
+    metrics.enable()
+    assert asyncio.run(authentication.login_async(populated_db, "stud_a", "wrong")) is None
+    assert metrics.snapshot()["operations"]["authentication.login_async"]["calls"] == 1
+
+def test_exports(metrics: Metrics, populated_db: Database):
+    """Both export formats carry the same counters."""
+    metrics.enable()
+    metrics.track_database(populated_db)
+    professor_service.view_pending_registrations(populated_db, "prof_a")
+
+    snapshot = json.loads(json.dumps(metrics.snapshot()))
+    assert snapshot["operations"]["professor_service.view_pending_registrations"]["calls"] == 1
+    text = metrics.to_prometheus()
+    label = 'operation="professor_service.view_pending_registrations"'
+    assert f"erp_operation_calls_total{{{label}}} 1" in text
+    assert f'erp_operation_duration_seconds_bucket{{{label},le="+Inf"}} 1' in text
+    assert f'erp_operation_duration_seconds_bucket{{{label},le="10"}} 1' in text
+    assert 'erp_table_rows{database="0",table="courses"} 2' in text
+
+def test_sampling_profiler_sees_busy_threads():
+    """The profiler collects folded stacks of other threads while running."""
+    stop = threading.Event()
+
+    def busy_loop():
+        while not stop.is_set():
+            sum(range(1000))
+
+    worker = threading.Thread(target=busy_loop)
+    worker.start()
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    try:
+        time.sleep(0.05)
+    finally:
+        samples = profiler.stop()
+        stop.set()
+        worker.join()
+    assert not profiler.running
+    assert any(stack.endswith("busy_loop") for stack in samples)
+    assert "busy_loop" in profiler.folded()
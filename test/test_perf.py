@@ -0,0 +1,105 @@
+"""
+Performance suite over synthetic data (needs pytest-benchmark).
+
+Skipped unless ERP_PERF_SCALE names a scale from `synthetic.SCALES`
+("tiny", "small" or "large"). Record results and gate on regressions with
+pytest-benchmark's own options, e.g.:
+
+    ERP_PERF_SCALE=large pytest test/test_perf.py --benchmark-autosave
+    ERP_PERF_SCALE=large pytest test/test_perf.py --benchmark-json=perf.json \\
+        --benchmark-compare --benchmark-compare-fail=mean:20%
+
+The second run fails if any case's mean is more than 20% slower than the
+last saved run.
+"""
+import itertools
+import os
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+SCALE_NAME = os.environ.get("ERP_PERF_SCALE")
+if not SCALE_NAME:
+    pytest.skip("set ERP_PERF_SCALE to run the performance suite", allow_module_level=True)
+
+from source.college_erp.database import Database
+from source.college_erp.models.enrollment import EnrollmentStatus
+from source.college_erp.passwords import hash_password
+from source.college_erp.services import admin_service, authentication, professor_service, student_service
+from source.college_erp import synthetic
+
+SCALE = synthetic.SCALES[SCALE_NAME]
+
+@pytest.fixture(scope="module")
+def dataset():
+    """The synthetic database, built once for the whole module."""
+    db = Database()
+    data = synthetic.populate(db, SCALE, seed=1)
+    return db, data
+
+@pytest.fixture(scope="module")
+def busiest_course(dataset):
+    """The course with the most enrollments, and its coordinator."""
+    db, data = dataset
+    course_id = max(db.courses, key=lambda cid: len(db.get_enrollments_by_course(cid)))
+    return db.courses[course_id]
+
+def test_perf_login(benchmark, dataset):
+    db, _ = dataset
+    user = benchmark(authentication.login, db, synthetic.student_id(0), synthetic.PASSWORD)
+    assert user is not None
+
+def test_perf_register_course(benchmark, dataset):
+    db, _ = dataset
+    # Walk through pairs not registered yet, so every round does a real insert
+    pairs = ((synthetic.student_id(s), synthetic.course_id(c))
+             for s, c in itertools.product(range(SCALE.students), range(SCALE.courses - 1, -1, -1))
+             if db.find_enrollment(synthetic.student_id(s), synthetic.course_id(c)) is None)
+    result = benchmark(lambda: student_service.register_course(db, *next(pairs)))
+    assert result is not None
+
+def test_perf_view_pending_registrations(benchmark, dataset, busiest_course):
+    db, _ = dataset
+    pending = benchmark(professor_service.view_pending_registrations, db, busiest_course.coordinator_id, 50)
+    assert all(en.status == EnrollmentStatus.PENDING for en in pending)
+
+def test_perf_upload_grade(benchmark, dataset):
+    db, data = dataset
+    enrollment = next(en for en in data.enrollments if en.status == EnrollmentStatus.ENROLLED)
+    coordinator = db.courses[enrollment.course_id].coordinator_id
+    values = itertools.cycle(synthetic.GRADE_VALUES)
+    grade = benchmark(lambda: professor_service.upload_grade(
+        db, coordinator, enrollment.student_id, enrollment.course_id, next(values)))
+    assert grade is not None
+
+def test_perf_view_enrolled_students(benchmark, dataset, busiest_course):
+    db, _ = dataset
+    students = benchmark(professor_service.view_enrolled_students, db,
+                         busiest_course.coordinator_id, busiest_course.course_id)
+    assert students
+
+def test_perf_bulk_add_users(benchmark, dataset):
+    db, _ = dataset
+    password = hash_password(synthetic.PASSWORD)
+    batches = itertools.count()
+
+    def rows():
+        batch = next(batches)
+        return ([{"user_id": f"BULK{batch:04d}-{i:05d}", "name": "Bulk", "password_hash": password,
+                  "role": "student", "branch": "CSE"} for i in range(10_000)],), {}
+
+    report = benchmark.pedantic(lambda rows: admin_service.bulk_add_users(db, rows),
+                                setup=rows, rounds=5)
+    assert report.added == 10_000
+
+def test_perf_bulk_add_courses(benchmark, dataset):
+    db, _ = dataset
+    batches = itertools.count()
+
+    def rows():
+        batch = next(batches)
+        return ([{"course_id": f"BULK{batch:04d}-{i:05d}", "name": "Bulk",
+                  "coordinator_id": synthetic.professor_id(i % SCALE.professors)} for i in range(1_000)],), {}
+
+    report = benchmark.pedantic(lambda rows: admin_service.bulk_add_courses(db, rows),
+                                setup=rows, rounds=5)
+    assert report.added == 1_000
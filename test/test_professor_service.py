@@ -1,10 +1,14 @@
 """
 Tests for the professor service.
 """
+import sys
+import threading
 import pytest
 from source.college_erp.database import Database
 from source.college_erp.services import professor_service, student_service
-from source.college_erp.models.enrollment import EnrollmentStatus
+from source.college_erp.models.enrollment import Enrollment, EnrollmentStatus
+from source.college_erp.models.student import Student
+from source.college_erp.models.course import Course
 
 @pytest.fixture
 def db_with_pending_enrollment(populated_db: Database) -> Database:
@@ -85,4 +89,103 @@ def test_professor_view_enrolled_students(db_with_pending_enrollment: Database):
 
     # prof_a views enrolled students for SUBJ-Y (not coordinator)
     enrolled_students_phy = professor_service.view_enrolled_students(db_with_pending_enrollment, "prof_a", "SUBJ-Y")
-    assert len(enrolled_students_phy) == 0
\ No newline at end of file
+    assert len(enrolled_students_phy) == 0
+
+def test_professor_view_pending_registrations_paginated(populated_db: Database):
+    """Test paging through a professor's approval queue with limit and cursor."""
+    for i in range(5):
+        populated_db.add_user(Student(user_id=f"stud_p{i}", name=f"Student P{i}", password="pass", branch="Branch 1"))
+        student_service.register_course(populated_db, f"stud_p{i}", "SUBJ-X")
+    populated_db.add_course(Course(course_id="SUBJ-W", name="Subject W", coordinator_id="prof_a"))
+    student_service.register_course(populated_db, "stud_a", "SUBJ-W")
+
+    everything = professor_service.view_pending_registrations(populated_db, "prof_a")
+    assert len(everything) == 6
+
+    pages = []
+    cursor = None
+    while True:
+        page = professor_service.view_pending_registrations(populated_db, "prof_a", limit=4, cursor=cursor)
+        if not page:
+            break
+        pages.append(page)
+        cursor = page[-1].enrollment_id
+    assert [len(p) for p in pages] == [4, 2]
+    assert [e.enrollment_id for p in pages for e in p] == [e.enrollment_id for e in everything]
+
+    # Approving an item between pages does not disturb the cursor
+    first_page = professor_service.view_pending_registrations(populated_db, "prof_a", limit=2)
+    professor_service.approve_registration(populated_db, first_page[-1].enrollment_id)
+    rest = professor_service.view_pending_registrations(populated_db, "prof_a", cursor=first_page[-1].enrollment_id)
+    assert [e.enrollment_id for e in rest] == [e.enrollment_id for e in everything[2:]]
+
+def test_professor_approve_registrations_batch(db_with_pending_enrollment: Database):
+    """Test approving several enrollments at once with per-item results."""
+    student_service.register_course(db_with_pending_enrollment, "stud_b", "SUBJ-X")
+    mine = [e.enrollment_id for e in professor_service.view_pending_registrations(db_with_pending_enrollment, "prof_a")]
+    other = professor_service.view_pending_registrations(db_with_pending_enrollment, "prof_b")[0].enrollment_id
+
+    results = professor_service.approve_registrations(db_with_pending_enrollment, "prof_a", mine + [other, "missing"])
+    assert all(results[eid].status == EnrollmentStatus.ENROLLED for eid in mine)
+    assert results[other] is None
+    assert results["missing"] is None
+    assert db_with_pending_enrollment.enrollments[other].status == EnrollmentStatus.PENDING
+    assert professor_service.view_pending_registrations(db_with_pending_enrollment, "prof_a") == []
+
+def test_professor_upload_grades_batch(db_with_pending_enrollment: Database):
+    """Test uploading a grade sheet for a course in one call."""
+    student_service.register_course(db_with_pending_enrollment, "stud_b", "SUBJ-X")
+    pending = professor_service.view_pending_registrations(db_with_pending_enrollment, "prof_a")
+    professor_service.approve_registrations(db_with_pending_enrollment, "prof_a", [pending[0].enrollment_id])
+    approved_id = pending[0].student_id
+    waiting_id = pending[1].student_id
+    professor_service.upload_grade(db_with_pending_enrollment, "prof_a", approved_id, "SUBJ-X", "C")
+
+    results = professor_service.upload_grades(db_with_pending_enrollment, "prof_a", "SUBJ-X",
+                                              {approved_id: "A", waiting_id: "B"})
+    assert results[approved_id].grade_value == "A"
+    assert results[waiting_id] is None
+    assert [g.grade_value for g in student_service.view_grades(db_with_pending_enrollment, approved_id)] == ["A"]
+
+    denied = professor_service.upload_grades(db_with_pending_enrollment, "prof_b", "SUBJ-X", {approved_id: "F"})
+    assert denied == {approved_id: None}
+
+def test_concurrent_grade_uploads_keep_one_grade(populated_db: Database):
+    """
+    Many threads upload single grades and grade sheets for the same students
+    at once; every (student, course) ends with exactly one grade row.
+    """
+    n_students, n_threads = 40, 8
+    students = [f"s{i:03d}" for i in range(n_students)]
+    populated_db.add_users(Student(user_id=sid, name=sid, password="pw", branch="B") for sid in students)
+    populated_db.add_enrollments(Enrollment(f"e-{sid}", sid, "SUBJ-X", EnrollmentStatus.ENROLLED) for sid in students)
+
+    errors = []
+    start = threading.Barrier(n_threads)
+
+    def worker(index: int):
+        try:
+            start.wait()
+            for round_ in range(5):
+                if (index + round_) % 2:
+                    professor_service.upload_grades(populated_db, "prof_a", "SUBJ-X", {sid: "B" for sid in students})
+                else:
+                    for sid in students:
+                        professor_service.upload_grade(populated_db, "prof_a", sid, "SUBJ-X", "A")
+        except Exception as exc:  # surfaced in the main thread below
+            errors.append(exc)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads often so check-then-insert races show up
+    try:
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(n_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert not errors
+    grades = populated_db.get_grades_by_course("SUBJ-X")
+    assert sorted(grade.student_id for grade in grades) == students
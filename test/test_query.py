@@ -0,0 +1,76 @@
+"""
+Tests for the query layer.
+"""
+import pytest
+from source.college_erp.database import Database
+from source.college_erp.sqlite_database import SQLiteDatabase
+from source.college_erp.models.course import Course
+from source.college_erp.models.enrollment import Enrollment, EnrollmentStatus
+from source.college_erp.models.student import Student
+
+@pytest.fixture
+def query_db(populated_db: Database) -> Database:
+    """Ten students in SUBJ-X (every third one pending) and two in SUBJ-Y."""
+    for i in range(10):
+        populated_db.add_user(Student(user_id=f"s{i}", name=f"Student {9 - i}", password="pw",
+                                      branch="B", cgpa=float(i % 4)))
+        status = EnrollmentStatus.PENDING if i % 3 == 0 else EnrollmentStatus.ENROLLED
+        populated_db.add_enrollment(Enrollment(f"e{i}", f"s{i}", "SUBJ-X", status))
+    populated_db.add_enrollment(Enrollment("y0", "s0", "SUBJ-Y", EnrollmentStatus.ENROLLED))
+    populated_db.add_enrollment(Enrollment("y1", "s1", "SUBJ-Y", EnrollmentStatus.REJECTED))
+    return populated_db
+
+def test_picks_most_selective_index(query_db: Database):
+    """Equality predicates on indexed columns choose an index; the rest is checked per row."""
+    pending = query_db.query("enrollments").where(course_id="SUBJ-X", status=EnrollmentStatus.PENDING)
+    plan = pending.explain()
+    assert plan.access_path == "course-status index"
+    assert plan.rows_scanned == plan.rows_matched == 4
+    assert [en.enrollment_id for en in pending.all()] == ["e0", "e3", "e6", "e9"]
+
+    plan = query_db.query("enrollments").where(student_id="s0", status=EnrollmentStatus.ENROLLED).explain()
+    assert (plan.access_path, plan.rows_scanned, plan.rows_matched, plan.residual) == (
+        "student index", 2, 1, ("status eq",))
+    assert query_db.query("enrollments").where(enrollment_id="y1").explain().access_path == "primary key"
+    assert query_db.query("grades").where(student_id="s0", course_id="SUBJ-X").explain().access_path == \
+        "student-course index"
+
+    plan = query_db.query("users").where(cgpa__gte=2.0).explain()
+    assert plan.access_path == "full scan" and plan.rows_scanned == 15 and plan.rows_matched == 4
+
+def test_order_page_and_project(query_db: Database):
+    """Keyset pages walk the ordering without gaps or repeats; select returns dicts."""
+    students = query_db.query("users").where(user_id__in={f"s{i}" for i in range(10)}).order_by("-cgpa", "name")
+    seen = []
+    cursor = None
+    while True:
+        rows, cursor = students.after(cursor).page(3)
+        seen.extend(row.user_id for row in rows)
+        if cursor is None:
+            break
+    assert seen == [row.user_id for row in students.all()]
+    assert seen[:3] == ["s7", "s3", "s6"]  # cgpa 3.0 by name, then cgpa 2.0
+
+    names = query_db.query("users").where(branch="B").order_by("name").select("name").limit(2).all()
+    assert names == [{"name": "Student 0"}, {"name": "Student 1"}]
+    assert query_db.query("enrollments").where(course_id="SUBJ-Y", status__ne=EnrollmentStatus.REJECTED).count() == 1
+    assert query_db.query("courses").order_by("-course_id").first().course_id == "SUBJ-Y"
+
+def test_rejects_unknown_columns(query_db: Database):
+    with pytest.raises(ValueError):
+        query_db.query("classes")
+    with pytest.raises(ValueError):
+        query_db.query("users").where(salary=1)
+    with pytest.raises(ValueError):
+        query_db.query("users").where(cgpa__like=1)
+
+def test_query_on_sqlite(tmp_path):
+    """The same access paths work on the SQLite backend."""
+    db = SQLiteDatabase(str(tmp_path / "erp.db"))
+    db.add_course(Course("C1", "One", "prof_a", capacity=10))
+    db.add_course(Course("C2", "Two", "prof_a"))
+    db.add_course(Course("C3", "Three", "prof_b", capacity=5))
+    query = db.query("courses").where(coordinator_id="prof_a").order_by("-capacity")
+    assert query.explain().access_path == "coordinator index"
+    assert [course.course_id for course in query.all()] == ["C1", "C2"]
+    db.close()
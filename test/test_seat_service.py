@@ -0,0 +1,126 @@
+"""
+Tests for course capacity, waitlists and concurrent registration.
+"""
+import random
+import sys
+import threading
+from collections import Counter
+import pytest
+from source.college_erp.database import Database
+from source.college_erp.services import admin_service, professor_service, seat_service, student_service
+from source.college_erp.models.enrollment import EnrollmentStatus
+from source.college_erp.models.student import Student
+from source.college_erp.models.course import Course
+
+@pytest.fixture
+def capped_db(populated_db: Database) -> Database:
+    """Adds a two-seat course and a few more students."""
+    populated_db.add_course(Course(course_id="SUBJ-CAP", name="Capped", coordinator_id="prof_a", capacity=2))
+    for i in range(3):
+        populated_db.add_user(Student(user_id=f"stud_{i}", name=f"Student {i}", password="pw", branch="B"))
+    return populated_db
+
+def test_register_waitlists_when_full(capped_db: Database):
+    """Registrations beyond capacity are waitlisted in arrival order."""
+    statuses = [student_service.register_course(capped_db, sid, "SUBJ-CAP").status
+                for sid in ("stud_a", "stud_b", "stud_0", "stud_1")]
+    assert statuses == [EnrollmentStatus.PENDING, EnrollmentStatus.PENDING,
+                        EnrollmentStatus.WAITLISTED, EnrollmentStatus.WAITLISTED]
+    assert [en.student_id for en in seat_service.view_waitlist(capped_db, "SUBJ-CAP")] == ["stud_0", "stud_1"]
+    assert seat_service.seats_left(capped_db, "SUBJ-CAP") == 0
+    assert seat_service.seats_left(capped_db, "SUBJ-X") is None
+
+def test_waitlist_promotes_in_fifo_order(capped_db: Database):
+    """Rejections, drops and removals each hand the freed seat to the head of the waitlist."""
+    first = student_service.register_course(capped_db, "stud_a", "SUBJ-CAP")
+    for sid in ("stud_b", "stud_0", "stud_1", "stud_2"):
+        student_service.register_course(capped_db, sid, "SUBJ-CAP")
+
+    assert professor_service.reject_registration(capped_db, "prof_a", first.enrollment_id).status == EnrollmentStatus.REJECTED
+    assert capped_db.find_enrollment("stud_0", "SUBJ-CAP").status == EnrollmentStatus.PENDING
+
+    assert student_service.drop_course(capped_db, "stud_b", "SUBJ-CAP")
+    assert capped_db.find_enrollment("stud_1", "SUBJ-CAP").status == EnrollmentStatus.PENDING
+
+    assert admin_service.remove_user(capped_db, "stud_0")
+    assert capped_db.find_enrollment("stud_2", "SUBJ-CAP").status == EnrollmentStatus.PENDING
+    assert seat_service.view_waitlist(capped_db, "SUBJ-CAP") == []
+
+def test_reject_requires_coordinator(capped_db: Database):
+    """Only the course's coordinator can reject a registration."""
+    enrollment = student_service.register_course(capped_db, "stud_a", "SUBJ-CAP")
+    assert professor_service.reject_registration(capped_db, "prof_b", enrollment.enrollment_id) is None
+    assert capped_db.enrollments[enrollment.enrollment_id].status == EnrollmentStatus.PENDING
+
+def test_approval_enforces_capacity(capped_db: Database):
+    """Approvals stop once a course is full of enrolled students, even after it was shrunk."""
+    ids = [student_service.register_course(capped_db, sid, "SUBJ-CAP").enrollment_id for sid in ("stud_a", "stud_b")]
+    capped_db.add_course(Course(course_id="SUBJ-CAP", name="Capped", coordinator_id="prof_a", capacity=1))
+    results = professor_service.approve_registrations(capped_db, "prof_a", ids)
+    assert results[ids[0]] is not None and results[ids[1]] is None
+    assert professor_service.approve_registration(capped_db, ids[1]) is None
+
+def test_add_course_capacity(populated_db: Database):
+    """Admins can set a capacity; invalid values are rejected."""
+    course = admin_service.add_course(populated_db, {"course_id": "C1", "name": "C", "coordinator_id": "prof_a", "capacity": "30"})
+    assert course.capacity == 30
+    assert admin_service.add_course(populated_db, {"course_id": "C2", "coordinator_id": "prof_a", "capacity": "many"}) is None
+    report = admin_service.bulk_add_courses(populated_db, [
+        {"course_id": "C3", "coordinator_id": "prof_a", "capacity": ""},
+        {"course_id": "C4", "coordinator_id": "prof_a", "capacity": "-1"},
+    ])
+    assert report.added == 1 and report.errors[0][0] == 1
+    assert populated_db.courses["C3"].capacity is None
+
+def test_concurrent_registration_never_overbooks(populated_db: Database):
+    """
+    Many threads register, approve and drop students in a few small courses
+    at once; no course ever exceeds capacity and no student holds two rows.
+    """
+    capacity, n_students, n_threads = 10, 120, 16
+    course_ids = [f"HOT-{i}" for i in range(3)]
+    for course_id in course_ids:
+        populated_db.add_course(Course(course_id=course_id, name=course_id, coordinator_id="prof_a", capacity=capacity))
+    students = [f"s{i:03d}" for i in range(n_students)]
+    populated_db.add_users(Student(user_id=sid, name=sid, password="pw", branch="B") for sid in students)
+
+    errors = []
+    start = threading.Barrier(n_threads)
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        try:
+            start.wait()
+            for _ in range(300):
+                student_id, course_id = rng.choice(students), rng.choice(course_ids)
+                action = rng.random()
+                if action < 0.6:
+                    student_service.register_course(populated_db, student_id, course_id)
+                elif action < 0.85:
+                    enrollment = populated_db.find_enrollment(student_id, course_id)
+                    if enrollment:
+                        professor_service.approve_registration(populated_db, enrollment.enrollment_id)
+                else:
+                    student_service.drop_course(populated_db, student_id, course_id)
+        except Exception as exc:  # surfaced in the main thread below
+            errors.append(exc)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # force frequent thread switches to provoke races
+    try:
+        threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(n_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert errors == []
+    pairs = Counter((en.student_id, en.course_id) for en in populated_db.enrollments.values())
+    assert max(pairs.values()) == 1
+    for course_id in course_ids:
+        assert seat_service.seats_taken(populated_db, course_id) <= capacity
+        # A seat is never left free while someone is waiting for it
+        if seat_service.view_waitlist(populated_db, course_id):
+            assert seat_service.seats_taken(populated_db, course_id) == capacity
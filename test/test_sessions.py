@@ -0,0 +1,72 @@
+"""
+Tests for the session service.
+"""
+import pytest
+from source.college_erp.database import Database
+from source.college_erp.services import sessions
+from source.college_erp.services.sessions import SessionStore
+from source.college_erp.models.user import UserRole
+
+class FakeClock:
+    """Manually advanced clock for expiry tests."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+@pytest.fixture
+def store(clock: FakeClock) -> SessionStore:
+    return SessionStore(ttl_seconds=60, max_sessions=3, clock=clock)
+
+def test_login_session_and_validate(populated_db: Database, store: SessionStore):
+    """Test issuing a token on login and validating it."""
+    token = sessions.login_session(populated_db, "prof_a", "prof_pass_a", store=store)
+    assert token is not None
+    assert sessions.validate_session(token, store=store) == ("prof_a", UserRole.PROFESSOR)
+    assert sessions.login_session(populated_db, "prof_a", "wrong", store=store) is None
+
+def test_authorize_by_role(store: SessionStore):
+    """Test role-based authorization from a token."""
+    token = store.issue("stud_a", UserRole.STUDENT)
+    assert sessions.authorize(token, UserRole.STUDENT, store=store) == "stud_a"
+    assert sessions.authorize(token, store=store) == "stud_a"
+    assert sessions.authorize(token, UserRole.ADMIN, UserRole.PROFESSOR, store=store) is None
+
+def test_tampered_token_rejected(store: SessionStore):
+    """Test that a token with a bad signature is not accepted."""
+    token = store.issue("stud_a", UserRole.STUDENT)
+    session_id, _, signature = token.partition(".")
+    assert sessions.validate_session(f"{session_id}.{'0' * len(signature)}", store=store) is None
+    assert sessions.validate_session("garbage", store=store) is None
+
+def test_session_expiry(store: SessionStore, clock: FakeClock):
+    """Test TTL expiry, both lazily and via a sweep."""
+    first = store.issue("stud_a", UserRole.STUDENT)
+    clock.now = 30
+    second = store.issue("stud_b", UserRole.STUDENT)
+    clock.now = 61
+    assert sessions.validate_session(first, store=store) is None
+    assert sessions.validate_session(second, store=store) == ("stud_b", UserRole.STUDENT)
+    clock.now = 100
+    assert store.evict_expired() == 1
+    assert len(store) == 0
+
+def test_lru_bound_and_revocation(store: SessionStore):
+    """Test that the least recently used session is evicted at capacity."""
+    tokens = [store.issue(f"stud_{i}", UserRole.STUDENT) for i in range(3)]
+    store.get(tokens[0])  # tokens[1] is now least recently used
+    newest = store.issue("stud_3", UserRole.STUDENT)
+    assert len(store) == 3
+    assert store.get(tokens[1]) is None
+    assert store.get(tokens[0]) is not None
+
+    assert sessions.logout(newest, store=store) is True
+    assert store.get(newest) is None
+    store.issue("stud_0", UserRole.STUDENT)
+    assert store.revoke_user("stud_0") == 2
+    assert store.get(tokens[0]) is None
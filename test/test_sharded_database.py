@@ -0,0 +1,129 @@
+"""
+Tests for the sharded storage backend.
+"""
+import threading
+import time
+import pytest
+from source.college_erp.sharded_database import ShardedDatabase, shard_of
+from source.college_erp.services import admin_service, professor_service, seat_service, student_service
+from source.college_erp.services.student_cache import StudentViewCache
+from source.college_erp.models.professor import Professor
+from source.college_erp.models.student import Student
+from source.college_erp.models.course import Course
+from source.college_erp.models.enrollment import Enrollment, EnrollmentStatus
+from source.college_erp.models.grade import Grade
+
+STUDENTS = [f"stud_{i}" for i in range(8)]
+
+@pytest.fixture(scope="module")
+def shards() -> ShardedDatabase:
+    """One set of worker processes for the module; tables are cleared per test."""
+    db = ShardedDatabase(shards=3)
+    yield db
+    db.close()
+
+@pytest.fixture
+def sharded_db(shards: ShardedDatabase) -> ShardedDatabase:
+    shards.clear_all()
+    shards.add_user(Professor(user_id="prof_a", name="Professor A", password="pw", branch="B"))
+    shards.add_users(Student(user_id=sid, name=sid, password="pw", branch="B") for sid in STUDENTS)
+    shards.add_course(Course(course_id="SUBJ-X", name="Subject X", coordinator_id="prof_a", capacity=3))
+    return shards
+
+def test_students_spread_over_shards(sharded_db: ShardedDatabase):
+    """Every shard owns some of the students' rows."""
+    assert {shard_of(sid, sharded_db.shard_count) for sid in STUDENTS} == {0, 1, 2}
+
+def test_sharded_register_approve_grade(sharded_db: ShardedDatabase):
+    """The services run unchanged; course-keyed reads gather every shard."""
+    enrollments = [student_service.register_course(sharded_db, sid, "SUBJ-X") for sid in STUDENTS]
+    assert student_service.register_course(sharded_db, STUDENTS[0], "SUBJ-X") is None
+    assert [en.status for en in enrollments].count(EnrollmentStatus.PENDING) == 3
+
+    pending = professor_service.view_pending_registrations(sharded_db, "prof_a")
+    assert sorted(en.student_id for en in pending) == STUDENTS[:3]
+    approved = professor_service.approve_registrations(sharded_db, "prof_a", [en.enrollment_id for en in pending])
+    assert all(en.status == EnrollmentStatus.ENROLLED for en in approved.values())
+
+    professor_service.upload_grade(sharded_db, "prof_a", STUDENTS[1], "SUBJ-X", "A")
+    assert [g.grade_value for g in student_service.view_grades(sharded_db, STUDENTS[1])] == ["A"]
+    students = professor_service.view_enrolled_students(sharded_db, "prof_a", "SUBJ-X")
+    assert sorted(s.user_id for s in students) == STUDENTS[:3]
+    assert len(sharded_db.enrollments) == 8 and len(list(sharded_db.grades.values())) == 1
+    assert sharded_db.enrollments[enrollments[0].enrollment_id].status == EnrollmentStatus.ENROLLED
+
+def test_sharded_waitlist_is_fifo_across_shards(sharded_db: ShardedDatabase):
+    """The waitlist keeps arrival order even though it is spread over the shards."""
+    enrollments = [student_service.register_course(sharded_db, sid, "SUBJ-X") for sid in STUDENTS]
+    assert [en.student_id for en in seat_service.view_waitlist(sharded_db, "SUBJ-X")] == STUDENTS[3:]
+
+    professor_service.reject_registration(sharded_db, "prof_a", enrollments[0].enrollment_id)
+    student_service.drop_course(sharded_db, STUDENTS[1], "SUBJ-X")
+    assert [en.student_id for en in seat_service.view_waitlist(sharded_db, "SUBJ-X")] == STUDENTS[5:]
+    assert sharded_db.count_enrollments("SUBJ-X", EnrollmentStatus.PENDING) == 3
+
+def test_sharded_deletes_and_listeners(sharded_db: ShardedDatabase):
+    """FK cascades and change listeners work across the shards."""
+    cache = StudentViewCache(sharded_db)
+    try:
+        student_service.register_course(sharded_db, STUDENTS[0], "SUBJ-X")
+        assert len(cache.view_registered_courses(STUDENTS[0])) == 1
+        assert admin_service.remove_user(sharded_db, "prof_a") is False
+        assert admin_service.remove_course(sharded_db, "SUBJ-X") is True
+        assert cache.view_registered_courses(STUDENTS[0]) == ()
+        assert len(sharded_db.enrollments) == 0
+    finally:
+        cache.detach()
+
+def test_sharded_bulk_load(sharded_db: ShardedDatabase):
+    """Bulk loads send one batch per shard and land every row on its student's shard."""
+    sharded_db.add_enrollments(Enrollment(f"e{i}", sid, "SUBJ-X", EnrollmentStatus.ENROLLED)
+                               for i, sid in enumerate(STUDENTS))
+    sharded_db.add_grades(Grade(f"g{i}", sid, "SUBJ-X", "B") for i, sid in enumerate(STUDENTS))
+    assert len(sharded_db.get_enrollments_by_course("SUBJ-X")) == 8
+    assert sharded_db.find_grade(STUDENTS[4], "SUBJ-X").grade_id == "g4"
+    assert sharded_db.update_grade_value("g4", "A").grade_value == "A"
+    assert sharded_db.get_referenced_ids("grades", "student_id") == set(STUDENTS)
+    sharded_db.clear_table("grades")
+    assert sharded_db.get_grades_by_course("SUBJ-X") == []
+
+def test_sharded_error_leaves_no_stale_replies(sharded_db: ShardedDatabase):
+    """A scatter call that fails on the shards still reads every reply, so later calls get their own answers."""
+    enrollment = student_service.register_course(sharded_db, STUDENTS[0], "SUBJ-X")
+    with pytest.raises((KeyError, AttributeError)):
+        sharded_db.get_referenced_ids("enrollments", "bogus")
+    assert sharded_db.count_enrollments("SUBJ-X", EnrollmentStatus.PENDING) == 1
+    assert sharded_db.find_enrollment(STUDENTS[0], "SUBJ-X") == enrollment
+    assert len(sharded_db.get_enrollments_by_course("SUBJ-X")) == 1
+
+def test_sharded_grades_in_student_order(sharded_db: ShardedDatabase):
+    """The per-shard sorted grade streams merge into one (student, course) ordered pass."""
+    sharded_db.add_grades(Grade(f"g{i}", sid, course, "B") for i, (sid, course) in
+                          enumerate((sid, course) for sid in reversed(STUDENTS) for course in ("C2", "C1")))
+    keys = [(g.student_id, g.course_id) for g in sharded_db.iter_grades_by_student(start=STUDENTS[2])]
+    assert keys == [(sid, course) for sid in STUDENTS[2:] for course in ("C1", "C2")]
+
+def test_sharded_listeners_see_writes_one_at_a_time(sharded_db: ShardedDatabase):
+    """Writers on different shards notify under the latch, so listeners never overlap and end on the stored value."""
+    sharded_db.add_grades(Grade(f"g{i}", sid, "SUBJ-X", "C") for i, sid in enumerate(STUDENTS))
+    active, overlaps, last = [0], [], {}
+    def listener(change):
+        active[0] += 1
+        overlaps.append(active[0] > 1)
+        time.sleep(0.001)
+        last[change.new.grade_id] = change.new.grade_value
+        active[0] -= 1
+    def write(value: str):
+        for i in range(len(STUDENTS)):
+            sharded_db.update_grade_value(f"g{i}", value)
+    sharded_db.add_listener(listener)
+    try:
+        threads = [threading.Thread(target=write, args=(value,)) for value in "AB"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sharded_db.remove_listener(listener)
+    assert not any(overlaps)
+    assert last == {grade.grade_id: grade.grade_value for grade in sharded_db.grades.values()}
@@ -0,0 +1,107 @@
+"""
+Tests for point-in-time snapshots of the Database.
+"""
+import threading
+import time
+from source.college_erp.database import Database
+from source.college_erp.sqlite_database import SQLiteDatabase
+from source.college_erp.models.course import Course
+from source.college_erp.models.enrollment import Enrollment, EnrollmentStatus
+from source.college_erp.models.grade import Grade
+from source.college_erp.services import professor_service, student_service
+
+def test_snapshot_ignores_later_writes(populated_db: Database):
+    """Inserts, updates, deletes and clears after the snapshot are invisible to it."""
+    enrollment = student_service.register_course(populated_db, "stud_a", "SUBJ-X")
+    populated_db.add_grade(Grade("g1", "stud_a", "SUBJ-X", "B"))
+    with populated_db.snapshot() as snapshot:
+        professor_service.approve_registration(populated_db, enrollment.enrollment_id)
+        populated_db.update_grade_value("g1", "A")
+        populated_db.add_grade(Grade("g2", "stud_b", "SUBJ-Y", "C"))
+        populated_db.delete_user("stud_b")
+        populated_db.update_user("stud_a", name="Renamed")
+        populated_db.clear_table("courses")
+
+        assert snapshot.enrollments[enrollment.enrollment_id].status == EnrollmentStatus.PENDING
+        assert [grade.grade_value for grade in snapshot.grades.values()] == ["B"]
+        assert "g2" not in snapshot.grades and snapshot.grades.get("g2") is None
+        assert snapshot.get_user_by_id("stud_a").name == "Student A"
+        assert set(snapshot.users) == {"admin_user", "prof_a", "prof_b", "stud_a", "stud_b"}
+        assert len(snapshot.courses) == 2 and snapshot.courses["SUBJ-X"].name == "Subject X"
+
+        with populated_db.snapshot() as later:
+            assert later.grades["g1"].grade_value == "A" and len(later.courses) == 0
+            assert snapshot.grades["g1"].grade_value == "B"
+    assert all(not rows for rows in populated_db._history.values())
+
+def test_closing_the_oldest_snapshot_prunes_versions(populated_db: Database):
+    old = populated_db.snapshot()
+    populated_db.add_grade(Grade("g1", "stud_a", "SUBJ-X", "B"))
+    new = populated_db.snapshot()
+    populated_db.update_grade_value("g1", "A")
+    old.close()
+    old.close()
+    assert new.grades["g1"].grade_value == "B"
+    assert [row.grade_value for _, row in populated_db._history["grades"]["g1"]] == ["B"]
+    del new  # released when collected, too
+    assert all(not rows for rows in populated_db._history.values())
+
+def test_readers_and_writers_run_in_parallel(populated_db: Database):
+    """
+    A writer keeps committing transactions (one enrollment plus its grade)
+    while a reader walks the same snapshot over and over: every pass sees
+    the same, untorn state, and the writer never waits for the reader.
+    """
+    db = populated_db
+    db.add_courses(Course(f"C{i}", f"Course {i}", "prof_a") for i in range(20))
+    for i in range(2_000):
+        with db.transaction():
+            db.add_enrollment(Enrollment(f"e{i}", "stud_a", f"C{i % 20}", EnrollmentStatus.ENROLLED))
+            db.add_grade(Grade(f"g{i}", "stud_a", f"C{i % 20}", "B"))
+
+    written = [2_000]
+    stop = threading.Event()
+
+    def writer():
+        i = written[0]
+        while not stop.is_set():
+            with db.transaction():
+                db.add_enrollment(Enrollment(f"e{i}", "stud_b", f"C{i % 20}", EnrollmentStatus.ENROLLED))
+                db.add_grade(Grade(f"g{i}", "stud_b", f"C{i % 20}", "A"))
+                db.remove_grade(f"g{i - 2_000}")
+                db.update_enrollment_status(f"e{i - 2_000}", EnrollmentStatus.REJECTED)
+            i += 1
+            written[0] = i
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        time.sleep(0.01)
+        with db.snapshot() as snapshot:
+            start = written[0]
+            first = None
+            passes = 0
+            while passes < 3 or written[0] - start < 500:
+                enrolled = {en.enrollment_id for en in snapshot.enrollments.values()
+                            if en.status == EnrollmentStatus.ENROLLED}
+                graded = {grade.grade_id for grade in snapshot.grades.values()}
+                assert {f"e{grade_id[1:]}" for grade_id in graded} == enrolled
+                first = first or (enrolled, graded)
+                assert (enrolled, graded) == first
+                passes += 1
+                assert passes < 10_000
+    finally:
+        stop.set()
+        thread.join()
+    assert written[0] - start >= 500
+
+def test_sqlite_snapshot(tmp_path):
+    """On SQLite, a snapshot is a WAL read transaction on its own connection."""
+    db = SQLiteDatabase(str(tmp_path / "erp.db"))
+    db.add_course(Course("C1", "One", "prof_a"))
+    with db.snapshot() as snapshot:
+        db.add_course(Course("C2", "Two", "prof_a"))
+        db.remove_course("C1")
+        assert list(snapshot.courses) == ["C1"]
+        assert list(db.courses) == ["C2"]
+    db.close()
@@ -0,0 +1,118 @@
+"""
+Tests for the SQLite storage backend.
+"""
+import sqlite3
+import pytest
+from datetime import date
+from source.college_erp.sqlite_database import SQLiteDatabase
+from source.college_erp.services import admin_service, professor_service, student_service
+from source.college_erp.models.admin import Admin
+from source.college_erp.models.professor import Professor
+from source.college_erp.models.student import Student
+from source.college_erp.models.course import Course
+from source.college_erp.models.enrollment import EnrollmentStatus
+
+@pytest.fixture
+def sqlite_db(tmp_path) -> SQLiteDatabase:
+    """Fixture with the same data as `populated_db`, stored in an SQLite file."""
+    db = SQLiteDatabase(str(tmp_path / "erp.db"))
+    db.add_user(Admin(user_id="admin_user", name="Admin", password="admin_pass"))
+    db.add_user(Professor(user_id="prof_a", name="Professor A", password="prof_pass_a", branch="Branch 1"))
+    db.add_user(Student(user_id="stud_a", name="Student A", password="stud_pass_a", branch="Branch 1",
+                        date_of_admission=date(2024, 8, 1)))
+    db.add_course(Course(course_id="SUBJ-X", name="Subject X", coordinator_id="prof_a"))
+    yield db
+    db.close()
+
+def test_sqlite_register_approve_grade(sqlite_db: SQLiteDatabase):
+    """Test the full registration flow through the services."""
+    enrollment = student_service.register_course(sqlite_db, "stud_a", "SUBJ-X")
+    assert enrollment is not None
+    assert student_service.register_course(sqlite_db, "stud_a", "SUBJ-X") is None
+
+    pending = professor_service.view_pending_registrations(sqlite_db, "prof_a")
+    assert [e.enrollment_id for e in pending] == [enrollment.enrollment_id]
+    approved = professor_service.approve_registration(sqlite_db, enrollment.enrollment_id)
+    assert approved.status == EnrollmentStatus.ENROLLED
+
+    professor_service.upload_grade(sqlite_db, "prof_a", "stud_a", "SUBJ-X", "B")
+    grade = professor_service.upload_grade(sqlite_db, "prof_a", "stud_a", "SUBJ-X", "A")
+    assert [g.grade_value for g in student_service.view_grades(sqlite_db, "stud_a")] == ["A"]
+    assert grade.grade_id in sqlite_db.grades
+
+    students = professor_service.view_enrolled_students(sqlite_db, "prof_a", "SUBJ-X")
+    assert [s.user_id for s in students] == ["stud_a"]
+
+def test_sqlite_persists_across_reopen(sqlite_db: SQLiteDatabase, tmp_path):
+    """Test that data survives closing and reopening the database file."""
+    student_service.register_course(sqlite_db, "stud_a", "SUBJ-X")
+    sqlite_db.update_user("stud_a", cgpa=8.5)
+    sqlite_db.close()
+
+    reopened = SQLiteDatabase(str(tmp_path / "erp.db"))
+    student = reopened.get_user_by_id("stud_a")
+    assert isinstance(student, Student)
+    assert student.cgpa == 8.5
+    assert student.date_of_admission == date(2024, 8, 1)
+    assert len(reopened.get_enrollments_by_student("stud_a")) == 1
+    reopened.close()
+
+def test_sqlite_transaction_rolls_back(sqlite_db: SQLiteDatabase):
+    """Test that a failed batch leaves no partial writes behind."""
+    with pytest.raises(RuntimeError):
+        with sqlite_db.transaction():
+            admin_service.add_course(sqlite_db, {"course_id": "SUBJ-Z", "name": "Z", "coordinator_id": "prof_a"})
+            raise RuntimeError("abort batch")
+    assert "SUBJ-Z" not in sqlite_db.courses
+
+def test_sqlite_uses_wal_and_fk_indexes(sqlite_db: SQLiteDatabase):
+    """Test the journal mode and that lookups by FK columns hit an index."""
+    assert sqlite_db._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    plan = sqlite_db._conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM grades WHERE student_id = ? AND course_id = ?", ("a", "b")
+    ).fetchall()
+    assert "idx_grades_student_course" in " ".join(str(step) for step in plan)
+
+def test_sqlite_delete_cascades(sqlite_db: SQLiteDatabase):
+    """Test FK-aware deletes and orphan purging against SQLite."""
+    enrollment = student_service.register_course(sqlite_db, "stud_a", "SUBJ-X")
+    assert admin_service.remove_user(sqlite_db, "prof_a") is False
+    assert admin_service.remove_course(sqlite_db, "SUBJ-X") is True
+    assert enrollment.enrollment_id not in sqlite_db.enrollments
+
+    sqlite_db.add_course(Course(course_id="SUBJ-Y", name="Subject Y", coordinator_id="prof_a"))
+    student_service.register_course(sqlite_db, "stud_a", "SUBJ-Y")
+    sqlite_db.remove_user("stud_a")
+    assert sqlite_db.purge_orphans() == {"enrollments": 1}
+    assert len(sqlite_db.enrollments) == 0
+
+def test_sqlite_changes_delivered_after_commit(sqlite_db: SQLiteDatabase):
+    """Test that listeners only see changes from committed transactions."""
+    changes = []
+    sqlite_db.add_listener(changes.append)
+    with pytest.raises(RuntimeError):
+        with sqlite_db.transaction():
+            student_service.register_course(sqlite_db, "stud_a", "SUBJ-X")
+            raise RuntimeError("abort batch")
+    assert changes == []
+    with sqlite_db.transaction():
+        student_service.register_course(sqlite_db, "stud_a", "SUBJ-X")
+        assert changes == []
+    assert [(c.table, c.action) for c in changes] == [("enrollments", "insert")]
+
+def test_sqlite_capacity_and_waitlist(sqlite_db: SQLiteDatabase, tmp_path):
+    """Capacity round-trips, waitlists count from SQL, and old files gain the column."""
+    sqlite_db.add_course(Course(course_id="SUBJ-CAP", name="Capped", coordinator_id="prof_a", capacity=0))
+    assert sqlite_db.courses["SUBJ-CAP"].capacity == 0
+    enrollment = student_service.register_course(sqlite_db, "stud_a", "SUBJ-CAP")
+    assert enrollment.status == EnrollmentStatus.WAITLISTED
+    assert sqlite_db.count_enrollments("SUBJ-CAP", EnrollmentStatus.WAITLISTED) == 1
+
+    legacy = str(tmp_path / "legacy.db")
+    with sqlite3.connect(legacy) as conn:
+        conn.execute("CREATE TABLE courses (course_id TEXT PRIMARY KEY, name TEXT NOT NULL, coordinator_id TEXT NOT NULL)")
+        conn.execute("INSERT INTO courses VALUES ('OLD', 'Old', 'prof_a')")
+    conn.close()
+    migrated = SQLiteDatabase(legacy)
+    assert migrated.courses["OLD"].capacity is None
+    migrated.close()
@@ -0,0 +1,71 @@
+"""
+Tests for the student view cache.
+"""
+import pytest
+from source.college_erp.database import Database
+from source.college_erp.services import admin_service, professor_service, student_service
+from source.college_erp.services.student_cache import StudentViewCache, GRADES
+from source.college_erp.models.enrollment import EnrollmentStatus
+from source.college_erp.models.grade import Grade
+
+@pytest.fixture
+def cache(populated_db: Database) -> StudentViewCache:
+    view_cache = StudentViewCache(populated_db, max_entries=3)
+    yield view_cache
+    view_cache.detach()
+
+def test_cache_hits_and_immutable_results(cache: StudentViewCache):
+    """Repeated reads are served from the cache as tuples."""
+    courses = cache.view_courses()
+    assert isinstance(courses, tuple)
+    assert cache.view_courses() is courses
+    assert cache.view_registered_courses("stud_a") == ()
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (1, 2, 2)
+
+def test_cache_invalidation_is_precise(cache: StudentViewCache, populated_db: Database):
+    """Each service write drops only the entries it affects."""
+    cache.view_courses()
+    cache.view_registered_courses("stud_a")
+    cache.view_registered_courses("stud_b")
+
+    enrollment = student_service.register_course(populated_db, "stud_a", "SUBJ-X")
+    assert cache.view_registered_courses("stud_a") == (enrollment,)
+    assert cache.stats().invalidations == 1  # stud_b and the catalog stayed cached
+
+    professor_service.approve_registration(populated_db, enrollment.enrollment_id)
+    assert cache.view_registered_courses("stud_a")[0].status == EnrollmentStatus.ENROLLED
+
+    assert cache.view_grades("stud_a") == ()
+    professor_service.upload_grade(populated_db, "prof_a", "stud_a", "SUBJ-X", "A")
+    assert [g.grade_value for g in cache.view_grades("stud_a")] == ["A"]
+
+    admin_service.add_course(populated_db, {"course_id": "NEW", "coordinator_id": "prof_a"})
+    assert "NEW" in {course.course_id for course in cache.view_courses()}
+    admin_service.remove_course(populated_db, "NEW")
+    assert "NEW" not in {course.course_id for course in cache.view_courses()}
+
+    populated_db.clear_all()
+    assert cache.view_courses() == () and cache.view_registered_courses("stud_a") == ()
+
+def test_cache_evicts_least_recently_used(cache: StudentViewCache):
+    """Beyond max_entries, the least recently used entry goes first."""
+    cache.view_grades("stud_a")
+    cache.view_grades("stud_b")
+    cache.view_courses()
+    cache.view_grades("stud_a")  # refresh stud_a
+    cache.view_registered_courses("stud_a")
+    assert cache.stats().evictions == 1
+    assert (GRADES, "stud_b") not in cache._entries
+    assert (GRADES, "stud_a") in cache._entries
+
+def test_cache_skips_results_raced_by_a_write(cache: StudentViewCache, populated_db: Database):
+    """A result computed while its key was invalidated is returned but not stored."""
+    def racing_read():
+        rows = student_service.view_grades(populated_db, "stud_a")
+        populated_db.add_grade(Grade(grade_id="g1", student_id="stud_a", course_id="SUBJ-X", grade_value="A"))
+        return rows
+
+    assert cache._get((GRADES, "stud_a"), racing_read) == ()
+    assert [g.grade_id for g in cache.view_grades("stud_a")] == ["g1"]
+    assert cache.stats().misses == 2
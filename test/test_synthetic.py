@@ -0,0 +1,37 @@
+"""
+Tests for the synthetic data generator.
+"""
+from collections import Counter
+import pytest
+from source.college_erp.database import Database
+from source.college_erp.models.enrollment import EnrollmentStatus
+from source.college_erp.services import authentication
+from source.college_erp import synthetic
+
+HASH = "pbkdf2_sha256$1000$c2FsdA==$" + "A" * 43 + "="
+
+def test_generate_is_deterministic():
+    """The same scale and seed give the same rows; another seed does not."""
+    first = synthetic.generate(synthetic.TINY, seed=3, password_hash=HASH)
+    again = synthetic.generate(synthetic.TINY, seed=3, password_hash=HASH)
+    other = synthetic.generate(synthetic.TINY, seed=4, password_hash=HASH)
+    assert first == again
+    assert first.enrollments != other.enrollments
+
+def test_populate_respects_scale(populated_db: Database):
+    """Counts match the scale, pairs are unique and grades only cover enrolled rows."""
+    populated_db.clear_all()
+    data = synthetic.populate(populated_db, synthetic.TINY, seed=3)
+    scale = synthetic.TINY
+    assert len(populated_db.users) == scale.students + scale.professors
+    assert len(populated_db.courses) == scale.courses
+    assert len(populated_db.enrollments) == scale.enrollments
+    assert max(Counter((en.student_id, en.course_id) for en in data.enrollments).values()) == 1
+    for grade in populated_db.grades.values():
+        assert populated_db.find_enrollment(grade.student_id, grade.course_id).status == EnrollmentStatus.ENROLLED
+    assert authentication.login(populated_db, synthetic.student_id(0), synthetic.PASSWORD) is not None
+
+def test_generate_rejects_impossible_density():
+    with pytest.raises(ValueError):
+        synthetic.generate(synthetic.Scale(students=2, professors=1, courses=2, enrollments=4, grades=0),
+                           password_hash=HASH)
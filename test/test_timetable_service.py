@@ -0,0 +1,136 @@
+"""
+Tests for course timetables and clash detection.
+"""
+import asyncio
+import dataclasses
+import random
+import pytest
+from source.college_erp.async_database import ThreadPoolDatabase
+from source.college_erp.database import Database
+from source.college_erp.journal import Journal
+from source.college_erp.sqlite_database import SQLiteDatabase
+from source.college_erp.services import admin_service, professor_service, student_service, timetable_service
+from source.college_erp.services.aio import student_service as aio_student_service
+from source.college_erp.models.course import Course
+from source.college_erp.models.enrollment import Enrollment, EnrollmentStatus
+from source.college_erp.models.professor import Professor
+
+MON_9, WED_9, WED_10 = 9, 2 * 24 + 9, 2 * 24 + 10
+
+@pytest.fixture
+def timetabled_db(populated_db: Database) -> Database:
+    """Adds three scheduled courses: MATH and PHYS share Wednesday 10:00, CHEM clashes with neither."""
+    for course_id, slots in (("MATH", "Mon 9, Wed 9-11"), ("PHYS", "Wed 10"), ("CHEM", "Fri 14-16")):
+        admin_service.add_course(populated_db, {"course_id": course_id, "name": course_id,
+                                                "coordinator_id": "prof_a", "slots": slots})
+    return populated_db
+
+def test_parse_slots():
+    """Slot specs accept day names, single hours and end-exclusive ranges."""
+    assert timetable_service.parse_slots("Mon 9, wednesday 9-11") == (MON_9, WED_9, WED_10)
+    assert timetable_service.parse_slots([5, 6]) == (5, 6)
+    assert timetable_service.parse_slots("") == ()
+    assert timetable_service.slot_label(WED_10) == "Wed 10:00"
+    for bad in ("Xyz 9", "Mon 25", "Mon 9-9", [168]):
+        with pytest.raises(ValueError):
+            timetable_service.parse_slots(bad)
+    assert Course("C", "C", "prof_a", slots=(WED_9, MON_9, MON_9)).slots == (MON_9, WED_9)
+
+def test_register_course_rejects_clashes(timetabled_db: Database):
+    """A course overlapping the student's booked week is refused until the clash is gone."""
+    math = student_service.register_course(timetabled_db, "stud_a", "MATH")
+    assert student_service.register_course(timetabled_db, "stud_a", "PHYS") is None
+    assert timetable_service.find_clash(timetabled_db, "stud_a", timetabled_db.courses["PHYS"]) == "MATH"
+    assert student_service.register_course(timetabled_db, "stud_a", "CHEM") is not None
+    assert student_service.register_course(timetabled_db, "stud_a", "SUBJ-X") is not None  # unscheduled
+    assert student_service.register_course(timetabled_db, "stud_b", "PHYS") is not None
+
+    professor_service.reject_registration(timetabled_db, "prof_a", math.enrollment_id)
+    assert student_service.register_course(timetabled_db, "stud_a", "PHYS") is not None
+
+def test_aio_register_course_rejects_clashes(timetabled_db: Database):
+    """The async registration applies the same clash check."""
+    async def flow():
+        adb = ThreadPoolDatabase(timetabled_db, max_workers=2)
+        try:
+            first = await aio_student_service.register_course(adb, "stud_a", "MATH")
+            second = await aio_student_service.register_course(adb, "stud_a", "PHYS")
+            return first, second
+        finally:
+            adb.close()
+
+    first, second = asyncio.run(flow())
+    assert first is not None and second is None
+
+def test_find_all_clashes(timetabled_db: Database):
+    """The bulk report lists every clashing pair, ignoring rejected registrations."""
+    rows = [("e1", "stud_a", "MATH", EnrollmentStatus.ENROLLED), ("e2", "stud_a", "PHYS", EnrollmentStatus.PENDING),
+            ("e3", "stud_a", "CHEM", EnrollmentStatus.ENROLLED), ("e4", "stud_b", "MATH", EnrollmentStatus.REJECTED),
+            ("e5", "stud_b", "PHYS", EnrollmentStatus.ENROLLED)]
+    timetabled_db.add_enrollments(Enrollment(*row) for row in rows)
+    clashes = timetable_service.find_all_clashes(timetabled_db)
+    assert [(c.student_id, c.course_ids, c.slots) for c in clashes] == [("stud_a", ("MATH", "PHYS"), (WED_10,))]
+
+def test_booking_index_follows_changes(timetabled_db: Database):
+    """The indexed weeks track registrations, status changes, drops and timetable edits."""
+    math = student_service.register_course(timetabled_db, "stud_a", "MATH")
+    timetable_service.booked_mask(timetabled_db, "stud_a")  # builds the index
+    student_service.register_course(timetabled_db, "stud_a", "CHEM")
+    week = timetabled_db.courses["MATH"].slot_mask | timetabled_db.courses["CHEM"].slot_mask
+    assert timetable_service.booked_mask(timetabled_db, "stud_a") == week
+    assert timetable_service.booked_mask(timetabled_db, "stud_a", "CHEM") == timetabled_db.courses["MATH"].slot_mask
+
+    timetabled_db.add_course(dataclasses.replace(timetabled_db.courses["PHYS"], slots=(MON_9 + 1,)))
+    assert student_service.register_course(timetabled_db, "stud_a", "PHYS") is not None
+    timetabled_db.add_course(dataclasses.replace(timetabled_db.courses["MATH"], slots=(MON_9 + 1,)))
+    assert timetable_service.find_clash(timetabled_db, "stud_a", timetabled_db.courses["PHYS"]) == "MATH"
+
+    professor_service.reject_registration(timetabled_db, "prof_a", math.enrollment_id)
+    assert timetable_service.find_clash(timetabled_db, "stud_a", timetabled_db.courses["PHYS"]) is None
+    student_service.drop_course(timetabled_db, "stud_a", "CHEM")
+    assert timetable_service.booked_mask(timetabled_db, "stud_a") == 1 << (MON_9 + 1)
+
+def test_find_all_clashes_matches_pairwise(populated_db: Database):
+    """The vectorized report finds exactly the overlapping pairs a pairwise comparison finds."""
+    rng = random.Random(7)
+    courses = [Course(f"C{i}", f"C{i}", "prof_a", slots=tuple(rng.sample(range(168), 3))) for i in range(30)]
+    populated_db.add_courses(courses)
+    statuses = list(EnrollmentStatus)
+    populated_db.add_enrollments(Enrollment(f"e{i}", f"s{i % 50}", course.course_id, rng.choice(statuses))
+                                 for i, course in enumerate(rng.choices(courses, k=300)))
+    booked = {}
+    for enrollment in populated_db.enrollments.values():
+        if enrollment.status in timetable_service.BOOKING_STATUSES:
+            booked.setdefault(enrollment.student_id, []).append(enrollment.course_id)
+    expected = sorted((student_id, (first, second)) for student_id, ids in booked.items()
+                      for i, second in enumerate(ids) for first in ids[:i]
+                      if populated_db.courses[first].slot_mask & populated_db.courses[second].slot_mask)
+    clashes = timetable_service.find_all_clashes(populated_db)
+    assert expected and sorted((c.student_id, c.course_ids) for c in clashes) == expected
+
+def test_admin_rejects_invalid_slots(populated_db: Database):
+    """Course imports report malformed slots."""
+    assert admin_service.add_course(populated_db, {"course_id": "BAD", "coordinator_id": "prof_a",
+                                                   "slots": "Mon nine"}) is None
+    report = admin_service.bulk_add_courses(populated_db, [
+        {"course_id": "OK", "coordinator_id": "prof_a", "slots": "Tue 8"},
+        {"course_id": "BAD", "coordinator_id": "prof_a", "slots": "Tue 8-7"}])
+    assert report.added == 1 and report.errors == [(1, "invalid slots 'Tue 8-7'")]
+    assert populated_db.courses["OK"].slots == (32,)
+
+def test_slots_persist(tmp_path):
+    """SQLite and the journal both keep a course's slots."""
+    course = Course("MATH", "Math", "prof_a", capacity=30, slots=(MON_9, WED_9))
+    sqlite_db = SQLiteDatabase(str(tmp_path / "erp.db"))
+    sqlite_db.add_course(course)
+    assert sqlite_db.courses["MATH"] == course and sqlite_db.courses["MATH"].slot_mask == course.slot_mask
+    sqlite_db.close()
+
+    db = Database()
+    journal = Journal.open(db, str(tmp_path / "journal"), fsync=False)
+    db.add_user(Professor(user_id="prof_a", name="P", password="pw", branch="B"))
+    db.add_course(course)
+    journal.close()
+    recovered = Database()
+    Journal.open(recovered, str(tmp_path / "journal"), fsync=False).close()
+    assert recovered.courses["MATH"].slots == (MON_9, WED_9)
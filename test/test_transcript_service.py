@@ -0,0 +1,122 @@
+"""
+Tests for the transcript export.
+"""
+import csv
+import io
+import json
+import threading
+import time
+import pytest
+from source.college_erp.database import Database
+from source.college_erp.models.grade import Grade
+from source.college_erp.models.student import Student
+from source.college_erp.services import transcript_service
+from source.college_erp.services.cgpa_service import CgpaEngine
+from source.college_erp.sqlite_database import SQLiteDatabase
+
+@pytest.fixture
+def graded_db(populated_db: Database) -> Database:
+    """Fixture with stud_a graded in both courses, stud_b in one, and an orphan grade."""
+    populated_db.add_grade(Grade("g1", "stud_a", "SUBJ-Y", "B"))
+    populated_db.add_grade(Grade("g2", "stud_a", "SUBJ-X", "A+"))
+    populated_db.add_grade(Grade("g3", "stud_b", "SUBJ-Y", "INC"))
+    populated_db.add_grade(Grade("g4", "stud_0", "SUBJ-X", "A"))  # student no longer exists
+    populated_db.add_user(Student(user_id="stud_c", name="Student C", password="p", branch="Branch 3"))
+    return populated_db
+
+def test_iter_transcripts_joins_and_orders(graded_db: Database):
+    """One transcript per student, courses ordered and named, CGPA from the same grades."""
+    transcripts = list(transcript_service.iter_transcripts(graded_db))
+    assert [t.student_id for t in transcripts] == ["stud_a", "stud_b", "stud_c"]
+
+    stud_a, stud_b, stud_c = transcripts
+    assert [(line.course_id, line.course_name, line.grade) for line in stud_a.lines] == [
+        ("SUBJ-X", "Subject X", "A+"), ("SUBJ-Y", "Subject Y", "B")]
+    assert stud_a.cgpa == pytest.approx(CgpaEngine(graded_db).compute_for("stud_a"))
+    assert stud_b.lines[0].grade_points is None and stud_b.cgpa == 0.0
+    assert stud_c.lines == ()
+
+    ranged = transcript_service.iter_transcripts(graded_db, start="stud_b", stop="stud_c")
+    assert [t.student_id for t in ranged] == ["stud_b"]
+
+@pytest.mark.parametrize("backend", ["memory", "sqlite"])
+def test_grades_are_read_in_one_sorted_pass(backend: str, tmp_path, monkeypatch):
+    """Both backends stream grades by (student, course, id) and resume after a key; no per-student lookups."""
+    db = Database() if backend == "memory" else SQLiteDatabase(str(tmp_path / "erp.db"))
+    db.add_users(Student(user_id=f"s{i}", name=f"S{i}", password="p", branch="B") for i in range(4))
+    for i, (student_id, course_id) in enumerate([("s2", "C2"), ("s0", "C9"), ("s2", "C1"), ("s0", "C1"), ("s3", "C1")]):
+        db.add_grade(Grade(f"g{i}", student_id, course_id, "A"))
+    monkeypatch.setattr(db, "get_grades_by_student", None)
+
+    keys = [(g.student_id, g.course_id) for g in db.iter_grades_by_student()]
+    assert keys == [("s0", "C1"), ("s0", "C9"), ("s2", "C1"), ("s2", "C2"), ("s3", "C1")]
+    assert [g.grade_id for g in db.iter_grades_by_student("s1", "s3")] == ["g2", "g0"]
+    assert [g.grade_id for g in db.iter_grades_by_student(after=("s0", "C9", "g1"))] == ["g2", "g0", "g4"]
+    assert [len(t.lines) for t in transcript_service.iter_transcripts(db)] == [2, 0, 2, 1]
+
+def test_writers(graded_db: Database):
+    """CSV has a row per graded course; JSONL an object per student."""
+    out = io.StringIO()
+    assert transcript_service.write_csv(transcript_service.iter_transcripts(graded_db), out) == 3
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert [(row["student_id"], row["course_id"]) for row in rows] == [
+        ("stud_a", "SUBJ-X"), ("stud_a", "SUBJ-Y"), ("stud_b", "SUBJ-Y"), ("stud_c", "")]
+    assert rows[0]["cgpa"] == "8.50" and rows[0]["grade_points"] == "10.0"
+
+    out = io.StringIO()
+    assert transcript_service.write_jsonl(transcript_service.iter_transcripts(graded_db), out) == 3
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert records[0]["courses"][1] == {"course_id": "SUBJ-Y", "course_name": "Subject Y",
+                                        "grade": "B", "grade_points": 7.0}
+
+def test_sharded_export_matches_single_file(graded_db: Database, tmp_path):
+    """Sharded files together hold exactly the single-file export."""
+    with pytest.raises(ValueError):
+        transcript_service.export_transcripts(graded_db, str(tmp_path / "t.pdf"), fmt="pdf")
+
+    single = transcript_service.export_transcripts(graded_db, str(tmp_path / "all.jsonl"), fmt="jsonl")
+    sharded = transcript_service.export_transcripts(graded_db, str(tmp_path / "part.jsonl"), fmt="jsonl", workers=2)
+    assert single.transcripts == sharded.transcripts == 3
+    assert [p.rsplit("/", 1)[-1] for p in sharded.files] == ["part-000.jsonl", "part-001.jsonl"]
+
+    combined = "".join(open(path, encoding="utf-8").read() for path in sharded.files)
+    assert combined == open(single.files[0], encoding="utf-8").read()
+
+def test_sharded_export_of_few_students(graded_db: Database, tmp_path):
+    """No more shards than students, and an empty database still exports one (header-only) file."""
+    report = transcript_service.export_transcripts(graded_db, str(tmp_path / "t.csv"), workers=5)
+    assert report.transcripts == 3 and len(report.files) == 3
+    empty = transcript_service.export_transcripts(Database(), str(tmp_path / "empty.csv"), workers=2)
+    assert empty.transcripts == 0 and len(empty.files) == 1
+    assert open(empty.files[0], encoding="utf-8").read().strip() == ",".join(transcript_service.CSV_FIELDS)
+
+def test_sharded_export_while_another_thread_writes(graded_db: Database, tmp_path):
+    """Workers are not forked while another thread holds the latch, so none inherits it."""
+    holding = threading.Event()
+
+    def writer():
+        with graded_db.transaction():
+            holding.set()
+            time.sleep(0.2)
+            graded_db.add_grade(Grade("g5", "stud_c", "SUBJ-X", "B"))
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    holding.wait()
+    report = transcript_service.export_transcripts(graded_db, str(tmp_path / "t.jsonl"), fmt="jsonl", workers=2)
+    thread.join()
+    records = [json.loads(line) for path in report.files for line in open(path, encoding="utf-8")]
+    assert records[-1]["courses"] == [{"course_id": "SUBJ-X", "course_name": "Subject X",
+                                       "grade": "B", "grade_points": 7.0}]
+
+def test_sharded_export_from_sqlite(tmp_path):
+    """Workers reopen a file-backed SQLite database; an in-memory one cannot be shared."""
+    db = SQLiteDatabase(str(tmp_path / "erp.db"))
+    db.add_users(Student(user_id=f"s{i}", name=f"S{i}", password="p", branch="B") for i in range(10))
+    db.add_grade(Grade("g1", "s3", "C1", "A"))
+    report = transcript_service.export_transcripts(db, str(tmp_path / "t.csv"), workers=3)
+    assert report.transcripts == 10 and len(report.files) == 3
+    db.close()
+
+    with pytest.raises(ValueError):
+        SQLiteDatabase().for_child_process()